@@ -22,22 +22,80 @@ Usage:
     # Force re-download of data
     python benchmarks/terminal_bench/analyze_failure_rates.py --refresh
 
+    # Only consider Unix results ingested in January
+    python benchmarks/terminal_bench/analyze_failure_rates.py --since 2026-01-01 --until 2026-02-01
+
+    # Serve Unix results from the incremental local mirror of tbench_results
+    python benchmarks/terminal_bench/analyze_failure_rates.py --mirror
+
+    # Fully offline: Unix results from a local database written by
+    # scripts/upload-tbench-results.py --sink sqlite (no bq, no sync)
+    python benchmarks/terminal_bench/analyze_failure_rates.py --local-db
+
+    # Attach bootstrap CIs and keep only tasks stable in the top 20 90% of the time
+    python benchmarks/terminal_bench/analyze_failure_rates.py --bootstrap 2000 --min-confidence 0.9
+
+    # Parse leaderboard results with 8 worker processes
+    python benchmarks/terminal_bench/analyze_failure_rates.py --workers 8
+
 Requirements:
     git (for cloning from HuggingFace)
     bq CLI (for querying Unix results from BigQuery)
+    numpy (for the task x agent failure matrix)
 """
 
 import argparse
 import json
+import os
 import sys
-from collections import defaultdict
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
+try:
+    from . import results_mirror
+    from .failure_matrix import (
+        ResultColumns,
+        TaskAgentMatrix,
+        bootstrap_mo_ratios,
+        mo_ratios,
+        rank_by_ratio,
+    )
+    from .tbench_utils import (
+        BQ_TABLE,
+        BQError,
+        bq_query_pages,
+        extract_task_id,
+        get_passed,
+        parse_bq_csv,
+        run_bq,
+    )
+except ImportError:
+    import results_mirror  # type: ignore[import-not-found,no-redef]
+    from failure_matrix import (  # type: ignore[import-not-found,no-redef]
+        ResultColumns,
+        TaskAgentMatrix,
+        bootstrap_mo_ratios,
+        mo_ratios,
+        rank_by_ratio,
+    )
+    from tbench_utils import (  # type: ignore[import-not-found,no-redef]
+        BQ_TABLE,
+        BQError,
+        bq_query_pages,
+        extract_task_id,
+        get_passed,
+        parse_bq_csv,
+        run_bq,
+    )
+
 try:
-    from .tbench_utils import extract_task_id, get_passed
+    import orjson as _orjson  # Optional: ~3x faster than json for result.json
 except ImportError:
-    from tbench_utils import extract_task_id, get_passed  # type: ignore[import-not-found,no-redef]
+    _orjson = None
 
 # Data directory for caching downloaded results
 CACHE_DIR = Path(__file__).parent / ".leaderboard_cache"
@@ -45,7 +103,7 @@ LEADERBOARD_REPO = "alexgshaw/terminal-bench-2-leaderboard"
 DATASET_VERSION = "2.0"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Result for a single task from an agent."""
 
@@ -55,7 +113,7 @@ class TaskResult:
     model_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentStats:
     """Aggregate stats for an agent."""
 
@@ -129,113 +187,287 @@ def download_leaderboard_data(refresh: bool = False) -> Path:
         raise
 
 
-def query_mux_results_from_bq() -> list[TaskResult]:
+BQ_DATASET_FILTER = "terminal-bench@2.0"
+# Re-sync the local results mirror when it is older than this
+MIRROR_MAX_AGE_HOURS = 1
+# Upper bound for single-shot (aggregated) query output; hitting it means truncation
+BQ_MAX_ROWS = 100000
+
+
+@dataclass
+class BQWindow:
+    """Optional filters that limit which tbench_results rows are scanned.
+
+    ``since``/``until`` bound ``ingested_at`` (ISO dates or timestamps), so
+    BigQuery can prune partitions when the table is partitioned on it.
     """
-    Query Unix results from BigQuery.
 
-    Uses the bq CLI to query unix-benchmarks.benchmarks.tbench_results.
-    Returns TaskResult objects for all Unix benchmark runs.
+    since: str | None = None
+    until: str | None = None
+    run_ids: list[str] | None = None
+
+    def where_sql(self) -> str:
+        clauses = [f"dataset = '{BQ_DATASET_FILTER}'"]
+        if self.since:
+            clauses.append("ingested_at >= TIMESTAMP(@since)")
+        if self.until:
+            clauses.append("ingested_at < TIMESTAMP(@until)")
+        if self.run_ids:
+            clauses.append("run_id IN UNNEST(@run_ids)")
+        return " AND ".join(clauses)
+
+    def parameters(self) -> list[str]:
+        """bq CLI --parameter flags for the placeholders used in where_sql()."""
+        params = []
+        if self.since:
+            params.append(f"--parameter=since:STRING:{self.since}")
+        if self.until:
+            params.append(f"--parameter=until:STRING:{self.until}")
+        if self.run_ids:
+            params.append(
+                f"--parameter=run_ids:ARRAY<STRING>:{json.dumps(self.run_ids)}"
+            )
+        return params
+
+
+def _mux_model_key(row: dict[str, str]) -> str:
+    # Create agent name from model + thinking level for grouping
+    model = row.get("model_name", "unknown")
+    thinking = row.get("thinking_level", "off")
+    return f"{model}@{thinking}"
+
+
+def query_mux_results_from_bq(
+    window: BQWindow | None = None, page_size: int = 50000
+) -> list[TaskResult]:
     """
-    import csv
-    import subprocess
+    Query raw Unix trial rows from BigQuery.
 
-    query = """
+    Uses the bq CLI to query unix-benchmarks.benchmarks.tbench_results, paging
+    through the result so large tables are never truncated.
+    Returns TaskResult objects for all Unix benchmark runs.
+    """
+    window = window or BQWindow()
+    query = f"""
     SELECT
         task_id,
         model_name,
         thinking_level,
         passed
-    FROM `unix-benchmarks.benchmarks.tbench_results`
-    WHERE dataset = 'terminal-bench@2.0'
+    FROM `{BQ_TABLE}`
+    WHERE {window.where_sql()}
     """
 
     print("Querying Unix results from BigQuery...", file=sys.stderr)
+    results: list[TaskResult] = []
+    skipped = 0
     try:
-        result = subprocess.run(
-            [
-                "bq",
-                "query",
-                "--use_legacy_sql=false",
-                "--format=csv",
-                "--max_rows=100000",
-                query,
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-    except FileNotFoundError:
-        print(
-            "Error: bq CLI not found. Install Google Cloud SDK and run 'gcloud auth login'",
-            file=sys.stderr,
-        )
-        return []
-    except subprocess.CalledProcessError as e:
-        print(f"BigQuery error: {e.stderr}", file=sys.stderr)
+        for page in bq_query_pages(query, window.parameters(), page_size):
+            for row in page:
+                # Skip incomplete runs (NULL passed)
+                passed_str = row.get("passed", "").lower()
+                if passed_str not in ("true", "false"):
+                    skipped += 1
+                    continue
+
+                results.append(
+                    TaskResult(
+                        # Strip trial hash (format: task-name__HASH -> task-name)
+                        task_id=extract_task_id(row["task_id"]),
+                        passed=passed_str == "true",
+                        agent_name="Unix",
+                        model_name=_mux_model_key(row),
+                    )
+                )
+    except BQError:
         return []
 
-    # Parse CSV output
-    results: list[TaskResult] = []
-    lines = result.stdout.strip().split("\n")
-    if len(lines) < 2:
+    if not results:
         print("No Unix results found in BigQuery", file=sys.stderr)
         return results
+    print(f"Found {len(results)} Unix results from BigQuery", file=sys.stderr)
+    if skipped:
+        print(f"  (skipped {skipped} incomplete runs)", file=sys.stderr)
+    return results
 
-    reader = csv.DictReader(lines)
-    skipped = 0
-    for row in reader:
-        # Skip incomplete runs (NULL passed)
-        passed_str = row.get("passed", "").lower()
-        if passed_str not in ("true", "false"):
-            skipped += 1
-            continue
 
-        # Create agent name from model + thinking level for grouping
-        model = row.get("model_name", "unknown")
-        thinking = row.get("thinking_level", "off")
+def query_mux_counts_from_bq(window: BQWindow | None = None) -> ResultColumns:
+    """
+    Query per-task Unix pass/attempt counts from BigQuery.
 
-        # Strip trial hash from task_id (format: task-name__HASH -> task-name)
-        raw_task_id = row["task_id"]
-        task_id = raw_task_id.rsplit("__", 1)[0] if "__" in raw_task_id else raw_task_id
+    Grouping by task, model and thinking level happens in SQL, so only one row
+    per (task, config) crosses the wire instead of one per trial. The trial
+    hash is stripped server-side with the same last-"__" rule as
+    extract_task_id(); incomplete runs (NULL passed) are counted separately.
+    """
+    window = window or BQWindow()
+    query = f"""
+    SELECT
+        REGEXP_REPLACE(task_id, r'^(.*)__.*$', r'\\1') AS task_id,
+        model_name,
+        thinking_level,
+        COUNTIF(passed) AS n_passed,
+        COUNT(passed) AS n_total,
+        COUNTIF(passed IS NULL) AS n_incomplete
+    FROM `{BQ_TABLE}`
+    WHERE {window.where_sql()}
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    """
 
-        results.append(
-            TaskResult(
-                task_id=task_id,
-                passed=passed_str == "true",
-                agent_name="Unix",
-                model_name=f"{model}@{thinking}",
-            )
+    print("Querying aggregated Unix results from BigQuery...", file=sys.stderr)
+    output = run_bq(
+        [
+            "query",
+            "--use_legacy_sql=false",
+            "--format=csv",
+            f"--max_rows={BQ_MAX_ROWS}",
+            *window.parameters(),
+            query,
+        ]
+    )
+    rows = parse_bq_csv(output) if output else []
+    if len(rows) >= BQ_MAX_ROWS:
+        print(
+            f"Warning: aggregated query hit --max_rows={BQ_MAX_ROWS}; results are "
+            "truncated. Narrow the window with --since/--until/--run-id.",
+            file=sys.stderr,
         )
-
-    print(f"Found {len(results)} Unix results from BigQuery", file=sys.stderr)
+    return mux_counts_to_columns(rows, source="BigQuery")
+
+
+def mux_counts_to_columns(rows: list[dict], source: str) -> ResultColumns:
+    """Convert aggregated (task_id, model_name, thinking_level, n_*) rows to columns."""
+    counts = [
+        (
+            row["task_id"],
+            "Unix",
+            _mux_model_key(row),
+            int(row["n_passed"]),
+            int(row["n_total"]),
+        )
+        for row in rows
+        if int(row["n_total"]) > 0
+    ]
+    columns = ResultColumns.from_counts(counts)
+    if not len(columns):
+        print(f"No Unix results found in {source}", file=sys.stderr)
+        return columns
+
+    n_trials = int(columns.n_total.sum())
+    skipped = sum(int(row["n_incomplete"]) for row in rows)
+    print(
+        f"Found {n_trials} Unix results ({len(columns)} task/config groups) "
+        f"from {source}",
+        file=sys.stderr,
+    )
     if skipped:
         print(f"  (skipped {skipped} incomplete runs)", file=sys.stderr)
-    return results
+    return columns
 
 
-def parse_leaderboard_results(
-    repo_path: Path, exclude_mux: bool = True
-) -> list[TaskResult]:
+def load_mux_counts_from_mirror(
+    window: BQWindow, refresh: bool = False, full: bool = False
+) -> ResultColumns:
     """
-    Parse all agent results from the leaderboard repo structure.
+    Aggregate Unix results from the local mirror (see results_mirror.py).
 
-    Expected structure:
-        submissions/terminal-bench/2.0/<Agent>__<Model>/
-            metadata.yaml
-            <job-folder>/
-                <trial-folder>/
-                    result.json  # contains "passed" or "score"
+    The mirror is synced incrementally first when it is missing, older than
+    MIRROR_MAX_AGE_HOURS, or ``refresh`` is set; ``full`` rebuilds it.
+    """
+    age = results_mirror.sync_age_hours()
+    if full or refresh or age is None or age >= MIRROR_MAX_AGE_HOURS:
+        results_mirror.sync(full=full)
+    else:
+        print(
+            f"Using local results mirror (synced {age:.1f}h ago). "
+            "Use --refresh to sync.",
+            file=sys.stderr,
+        )
+    rows = results_mirror.query_mux_counts(
+        dataset=BQ_DATASET_FILTER,
+        since=window.since,
+        until=window.until,
+        run_ids=window.run_ids,
+    )
+    return mux_counts_to_columns(rows, source="local mirror")
+
+
+def load_mux_counts_from_local_db(window: BQWindow, path: Path) -> ResultColumns:
+    """Aggregate Unix results from a local results database (never synced)."""
+    if not path.exists():
+        print(f"No local results database at {path}", file=sys.stderr)
+        return ResultColumns.from_counts([])
+    rows = results_mirror.query_mux_counts(
+        path,
+        dataset=BQ_DATASET_FILTER,
+        since=window.since,
+        until=window.until,
+        run_ids=window.run_ids,
+    )
+    return mux_counts_to_columns(rows, source=f"local database {path}")
 
-    Args:
-        exclude_mux: If True, skip Unix agents (we get those from BigQuery)
+
+@dataclass(slots=True)
+class ScanChunk:
+    """Compact pass/fail columns for the trials of one job folder.
+
+    Task IDs are interned per chunk: ``task_codes[i]`` indexes into ``task_ids``
+    and ``passed[i]`` is 1/0, so a worker ships two small arrays back to the
+    parent instead of one object per trial.
     """
-    results: list[TaskResult] = []
-    submissions_dir = repo_path / "submissions" / "terminal-bench" / DATASET_VERSION
 
-    if not submissions_dir.exists():
-        print(f"Warning: No submissions found at {submissions_dir}", file=sys.stderr)
-        return results
+    agent_name: str
+    model_name: str
+    task_ids: list[str]
+    task_codes: array
+    passed: array
+
+
+# The only top-level keys get_passed() inspects
+_PASS_KEYS = ("passed", "score", "verifier_result")
+
+
+def _load_pass_fields(raw: bytes) -> dict:
+    """Decode a result.json and keep only the keys get_passed() needs.
+
+    Uses orjson when installed. The decoded document is reduced right away so
+    large agent payloads never accumulate in a worker.
+    """
+    data = _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+    return {k: data[k] for k in _PASS_KEYS if k in data}
+
+
+def _scan_job_dir(unit: tuple[str, str, str]) -> ScanChunk:
+    """Scan one job folder for trial results (runs inside worker processes)."""
+    agent_name, model_name, job_dir = unit
+    task_ids: list[str] = []
+    task_index: dict[str, int] = {}
+    task_codes = array("I")
+    passed = array("b")
+
+    for result_file in Path(job_dir).rglob("*/result.json"):
+        try:
+            fields = _load_pass_fields(result_file.read_bytes())
+        except (ValueError, OSError) as e:  # orjson/json decode errors are ValueErrors
+            print(f"Warning: Could not parse {result_file}: {e}", file=sys.stderr)
+            continue
+
+        # Extract task_id from folder name (format: task-name__HASH)
+        task_id = extract_task_id(result_file.parent.name)
+        code = task_index.get(task_id)
+        if code is None:
+            code = task_index[task_id] = len(task_ids)
+            task_ids.append(task_id)
+        task_codes.append(code)
+        # Determine pass/fail using shared logic
+        passed.append(1 if get_passed(fields) else 0)
+
+    return ScanChunk(agent_name, model_name, task_ids, task_codes, passed)
+
 
+def _iter_scan_units(submissions_dir: Path, exclude_mux: bool):
+    """Yield (agent, model, job_dir) work units in directory order."""
     for agent_dir in submissions_dir.iterdir():
         if not agent_dir.is_dir():
             continue
@@ -249,60 +481,115 @@ def parse_leaderboard_results(
         if exclude_mux and agent_name.lower() == "unix":
             continue
 
-        # Find all result.json files in trial folders
-        for result_file in agent_dir.rglob("*/result.json"):
-            # Skip job-level result.json (direct child of job folder)
-            # We want trial-level results (one more level deep)
-            relative = result_file.relative_to(agent_dir)
-            if len(relative.parts) < 3:  # job/trial/result.json = 3 parts minimum
-                continue
+        # Trial results live one level below each job folder; job-level
+        # result.json files (direct children of the job folder) are skipped
+        # because the worker only matches "*/result.json" beneath the job.
+        for job_dir in agent_dir.iterdir():
+            if job_dir.is_dir():
+                yield (agent_name, model_name, str(job_dir))
 
-            try:
-                with open(result_file) as f:
-                    data = json.load(f)
 
-                # Extract task_id from folder name (format: task-name__HASH)
-                trial_folder = result_file.parent.name
-                task_id = extract_task_id(trial_folder)
+def scan_leaderboard_results(
+    repo_path: Path, exclude_mux: bool = True, workers: int = 1
+) -> list[ScanChunk]:
+    """
+    Scan the leaderboard submission tree, one job folder per work unit.
 
-                # Determine pass/fail using shared logic
-                passed = get_passed(data) or False
+    With ``workers > 1`` the job folders are spread across a process pool;
+    chunks are returned in directory order either way, so downstream results
+    are identical to a serial scan.
+    """
+    submissions_dir = repo_path / "submissions" / "terminal-bench" / DATASET_VERSION
 
-                results.append(
-                    TaskResult(
-                        task_id=task_id,
-                        passed=passed,
-                        agent_name=agent_name,
-                        model_name=model_name,
-                    )
-                )
-            except (json.JSONDecodeError, OSError) as e:
-                print(f"Warning: Could not parse {result_file}: {e}", file=sys.stderr)
+    if not submissions_dir.exists():
+        print(f"Warning: No submissions found at {submissions_dir}", file=sys.stderr)
+        return []
+
+    units = list(_iter_scan_units(submissions_dir, exclude_mux))
+    if workers <= 1 or len(units) <= 1:
+        return [_scan_job_dir(unit) for unit in units]
+
+    workers = min(workers, len(units))
+    # Several units per task amortizes IPC without starving any worker
+    chunksize = max(1, len(units) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_scan_job_dir, units, chunksize=chunksize))
+
+
+def parse_leaderboard_columns(
+    repo_path: Path, exclude_mux: bool = True, workers: int = 1
+) -> ResultColumns:
+    """
+    Parse leaderboard results straight into interned columns.
+
+    Same rows as parse_leaderboard_results() but without creating a
+    TaskResult per trial; preferred for full multi-agent analysis.
+    """
+    return ResultColumns.from_chunks(
+        scan_leaderboard_results(repo_path, exclude_mux, workers)
+    )
+
+
+def parse_leaderboard_results(
+    repo_path: Path, exclude_mux: bool = True, workers: int = 1
+) -> list[TaskResult]:
+    """
+    Parse all agent results from the leaderboard repo structure.
+
+    Expected structure:
+        submissions/terminal-bench/2.0/<Agent>__<Model>/
+            metadata.yaml
+            <job-folder>/
+                <trial-folder>/
+                    result.json  # contains "passed" or "score"
 
+    Args:
+        exclude_mux: If True, skip Unix agents (we get those from BigQuery)
+        workers: Number of worker processes used to parse result.json files
+    """
+    results: list[TaskResult] = []
+    for chunk in scan_leaderboard_results(repo_path, exclude_mux, workers):
+        for code, passed in zip(chunk.task_codes, chunk.passed):
+            results.append(
+                TaskResult(
+                    task_id=chunk.task_ids[code],
+                    passed=bool(passed),
+                    agent_name=chunk.agent_name,
+                    model_name=chunk.model_name,
+                )
+            )
     return results
 
 
-def compute_agent_stats(results: list[TaskResult]) -> dict[str, AgentStats]:
+def _as_columns(results: list[TaskResult] | ResultColumns) -> ResultColumns:
+    """Accept either TaskResult lists or prebuilt columns."""
+    if isinstance(results, ResultColumns):
+        return results
+    return ResultColumns.from_results(results)
+
+
+def compute_agent_stats(
+    results: list[TaskResult] | ResultColumns,
+) -> dict[str, AgentStats]:
     """Compute aggregate stats for each agent."""
-    # Group by agent+model
-    by_agent: dict[str, list[TaskResult]] = defaultdict(list)
-    for r in results:
-        key = f"{r.agent_name}__{r.model_name}"
-        by_agent[key].append(r)
-
-    stats: dict[str, AgentStats] = {}
-    for key, agent_results in by_agent.items():
-        parts = key.split("__", 1)
-        agent_name = parts[0]
-        model_name = parts[1] if len(parts) > 1 else "unknown"
-        n_passed = sum(1 for r in agent_results if r.passed)
-        stats[key] = AgentStats(
-            agent_name=agent_name,
-            model_name=model_name,
-            n_tasks=len(agent_results),
-            n_passed=n_passed,
+    columns = _as_columns(results)
+    n_agents = len(columns.agents)
+    n_passed = np.bincount(
+        columns.agent_codes, weights=columns.n_passed, minlength=n_agents
+    )
+    n_tasks = np.bincount(
+        columns.agent_codes, weights=columns.n_total, minlength=n_agents
+    )
+
+    return {
+        key: AgentStats(
+            agent_name=columns.agent_names[code],
+            model_name=columns.model_names[code],
+            n_tasks=int(n_tasks[code]),
+            n_passed=int(n_passed[code]),
         )
-    return stats
+        for code, key in enumerate(columns.agents)
+    }
 
 
 def get_top_agents(stats: dict[str, AgentStats], n: int = 10) -> list[str]:
@@ -315,36 +602,34 @@ def get_top_agents(stats: dict[str, AgentStats], n: int = 10) -> list[str]:
     return [k for k, v in sorted_agents[:n]]
 
 
+def _agent_mask(columns: ResultColumns, agents) -> np.ndarray | None:
+    if agents is None:
+        return None
+    return np.array([a in agents for a in columns.agents], dtype=bool)
+
+
 def compute_task_failure_rates(
-    results: list[TaskResult], agents: list[str] | None = None
+    results: list[TaskResult] | ResultColumns, agents=None
 ) -> dict[str, dict[str, float]]:
     """
     Compute failure rate per task per agent.
 
     Returns: {task_id: {agent_key: fail_rate}}
     """
-    # Group by task_id and agent
-    by_task_agent: dict[str, dict[str, list[bool]]] = defaultdict(
-        lambda: defaultdict(list)
-    )
-    for r in results:
-        key = f"{r.agent_name}__{r.model_name}"
-        if agents is None or key in agents:
-            by_task_agent[r.task_id][key].append(r.passed)
+    columns = _as_columns(results)
+    matrix = TaskAgentMatrix.from_columns(columns, _agent_mask(columns, agents))
+    rates = matrix.fail_rates()
 
-    # Compute failure rates
     task_rates: dict[str, dict[str, float]] = {}
-    for task_id, agent_results in by_task_agent.items():
-        task_rates[task_id] = {}
-        for agent_key, passes in agent_results.items():
-            n_total = len(passes)
-            n_failed = sum(1 for p in passes if not p)
-            task_rates[task_id][agent_key] = n_failed / n_total if n_total > 0 else 0.0
-
+    for t in matrix.ordered_tasks():
+        attempted = np.flatnonzero(matrix.totals[t] > 0)
+        task_rates[matrix.tasks[t]] = {
+            matrix.agents[a]: float(rates[t, a]) for a in attempted
+        }
     return task_rates
 
 
-@dataclass
+@dataclass(slots=True)
 class OptimizationOpportunity:
     """A task where Unix underperforms relative to competitors."""
 
@@ -354,19 +639,31 @@ class OptimizationOpportunity:
     ratio: float  # M/O ratio
     unix_agent: str
     n_other_agents: int
+    # Bootstrap statistics (only set when resampling is requested)
+    ratio_ci_low: float | None = None
+    ratio_ci_high: float | None = None
+    rank_stability: float | None = None
 
 
 def find_optimization_opportunities(
-    results: list[TaskResult],
+    results: list[TaskResult] | ResultColumns,
     mux_filter: str | None = None,
     top_n_agents: int = 10,
+    n_bootstrap: int = 0,
+    rank_top: int = 20,
+    seed: int | None = None,
 ) -> list[OptimizationOpportunity]:
     """
     Find tasks where Unix has high failure rate relative to top agents.
 
+    With ``n_bootstrap > 0``, trials are resampled within every (task, agent)
+    cell to attach a 95% CI on each M/O ratio and a rank stability score: the
+    fraction of resamples in which the task stays in the top ``rank_top``.
+
     Returns opportunities sorted by M/O ratio (descending).
     """
-    stats = compute_agent_stats(results)
+    columns = _as_columns(results)
+    stats = compute_agent_stats(columns)
 
     # Find Unix agents
     unix_agents = [k for k in stats.keys() if k.startswith("Mux__")]
@@ -394,48 +691,54 @@ def find_optimization_opportunities(
     if len(top_agents) > 5:
         print(f"  ... and {len(top_agents) - 5} more", file=sys.stderr)
 
-    # Compute task-level failure rates
+    # Build the task x agent matrix over the relevant agents only, then compute
+    # M/O ratios for every Unix agent at once
     all_relevant_agents = set(unix_agents) | set(top_agents)
-    task_rates = compute_task_failure_rates(results, all_relevant_agents)
-
-    # Find opportunities for each Unix agent
-    opportunities: list[OptimizationOpportunity] = []
-
-    for unix_agent in unix_agents:
-        for task_id, agent_rates in task_rates.items():
-            if unix_agent not in agent_rates:
-                continue
-
-            mux_fail_rate = agent_rates[unix_agent]
-
-            # Compute average failure rate of top agents on this task
-            other_rates = [
-                agent_rates.get(a, 0.0) for a in top_agents if a in agent_rates
-            ]
-            if not other_rates:
-                continue
-
-            avg_other_fail_rate = sum(other_rates) / len(other_rates)
-
-            # Compute M/O ratio (add small epsilon to avoid div by zero)
-            epsilon = 0.01
-            ratio = mux_fail_rate / (avg_other_fail_rate + epsilon)
-
-            # Only include if Unix actually fails sometimes
-            if mux_fail_rate > 0:
-                opportunities.append(
-                    OptimizationOpportunity(
-                        task_id=task_id,
-                        mux_fail_rate=mux_fail_rate,
-                        avg_other_fail_rate=avg_other_fail_rate,
-                        ratio=ratio,
-                        unix_agent=unix_agent,
-                        n_other_agents=len(other_rates),
-                    )
-                )
+    matrix = TaskAgentMatrix.from_columns(
+        columns, _agent_mask(columns, all_relevant_agents)
+    )
+    agent_index = {key: code for code, key in enumerate(columns.agents)}
+    cells = mo_ratios(
+        matrix,
+        [agent_index[a] for a in unix_agents],
+        [agent_index[a] for a in top_agents],
+    )
 
     # Sort by ratio (highest first = biggest optimization opportunity)
-    opportunities.sort(key=lambda x: x.ratio, reverse=True)
+    order = rank_by_ratio(cells["ratio"])
+    opportunities = [
+        OptimizationOpportunity(
+            task_id=matrix.tasks[cells["task"][i]],
+            mux_fail_rate=float(cells["mux_fail_rate"][i]),
+            avg_other_fail_rate=float(cells["avg_other_fail_rate"][i]),
+            ratio=float(cells["ratio"][i]),
+            unix_agent=matrix.agents[cells["agent"][i]],
+            n_other_agents=int(cells["n_other_agents"][i]),
+        )
+        for i in order
+    ]
+
+    if n_bootstrap > 0 and opportunities:
+        print(f"Bootstrapping M/O ratios ({n_bootstrap} resamples)...", file=sys.stderr)
+        summary = bootstrap_mo_ratios(
+            matrix,
+            [agent_index[a] for a in top_agents],
+            cells["task"][order],
+            cells["agent"][order],
+            n_resamples=n_bootstrap,
+            top_n=rank_top,
+            seed=seed,
+        )
+        for opp, low, high, stability in zip(
+            opportunities,
+            summary.ratio_low,
+            summary.ratio_high,
+            summary.rank_stability,
+        ):
+            opp.ratio_ci_low = float(low)
+            opp.ratio_ci_high = float(high)
+            opp.rank_stability = float(stability)
+
     return opportunities
 
 
@@ -446,19 +749,24 @@ def print_opportunities(
     print(f"\n{'=' * 80}")
     print("OPTIMIZATION OPPORTUNITIES (sorted by M/O ratio)")
     print(f"{'=' * 80}")
-    print(
-        f"{'Task ID':<40} {'Unix Fail%':>10} {'Avg Other%':>11} {'M/O Ratio':>10} {'Agent':<20}"
-    )
+    bootstrapped = bool(opportunities) and opportunities[0].rank_stability is not None
+    header = f"{'Task ID':<40} {'Unix Fail%':>10} {'Avg Other%':>11} {'M/O Ratio':>10} "
+    if bootstrapped:
+        header += f"{'95% CI':>13} {'Stable':>6} "
+    print(header + f"{'Agent':<20}")
     print("-" * 80)
 
     for opp in opportunities[:top_n]:
-        print(
+        line = (
             f"{opp.task_id:<40} "
             f"{opp.mux_fail_rate * 100:>9.1f}% "
             f"{opp.avg_other_fail_rate * 100:>10.1f}% "
             f"{opp.ratio:>10.2f} "
-            f"{opp.unix_agent:<20}"
         )
+        if bootstrapped:
+            ci = f"{opp.ratio_ci_low:.2f}-{opp.ratio_ci_high:.2f}"
+            line += f"{ci:>13} {opp.rank_stability * 100:>5.0f}% "
+        print(line + f"{opp.unix_agent:<20}")
 
     if len(opportunities) > top_n:
         print(f"\n... and {len(opportunities) - top_n} more tasks")
@@ -508,11 +816,92 @@ def main() -> None:
         action="store_true",
         help="Output results as JSON",
     )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        help="Only use Unix results ingested at or after this date/timestamp",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        default=None,
+        help="Only use Unix results ingested before this date/timestamp",
+    )
+    parser.add_argument(
+        "--run-id",
+        action="append",
+        default=None,
+        help="Only use Unix results from this run_id (repeatable)",
+    )
+    parser.add_argument(
+        "--mirror",
+        action="store_true",
+        help="Read Unix results from the local tbench_results mirror, syncing "
+        f"new rows if it is older than {MIRROR_MAX_AGE_HOURS}h",
+    )
+    parser.add_argument(
+        "--resync",
+        action="store_true",
+        help="Rebuild the local mirror from scratch (implies --mirror)",
+    )
+    parser.add_argument(
+        "--local-db",
+        type=Path,
+        nargs="?",
+        const=results_mirror.LOCAL_DB_PATH,
+        default=None,
+        metavar="PATH",
+        help="Read Unix results from a local tbench_results database written by "
+        "upload-tbench-results.py --sink sqlite "
+        f"(default: {results_mirror.LOCAL_DB_PATH})",
+    )
+    parser.add_argument(
+        "--raw-rows",
+        action="store_true",
+        help="Fetch raw trial rows (paginated) instead of aggregating in BigQuery",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Resample trials N times to attach CIs and rank stability (default: off)",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=None,
+        help="Only show tasks that stay in the top --top in at least this fraction "
+        "of bootstrap resamples (0-1; implies --bootstrap 1000 if unset)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for --bootstrap (default: nondeterministic)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for parsing leaderboard results (default: CPU count)",
+    )
     args = parser.parse_args()
 
     # Get Unix results from BigQuery
-    mux_results = query_mux_results_from_bq()
-    if not mux_results:
+    window = BQWindow(since=args.since, until=args.until, run_ids=args.run_id)
+    if args.local_db:
+        mux_columns = load_mux_counts_from_local_db(window, args.local_db)
+    elif args.mirror or args.resync:
+        mux_columns = load_mux_counts_from_mirror(
+            window, refresh=args.refresh, full=args.resync
+        )
+    elif args.raw_rows:
+        mux_columns = ResultColumns.from_results(query_mux_results_from_bq(window))
+    else:
+        mux_columns = query_mux_counts_from_bq(window)
+    if not len(mux_columns):
         print(
             "Warning: No Unix results from BigQuery. Ensure bq CLI is configured.",
             file=sys.stderr,
@@ -521,21 +910,34 @@ def main() -> None:
     # Download/load other agents from HuggingFace leaderboard
     repo_path = download_leaderboard_data(refresh=args.refresh)
     print("Parsing leaderboard results (excluding Unix)...", file=sys.stderr)
-    other_results = parse_leaderboard_results(repo_path, exclude_mux=True)
-    print(f"Found {len(other_results)} results from other agents", file=sys.stderr)
+    other_columns = parse_leaderboard_columns(
+        repo_path, exclude_mux=True, workers=args.workers
+    )
+    print(f"Found {len(other_columns)} results from other agents", file=sys.stderr)
 
     # Merge results
-    results = mux_results + other_results
-    if not results:
+    columns = ResultColumns.concat([mux_columns, other_columns])
+    if not len(columns):
         print("No results to analyze.", file=sys.stderr)
         sys.exit(1)
 
+    n_bootstrap = args.bootstrap
+    if args.min_confidence is not None and n_bootstrap <= 0:
+        n_bootstrap = 1000
+
     # Find opportunities
     opportunities = find_optimization_opportunities(
-        results,
-        mux_filter=args.mux_model,
+        columns,
+        mux_filter=args.unix_model,
         top_n_agents=args.top_agents,
+        n_bootstrap=n_bootstrap,
+        rank_top=args.top,
+        seed=args.seed,
     )
+    if args.min_confidence is not None:
+        opportunities = [
+            o for o in opportunities if o.rank_stability >= args.min_confidence
+        ]
 
     if args.json:
         output = [
@@ -545,6 +947,15 @@ def main() -> None:
                 "avg_other_fail_rate": o.avg_other_fail_rate,
                 "ratio": o.ratio,
                 "unix_agent": o.unix_agent,
+                **(
+                    {
+                        "ratio_ci_low": o.ratio_ci_low,
+                        "ratio_ci_high": o.ratio_ci_high,
+                        "rank_stability": o.rank_stability,
+                    }
+                    if o.rank_stability is not None
+                    else {}
+                ),
             }
             for o in opportunities[: args.top]
         ]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import asdict
+
+import numpy as np
+
+from .analyze_failure_rates import (
+    TaskResult,
+    compute_agent_stats,
+    compute_task_failure_rates,
+    find_optimization_opportunities,
+)
+from .failure_matrix import ResultColumns, TaskAgentMatrix
+
+
+def _results(rows: list[tuple[str, str, bool]]) -> list[TaskResult]:
+    out = []
+    for key, task, passed in rows:
+        agent, model = key.split("__", 1)
+        out.append(TaskResult(task, passed, agent, model))
+    return out
+
+
+def _reference_opportunities(results: list[TaskResult], top_n: int) -> list[dict]:
+    """Straightforward per-task loop the matrix engine must agree with."""
+    stats: dict[str, list[bool]] = {}
+    for r in results:
+        stats.setdefault(f"{r.agent_name}__{r.model_name}", []).append(r.passed)
+    others = sorted(
+        (k for k in stats if not k.startswith("Mux__")),
+        key=lambda k: sum(stats[k]) / len(stats[k]),
+        reverse=True,
+    )[:top_n]
+    unix = [k for k in stats if k.startswith("Mux__")]
+
+    cells: dict[str, dict[str, list[bool]]] = {}
+    for r in results:
+        key = f"{r.agent_name}__{r.model_name}"
+        if key in unix or key in others:
+            cells.setdefault(r.task_id, {}).setdefault(key, []).append(r.passed)
+
+    out = []
+    for agent in unix:
+        for task, by_agent in cells.items():
+            if agent not in by_agent:
+                continue
+            rates = {k: v.count(False) / len(v) for k, v in by_agent.items()}
+            other = [rates[a] for a in others if a in rates]
+            if not other or rates[agent] == 0:
+                continue
+            avg = sum(other) / len(other)
+            out.append(
+                {
+                    "task_id": task,
+                    "mux_fail_rate": rates[agent],
+                    "avg_other_fail_rate": avg,
+                    "ratio": rates[agent] / (avg + 0.01),
+                    "unix_agent": agent,
+                    "n_other_agents": len(other),
+                }
+            )
+    out.sort(key=lambda o: o["ratio"], reverse=True)
+    return out
+
+
+def test_matrix_counts_passes_and_attempts() -> None:
+    results = _results(
+        [
+            ("Mux__opus", "a", False),
+            ("Mux__opus", "a", True),
+            ("Other__x", "b", True),
+            ("Mux__opus", "b", False),
+        ]
+    )
+    matrix = TaskAgentMatrix.from_columns(ResultColumns.from_results(results))
+
+    assert matrix.tasks == ["a", "b"]
+    assert matrix.agents == ["Mux__opus", "Other__x"]
+    np.testing.assert_array_equal(matrix.passes, [[1, 0], [0, 1]])
+    np.testing.assert_array_equal(matrix.totals, [[2, 0], [1, 1]])
+    assert compute_task_failure_rates(results) == {
+        "a": {"Mux__opus": 0.5},
+        "b": {"Mux__opus": 1.0, "Other__x": 0.0},
+    }
+    stats = compute_agent_stats(results)
+    assert (stats["Mux__opus"].n_passed, stats["Mux__opus"].n_tasks) == (1, 3)
+
+
+def test_opportunities_match_reference_loop() -> None:
+    rng = random.Random(7)
+    keys = ["Mux__a@high", "Mux__b@low"] + [f"Agent{i}__M{i % 3}" for i in range(14)]
+    tasks = [f"task-{i}" for i in range(40)]
+    rows = [
+        (rng.choice(keys), rng.choice(tasks), rng.random() < 0.5) for _ in range(3000)
+    ]
+    results = _results(rows)
+
+    for top_n in (3, 10):
+        actual = find_optimization_opportunities(results, top_n_agents=top_n)
+        expected = _reference_opportunities(results, top_n)
+        point_estimates = [
+            {k: v for k, v in asdict(o).items() if v is not None} for o in actual
+        ]
+        assert json.dumps(point_estimates) == json.dumps(expected)
+
+
+def test_bootstrap_is_degenerate_for_unanimous_cells() -> None:
+    # Every cell is all-pass or all-fail, so resampling cannot move any ratio
+    rows = [("Mux__opus", "a", False)] * 3 + [("Mux__opus", "b", False)] * 2
+    rows += [("Other__x", "a", True)] * 4 + [("Other__x", "b", False)] * 4
+    opportunities = find_optimization_opportunities(
+        _results(rows), n_bootstrap=200, rank_top=1, seed=0
+    )
+
+    assert [o.task_id for o in opportunities] == ["a", "b"]
+    for o in opportunities:
+        assert o.ratio_ci_low == o.ratio_ci_high == o.ratio
+    assert [o.rank_stability for o in opportunities] == [1.0, 0.0]
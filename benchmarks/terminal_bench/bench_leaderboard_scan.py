@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs. process-pool parsing of leaderboard result.json files.
+
+Builds a synthetic submission tree shaped like the HuggingFace leaderboard
+(<Agent>__<Model>/<job>/<trial>/result.json) and times
+parse_leaderboard_results() for a range of worker counts.
+
+Usage:
+    # 100k trials, workers 1..16 (tree is generated in a temp dir)
+    python benchmarks/terminal_bench/bench_leaderboard_scan.py
+
+    # Reuse a generated tree between invocations
+    python benchmarks/terminal_bench/bench_leaderboard_scan.py --tree-dir /tmp/tb-tree
+
+    # Smaller run
+    python benchmarks/terminal_bench/bench_leaderboard_scan.py --trials 10000 --workers 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from .analyze_failure_rates import DATASET_VERSION, parse_leaderboard_results
+except ImportError:
+    from analyze_failure_rates import (  # type: ignore[import-not-found,no-redef]
+        DATASET_VERSION,
+        parse_leaderboard_results,
+    )
+
+TRIALS_PER_JOB = 89  # Terminal-Bench 2.0 task count
+
+
+def build_synthetic_tree(
+    root: Path, n_trials: int, n_agents: int, seed: int, n_mux_agents: int = 0
+) -> Path:
+    """Write a leaderboard-shaped tree with ``n_trials`` trial result.json files.
+
+    The first ``n_mux_agents`` agent indices are named ``Mux`` so the tree also
+    exercises the M/O-ratio report.
+    """
+    rng = random.Random(seed)
+    submissions = root / "submissions" / "terminal-bench" / DATASET_VERSION
+    tasks = [f"task-{i:03d}" for i in range(TRIALS_PER_JOB)]
+    # Roughly the size of a real Harbor trial result (agent_result dominates)
+    filler = "x" * 1500
+
+    written = 0
+    job = 0
+    while written < n_trials:
+        agent_idx = job % n_agents
+        agent_name = "Mux" if agent_idx < n_mux_agents else f"Agent{agent_idx}"
+        agent = f"{agent_name}__Model-{agent_idx % 7}"
+        job_dir = submissions / agent / f"2026-01-{job % 28 + 1:02d}__00-00-{job:05d}"
+        job_dir.mkdir(parents=True, exist_ok=True)
+        (job_dir / "result.json").write_text(json.dumps({"n_total_trials": 89}))
+        for task in tasks:
+            if written >= n_trials:
+                break
+            trial_dir = job_dir / f"{task}__{rng.getrandbits(32):08x}"
+            trial_dir.mkdir()
+            result = {
+                "task_name": task,
+                "agent_result": {"n_input_tokens": 1000, "notes": filler},
+                "verifier_result": {"rewards": {"reward": float(rng.random() < 0.6)}},
+            }
+            (trial_dir / "result.json").write_text(json.dumps(result))
+            written += 1
+        job += 1
+    return root
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark parallel leaderboard result parsing"
+    )
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--agents", type=int, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--tree-dir",
+        type=Path,
+        help="Generate (or reuse) the synthetic tree here instead of a temp dir",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cleanup = args.tree_dir is None
+    root = args.tree_dir or Path(tempfile.mkdtemp(prefix="tbench-scan-bench-"))
+    try:
+        if not (root / "submissions").exists():
+            print(f"Generating {args.trials} trials in {root}...", file=sys.stderr)
+            start = time.perf_counter()
+            build_synthetic_tree(root, args.trials, args.agents, args.seed)
+            print(f"  done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+        print(f"{'workers':>8} {'seconds':>9} {'trials/s':>10} {'speedup':>8}")
+        baseline = None
+        expected = None
+        for workers in args.workers:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = parse_leaderboard_results(root, workers=workers)
+                best = min(best, time.perf_counter() - start)
+            # Every configuration must agree with the first one
+            n_passed = sum(r.passed for r in results)
+            if expected is None:
+                expected = (len(results), n_passed)
+            elif expected != (len(results), n_passed):
+                print(f"Mismatch at {workers} workers", file=sys.stderr)
+                return 1
+            baseline = baseline or best
+            print(
+                f"{workers:>8} {best:>9.2f} {len(results) / best:>10.0f} "
+                f"{baseline / best:>7.2f}x"
+            )
+    finally:
+        if cleanup:
+            shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak RSS and parse-to-report time of the failure-rate analysis.
+
+Each mode runs in a fresh child process over the same synthetic leaderboard
+tree (see bench_leaderboard_scan.py) and goes from result.json files to the
+printed opportunity report:
+
+    legacy   - one plain (dict-backed) dataclass per trial, as before slots
+    objects  - one slotted TaskResult per trial (parse_leaderboard_results)
+    columns  - interned NumPy columns, no per-trial objects
+               (parse_leaderboard_columns)
+
+Usage:
+    python benchmarks/terminal_bench/bench_result_memory.py --trials 200000
+    python benchmarks/terminal_bench/bench_result_memory.py --tree-dir /tmp/tb-tree
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from . import analyze_failure_rates as afr
+    from .bench_leaderboard_scan import build_synthetic_tree
+except ImportError:
+    import analyze_failure_rates as afr  # type: ignore[import-not-found,no-redef]
+    from bench_leaderboard_scan import (  # type: ignore[import-not-found,no-redef]
+        build_synthetic_tree,
+    )
+
+MODES = ("legacy", "objects", "columns")
+
+
+@dataclass
+class _LegacyTaskResult:
+    """TaskResult as it was before slots (per-instance __dict__)."""
+
+    task_id: str
+    passed: bool
+    agent_name: str
+    model_name: str
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_child(mode: str, root: Path) -> dict:
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        if mode == "columns":
+            results = afr.parse_leaderboard_columns(root, exclude_mux=False)
+        elif mode == "objects":
+            results = afr.parse_leaderboard_results(root, exclude_mux=False)
+        else:
+            results = [
+                _LegacyTaskResult(
+                    chunk.task_ids[code], bool(p), chunk.agent_name, chunk.model_name
+                )
+                for chunk in afr.scan_leaderboard_results(root, exclude_mux=False)
+                for code, p in zip(chunk.task_codes, chunk.passed)
+            ]
+        parsed = time.perf_counter()
+        opportunities = afr.find_optimization_opportunities(results)
+    with contextlib.redirect_stdout(io.StringIO()):
+        afr.print_opportunities(opportunities)
+    done = time.perf_counter()
+    return {
+        "rows": len(results),
+        "parse_s": parsed - start,
+        "total_s": done - start,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark memory/time of result containers"
+    )
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--agents", type=int, default=60)
+    parser.add_argument("--tree-dir", type=Path)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_run_child(args.child, args.tree_dir)))
+        return 0
+
+    cleanup = args.tree_dir is None
+    root = args.tree_dir or Path(tempfile.mkdtemp(prefix="tbench-mem-bench-"))
+    try:
+        if not (root / "submissions").exists():
+            print(f"Generating {args.trials} trials in {root}...", file=sys.stderr)
+            build_synthetic_tree(root, args.trials, args.agents, seed=0, n_mux_agents=2)
+
+        print(f"{'mode':<8} {'rows':>8} {'parse s':>8} {'report s':>9} {'peak RSS':>9}")
+        for mode in args.modes:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--tree-dir", str(root)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            r = json.loads(out.stdout)
+            print(
+                f"{mode:<8} {r['rows']:>8} {r['parse_s']:>8.2f} {r['total_s']:>9.2f} "
+                f"{r['peak_rss_mb']:>7.0f}MB"
+            )
+    finally:
+        if cleanup:
+            shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
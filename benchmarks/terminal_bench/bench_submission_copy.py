@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark how prepare_submission puts trial files into the submission folder.
+
+Builds a synthetic multi-model run (per model: one job with N trials, each
+with agent logs and verifier output) and prepares a submission from it with
+each strategy, reporting wall time and the extra disk space the submission
+takes (free-space delta of the filesystem, so hardlinks and reflinks count
+as free).
+
+Usage:
+    python benchmarks/terminal_bench/bench_submission_copy.py
+
+    # Bigger logs, on the filesystem the artifacts are downloaded to
+    python benchmarks/terminal_bench/bench_submission_copy.py --log-kb 2048 --root /mnt/scratch
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from . import prepare_leaderboard_submission as pls
+except ImportError:
+    import prepare_leaderboard_submission as pls  # type: ignore[import-not-found,no-redef]
+
+MODELS = ("anthropic/claude-opus-4-5", "openai/gpt-5.2", "openai/gpt-5-codex")
+
+
+def build_run(root: Path, n_trials: int, log_kb: int, seed: int) -> Path:
+    """Artifacts laid out like download_run_artifacts output."""
+    rng = random.Random(seed)
+    for model in MODELS:
+        job = root / f"terminal-bench-results-{model.replace('/', '-')}" / "jobs"
+        job = job / "2026-01-16__00-15-05"
+        job.mkdir(parents=True)
+        (job / "config.json").write_text("{}")
+        (job / "result.json").write_text(json.dumps({"n_total_trials": n_trials}))
+        for i in range(n_trials):
+            trial = job / f"task-{i:03d}__{rng.getrandbits(32):08x}"
+            cmd = trial / "agent" / "command-0"
+            cmd.mkdir(parents=True)
+            (trial / "verifier").mkdir()
+            (trial / "config.json").write_text(
+                json.dumps({"agent": {"model_name": model}})
+            )
+            (trial / "result.json").write_text(json.dumps({"passed": True}))
+            (cmd / "stdout.txt").write_bytes(rng.randbytes(log_kb * 1024))
+            (cmd / "stderr.txt").write_bytes(rng.randbytes(log_kb * 64))
+            (trial / "verifier" / "test-stdout.txt").write_text("ok\n" * 500)
+            (trial / "agent" / "unix-app.tar.gz").write_bytes(b"\0" * 4096)
+    return root
+
+
+def free_bytes(path: Path) -> int:
+    os.sync()
+    return shutil.disk_usage(path).free
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark submission copy modes")
+    parser.add_argument("--trials", type=int, default=89, help="Trials per model")
+    parser.add_argument("--log-kb", type=int, default=512, help="Agent stdout size")
+    parser.add_argument("--workers", type=int, default=pls.COPY_WORKERS)
+    parser.add_argument("--root", type=Path, help="Scratch directory (default: tmp)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="tbench-copy-bench-", dir=args.root))
+    try:
+        artifacts = build_run(root / "artifacts", args.trials, args.log_kb, args.seed)
+        size = sum(f.stat().st_size for f in artifacts.rglob("*") if f.is_file())
+        print(
+            f"Run: {len(MODELS)} models x {args.trials} trials, "
+            f"{size / 1e6:.0f} MB of artifacts in {root}"
+        )
+        print(f"{'strategy':<22} {'time':>8} {'extra disk':>11}  files")
+        strategies = [
+            ("serial copy (before)", "copy", 1),
+            ("threaded copy", "copy", args.workers),
+            ("auto (reflink/link)", "auto", args.workers),
+        ]
+        for label, mode, workers in strategies:
+            out = root / f"out-{mode}-{workers}"
+            before = free_bytes(root)
+            start = time.perf_counter()
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                pls.prepare_submission(artifacts, out, link_mode=mode, workers=workers)
+            elapsed = time.perf_counter() - start
+            extra = before - free_bytes(root)
+            files = next(
+                line.split(":", 1)[1].strip()
+                for line in log.getvalue().splitlines()
+                if line.strip().startswith("Files:")
+            )
+            print(f"{label:<22} {elapsed:>7.2f}s {extra / 1e6:>9.1f}MB  {files}")
+            shutil.rmtree(out)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark a full artifact download vs. the lazy results-first fetch.
+
+Serves a synthetic artifact zip (one job, N trials with agent logs) from a
+local HTTP server that honours Range requests and simulates bandwidth and
+per-request latency, then times how long each strategy takes until the
+pass/fail summary is available.
+
+Usage:
+    python benchmarks/terminal_bench/bench_tiered_fetch.py
+
+    # Slower link, bigger logs
+    python benchmarks/terminal_bench/bench_tiered_fetch.py --mbps 20 --log-kb 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+try:
+    from .download_run_logs import find_trial_results
+    from .remote_zip import RemoteZip
+    from .tbench_utils import is_trial_result
+except ImportError:
+    from download_run_logs import (  # type: ignore[import-not-found,no-redef]
+        find_trial_results,
+    )
+    from remote_zip import RemoteZip  # type: ignore[import-not-found,no-redef]
+    from tbench_utils import is_trial_result  # type: ignore[import-not-found,no-redef]
+
+
+def build_artifact(n_trials: int, log_kb: int, seed: int) -> bytes:
+    """Zip shaped like a terminal-bench-results artifact."""
+    rng = random.Random(seed)
+    buf = io.BytesIO()
+    job = "jobs/2026-01-16__00-15-05"
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{job}/result.json", json.dumps({"n_total_trials": n_trials}))
+        for i in range(n_trials):
+            trial = f"{job}/task-{i:03d}__{rng.getrandbits(32):08x}"
+            reward = float(rng.random() < 0.6)
+            result = {
+                "task_name": f"task-{i:03d}",
+                "verifier_result": {"rewards": {"reward": reward}},
+            }
+            zf.writestr(f"{trial}/result.json", json.dumps(result))
+            # Agent JSONL streams compress roughly 4:1; mimic that
+            log = rng.randbytes(log_kb * 256) * 4
+            zf.writestr(f"{trial}/agent/command-0/stdout.txt", log)
+            zf.writestr(f"{trial}/verifier/test-stdout.txt", "ok\n" * 200)
+    return buf.getvalue()
+
+
+def serve(body: bytes, bytes_per_sec: float, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            chunk = body
+            if "Range" in self.headers:
+                start, end = self.headers["Range"].removeprefix("bytes=").split("-")
+                chunk = body[int(start) : int(end) + 1]
+                self.send_response(206)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(chunk)))
+            self.end_headers()
+            for i in range(0, len(chunk), 64 * 1024):
+                piece = chunk[i : i + 64 * 1024]
+                time.sleep(len(piece) / bytes_per_sec)
+                self.wfile.write(piece)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark lazy vs. full log fetch")
+    parser.add_argument("--trials", type=int, default=89)
+    parser.add_argument("--log-kb", type=int, default=512, help="Agent log size")
+    parser.add_argument("--mbps", type=float, default=100, help="Link speed (Mbit/s)")
+    parser.add_argument(
+        "--latency-ms", type=float, default=50, help="Per-request latency"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    body = build_artifact(args.trials, args.log_kb, args.seed)
+    server = serve(body, args.mbps * 1e6 / 8, args.latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_port}/artifact.zip"
+    root = Path(tempfile.mkdtemp(prefix="tbench-fetch-bench-"))
+    try:
+        start = time.perf_counter()
+        with urllib.request.urlopen(url) as resp:
+            data = resp.read()
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            zf.extractall(root / "full")
+        full_results = find_trial_results(root / "full")
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        remote = RemoteZip(lambda: url, len(body))
+        members = [i for i in remote.infolist() if is_trial_result(i.filename)]
+        remote.extract_many(members, root / "lazy")
+        lazy_results = find_trial_results(root / "lazy")
+        lazy_time = time.perf_counter() - start
+
+        summary = [(r["task_name"], r["passed"]) for r in full_results]
+        if summary != [(r["task_name"], r["passed"]) for r in lazy_results]:
+            print("Summaries differ", file=sys.stderr)
+            return 1
+
+        print(
+            f"Artifact: {len(body) / 1e6:.1f} MB, {args.trials} trials, {args.mbps:g} Mbit/s, "
+            f"{args.latency_ms:g} ms/request"
+        )
+        print(f"{'mode':<6} {'MB':>8} {'requests':>9} {'time-to-summary':>16}")
+        print(f"{'full':<6} {len(data) / 1e6:>8.2f} {1:>9} {full_time:>15.2f}s")
+        print(
+            f"{'lazy':<6} {remote.reader.bytes_transferred / 1e6:>8.2f} "
+            f"{remote.reader.requests:>9} {lazy_time:>15.2f}s"
+        )
+    finally:
+        server.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
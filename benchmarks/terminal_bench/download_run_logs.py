@@ -24,12 +24,34 @@ Usage:
     # Show failures only
     python download_run_logs.py --failures-only
 
+    # Fetch only result.json files, then logs of the failed trials
+    python download_run_logs.py --lazy --failures-only
+
+    # Print trials while the run directory is still being scanned
+    python download_run_logs.py --run-id 21230456195 --stream
+
+    # Find trials whose logs contain a string, across all cached runs
+    python download_run_logs.py search "bun: command not found"
+    python download_run_logs.py search "AssertionError" --kind verifier --task fix-git
+
+    # Group failures of all cached runs by normalized error tail
+    python download_run_logs.py cluster --top 10
+
+    # Tasks that flipped between two runs (result.json files only)
+    python download_run_logs.py diff 21230456195 21260112233 --model opus
+
 Prerequisites:
     - GitHub CLI (gh) installed and authenticated
     - Access to coder/unix repository
 
 Output structure:
+    .run_logs/.log_index.sqlite  # Full-text index used by the search subcommand
+    .run_logs/.cache_state.json  # Last use of each run (see run_cache.py)
+    .run_logs/.packs/<run-id>.zip  # Compacted runs, unpacked again on use
     .run_logs/<run-id>/
+        .download_manifest.json  # Artifacts verified and extracted so far
+        .trial_index.json        # Cached trial summary (rebuilt when dirs change)
+        .archives/<artifact-name>.zip  # Only with --keep-archives
         <artifact-name>/
             jobs/<timestamp>/
                 trials/
@@ -47,69 +69,236 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import re
 import sys
+import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 try:
+    from . import failure_clusters, log_index, run_cache, run_diff
     from .tbench_utils import (
+        FetchStats,
         download_run_artifacts,
         extract_task_id,
+        fetch_run_results,
+        fetch_trial_payloads,
+        get_duration_sec,
         get_passed,
+        get_token_counts,
         list_nightly_runs,
+        load_download_manifest,
+        run_download_complete,
+        tail_lines,
     )
 except ImportError:
+    import failure_clusters  # type: ignore[import-not-found,no-redef]
+    import log_index  # type: ignore[import-not-found,no-redef]
+    import run_cache  # type: ignore[import-not-found,no-redef]
+    import run_diff  # type: ignore[import-not-found,no-redef]
     from tbench_utils import (  # type: ignore[import-not-found,no-redef]
+        FetchStats,
         download_run_artifacts,
         extract_task_id,
+        fetch_run_results,
+        fetch_trial_payloads,
+        get_duration_sec,
         get_passed,
+        get_token_counts,
         list_nightly_runs,
+        load_download_manifest,
+        run_download_complete,
+        tail_lines,
     )
 
 CACHE_DIR = Path(__file__).parent / ".run_logs"
 
+# Per-run trial index (see find_trial_results)
+INDEX_FILE = ".trial_index.json"
+INDEX_VERSION = 3
+INDEX_FIELDS = (
+    "path",
+    "task_name",
+    "trial_name",
+    "artifact",
+    "passed",
+    "has_exception",
+    "n_input_tokens",
+    "n_output_tokens",
+    "duration_sec",
+)
+
+
+# Job-level folders use timestamp format: YYYY-MM-DD__HH-MM-SS
+JOB_DIR_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}__\d{2}-\d{2}-\d{2}$")
+
+
+def _iter_scanned_trials(run_dir: Path) -> Iterator[dict]:
+    """Walk run_dir and parse trial result.json files as they are found.
+
+    Directories are visited in name order, so trials come out grouped by
+    artifact. Trial directories are not descended into (their agent and
+    verifier logs can be huge and never hold trials), and staging directories
+    (.<artifact>.partial) are skipped.
+    """
+    for dirpath, dirnames, filenames in os.walk(run_dir):
+        current = Path(dirpath)
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        if current == run_dir or "result.json" not in filenames:
+            continue
+        # Skip job-level result.json files (in jobs/<timestamp>/ directly)
+        if JOB_DIR_PATTERN.match(current.name):
+            continue
+        # Skip if parent is 'logs' or 'output'
+        if current.name in ("logs", "output", "verifier", "agent"):
+            continue
+        dirnames.clear()
+
+        result_file = current / "result.json"
+        try:
+            data = json.loads(result_file.read_text())
+        except (json.JSONDecodeError, OSError):
+            continue
+        n_input_tokens, n_output_tokens = get_token_counts(data)
+        # Derive task_name from folder structure (format: task-name__HASH)
+        # Fall back to JSON field if present
+        yield {
+            "path": result_file,
+            "task_name": data.get("task_name") or extract_task_id(current.name),
+            "trial_name": data.get("trial_name") or current.name,
+            "artifact": result_file.relative_to(run_dir).parts[0],
+            "passed": get_passed(data),
+            "has_exception": bool(data.get("exception_info")),
+            "n_input_tokens": n_input_tokens,
+            "n_output_tokens": n_output_tokens,
+            "duration_sec": get_duration_sec(data),
+        }
+
+
+def _scan_trial_results(run_dir: Path) -> list[dict]:
+    """Walk run_dir and parse every trial result.json (no index involved)."""
+    return sorted(
+        _iter_scanned_trials(run_dir), key=lambda x: (x["artifact"], x["task_name"])
+    )
+
+
+def _index_dirs(run_dir: Path, results: list[dict]) -> dict[str, int]:
+    """mtimes of every directory below run_dir that holds trial directories.
 
-def find_trial_results(run_dir: Path) -> list[dict]:
+    Adding or replacing a job or trial changes one of these, which is what
+    invalidates the index. run_dir itself is covered by _artifact_names
+    (writing the index changes its mtime).
+    """
+    dirs: set[Path] = set()
+    for r in results:
+        d = r["path"].parent.parent
+        while d != run_dir and d not in dirs:
+            dirs.add(d)
+            d = d.parent
+    return {str(d.relative_to(run_dir)): d.stat().st_mtime_ns for d in dirs}
+
+
+def _artifact_names(run_dir: Path) -> list[str]:
+    return sorted(p.name for p in run_dir.iterdir() if not p.name.startswith("."))
+
+
+def load_trial_index(run_dir: Path) -> list[dict] | None:
+    """Trial records from the run's index, or None if missing or stale."""
+    try:
+        index = json.loads((run_dir / INDEX_FILE).read_text())
+        if index.get("version") != INDEX_VERSION:
+            return None
+        if index["artifacts"] != _artifact_names(run_dir):
+            return None
+        for rel, mtime in index["dirs"].items():
+            if (run_dir / rel).stat().st_mtime_ns != mtime:
+                return None
+    except (OSError, json.JSONDecodeError, KeyError):
+        return None
+    fields = index["fields"]
+    results = []
+    for row in index["trials"]:
+        record = dict(zip(fields, row))
+        record["path"] = run_dir / record["path"]
+        results.append(record)
+    return results
+
+
+def write_trial_index(run_dir: Path, results: list[dict]) -> None:
+    """Persist trial records (one compact row each) next to the run data."""
+    fields = ["path", *(f for f in INDEX_FIELDS if f != "path")]
+    index = {
+        "version": INDEX_VERSION,
+        "artifacts": _artifact_names(run_dir),
+        "dirs": _index_dirs(run_dir, results),
+        "fields": fields,
+        "trials": [
+            [str(r["path"].relative_to(run_dir)), *(r[f] for f in fields[1:])]
+            for r in results
+        ],
+    }
+    tmp = run_dir / f"{INDEX_FILE}.tmp"
+    tmp.write_text(json.dumps(index, separators=(",", ":")))
+    os.replace(tmp, run_dir / INDEX_FILE)
+
+
+def find_trial_results(run_dir: Path, use_index: bool = True) -> list[dict]:
     """Find all trial results in a downloaded run directory.
 
     Derives task/trial identifiers from folder structure (like analyze_failure_rates.py)
     rather than requiring them in the JSON, since some results omit these fields.
+
+    Records come from ``<run_dir>/.trial_index.json`` when it is still valid;
+    otherwise the directory is scanned and the index rewritten. Records hold
+    only the fields needed for filtering and the summary -- load the
+    result.json at ``path`` for details.
     """
-    import re
+    if use_index:
+        indexed = load_trial_index(run_dir)
+        if indexed is not None:
+            return indexed
+    results = _scan_trial_results(run_dir)
+    if run_dir.is_dir():
+        write_trial_index(run_dir, results)
+    return results
+
+
+def iter_trial_results(run_dir: Path) -> Iterator[dict]:
+    """Trial records of a run as they are discovered, grouped by artifact.
+
+    Streaming counterpart of find_trial_results() for printing: a valid index
+    is replayed as is; otherwise the directory walk is yielded trial by trial
+    without collecting (or indexing) the records, so a cold run starts
+    printing immediately.
+    """
+    indexed = load_trial_index(run_dir)
+    if indexed is not None:
+        yield from indexed
+    else:
+        yield from _iter_scanned_trials(run_dir)
 
-    # Job-level folders use timestamp format: YYYY-MM-DD__HH-MM-SS
-    timestamp_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}__\d{2}-\d{2}-\d{2}$")
 
-    results = []
-    for result_file in run_dir.rglob("result.json"):
-        # Skip job-level result.json files (in jobs/<timestamp>/ directly)
-        if timestamp_pattern.match(result_file.parent.name):
+def filter_trials(trials: Iterable[dict], args: argparse.Namespace) -> Iterator[dict]:
+    """Apply the --task, --model and --failures-only filters lazily."""
+    model = args.model.lower().replace("/", "-") if args.model else None
+    for trial in trials:
+        if args.task and args.task.lower() not in trial["task_name"].lower():
             continue
-        # Skip if parent is 'logs' or 'output'
-        if result_file.parent.name in ("logs", "output", "verifier", "agent"):
+        # Filter by checking the artifact path
+        if model and model not in str(trial["path"]).lower():
             continue
-
-        try:
-            data = json.loads(result_file.read_text())
-
-            # Derive task_name from folder structure (format: task-name__HASH)
-            # Fall back to JSON field if present
-            trial_folder = result_file.parent.name
-            task_name = data.get("task_name") or extract_task_id(trial_folder)
-            trial_name = data.get("trial_name") or trial_folder
-
-            results.append(
-                {
-                    "path": result_file,
-                    "task_name": task_name,
-                    "trial_name": trial_name,
-                    "passed": get_passed(data),
-                    "data": data,
-                }
-            )
-        except (json.JSONDecodeError, OSError):
+        if args.failures_only and trial["passed"] is not False:
             continue
+        yield trial
+
 
-    return sorted(results, key=lambda x: x["task_name"])
+def model_name(trial: dict) -> str:
+    """Model of a trial, from its terminal-bench-results-<model> artifact."""
+    for part in trial["path"].parts:
+        if part.startswith("terminal-bench-results-"):
+            return part.replace("terminal-bench-results-", "")
+    return "unknown"
 
 
 def print_trial_summary(trial: dict, verbose: bool = False) -> None:
@@ -132,19 +321,21 @@ def print_trial_summary(trial: dict, verbose: bool = False) -> None:
         if agent_dir.exists():
             for cmd_dir in sorted(agent_dir.iterdir()):
                 if cmd_dir.is_dir() and cmd_dir.name.startswith("command-"):
-                    stdout_file = cmd_dir / "stdout.txt"
                     stderr_file = cmd_dir / "stderr.txt"
                     if stderr_file.exists():
-                        stderr = stderr_file.read_text().strip()
-                        if stderr:
-                            # Show last 10 lines of stderr
-                            lines = stderr.split("\n")[-10:]
+                        # Show last 10 lines of stderr (read from the end)
+                        lines = tail_lines(stderr_file, 10)
+                        if lines:
                             print(f"         stderr (last {len(lines)} lines):")
                             for line in lines:
                                 print(f"           {line[:100]}")
 
-        # Check for exception info
-        data = trial["data"]
+        # Check for exception info (details are not kept in the index); the
+        # indexed result.json may since have been removed or be partly written
+        try:
+            data = json.loads(result_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return
         if data.get("exception_info"):
             print(f"         exception: {data['exception_info']}")
 
@@ -154,6 +345,148 @@ def print_trial_summary(trial: dict, verbose: bool = False) -> None:
             print(f"         verifier: {json.dumps(vr.get('rewards', {}))}")
 
 
+def print_streaming_summary(
+    trials: Iterable[dict], failures_only: bool = False, verbose: bool = False
+) -> dict[str, tuple[int, int]]:
+    """
+    Print each trial as it arrives, with a pass count after each model.
+
+    Nothing is held beyond the current trial and the per-model counters, so
+    memory does not grow with the size of the run. Trials must be grouped by
+    model (as iter_trial_results yields them). Returns {model: (passed, total)}.
+    """
+    counts: dict[str, tuple[int, int]] = {}
+    current = None
+    for trial in trials:
+        model = model_name(trial)
+        if model != current:
+            if current is not None:
+                print(f"  {current}: {counts[current][0]}/{counts[current][1]} passed")
+            print(f"\n{model}:")
+            current = model
+        passed, total = counts.get(model, (0, 0))
+        counts[model] = (passed + bool(trial["passed"]), total + 1)
+        if not failures_only or not trial["passed"]:
+            print_trial_summary(trial, verbose=verbose)
+    if current is not None:
+        print(f"  {current}: {counts[current][0]}/{counts[current][1]} passed")
+    return counts
+
+
+def cached_run_dirs(cache_dir: Path) -> list[Path]:
+    """Run directories in the log cache (hidden entries are bookkeeping)."""
+    if not cache_dir.is_dir():
+        return []
+    return sorted(
+        p for p in cache_dir.iterdir() if p.is_dir() and not p.name.startswith(".")
+    )
+
+
+def has_artifacts(run_dir: Path) -> bool:
+    """Whether run_dir holds any extracted artifact data."""
+    return run_dir.is_dir() and any(
+        not p.name.startswith(".") for p in run_dir.iterdir()
+    )
+
+
+def search_logs(args: argparse.Namespace) -> int:
+    """The ``search`` subcommand: update the log index, then query it."""
+    started = time.perf_counter()
+    conn = log_index.connect(args.output_dir)
+    if not args.no_update:
+        for run_dir in cached_run_dirs(args.output_dir):
+            n = log_index.index_run(conn, run_dir, find_trial_results(run_dir))
+            if n:
+                print(
+                    f"Indexed {n} log file(s) from run {run_dir.name}", file=sys.stderr
+                )
+    indexed = time.perf_counter()
+
+    try:
+        matches = log_index.search(
+            conn,
+            args.text,
+            run_id=args.search_run_id or (str(args.run_id) if args.run_id else None),
+            task=args.task,
+            kind=args.kind,
+            failures_only=args.failures_only,
+            limit=args.limit,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+    for m in matches:
+        status = "PASS" if m["passed"] else "FAIL" if m["passed"] == 0 else "?"
+        model = (m["artifact"] or "").replace("terminal-bench-results-", "")
+        print(f"{m['run_id']}  {model}  {status}  {m['task_name']}  [{m['kind']}]")
+        print(f"    {m['path']}")
+        snippet = " ".join(m["snippet"].split())
+        print(f"    {snippet[:200]}")
+    print(
+        f"\n{len(matches)} match(es) in {time.perf_counter() - indexed:.3f}s "
+        f"(index update {indexed - started:.2f}s)"
+    )
+    return 0
+
+
+def cluster_logs(args: argparse.Namespace) -> int:
+    """The ``cluster`` subcommand: group failed trials by error signature."""
+    started = time.perf_counter()
+    run_dirs = cached_run_dirs(args.output_dir)
+    run_ids = args.cluster_run_ids or ([str(args.run_id)] if args.run_id else [])
+    if run_ids:
+        run_dirs = [d for d in run_dirs if d.name in run_ids]
+    if not run_dirs:
+        print(f"No cached runs in {args.output_dir}", file=sys.stderr)
+        return 1
+
+    trials = [t for run_dir in run_dirs for t in find_trial_results(run_dir)]
+    if args.task:
+        trials = [t for t in trials if args.task.lower() in t["task_name"].lower()]
+    if args.model:
+        model = args.model.lower().replace("/", "-")
+        trials = [t for t in trials if model in str(t["path"]).lower()]
+
+    failures = failure_clusters.collect_failures(trials)
+    clusters = failure_clusters.cluster_failures(failures, threshold=args.threshold)
+    print(f"Runs: {', '.join(d.name for d in run_dirs)}")
+    failure_clusters.print_clusters(clusters, args.top)
+    print(f"Clustered in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def run_trials(run_id: str, output_dir: Path) -> list[dict] | None:
+    """Trial records of a run: from the cache, else a results-only fetch."""
+    run_dir = run_cache.ensure_hot(output_dir, run_id)
+    run_cache.touch(output_dir, run_id)
+    trials = find_trial_results(run_dir) if run_dir.is_dir() else []
+    if trials:
+        return trials
+    if fetch_run_results(int(run_id), run_dir, verbose=True) is None:
+        return None
+    return find_trial_results(run_dir)
+
+
+def diff_run_results(args: argparse.Namespace) -> int:
+    """The ``diff`` subcommand: flipped tasks and usage changes between runs."""
+    started = time.perf_counter()
+    filters = argparse.Namespace(task=args.task, model=args.model, failures_only=False)
+    summaries = []
+    for run_id in (args.run_a, args.run_b):
+        trials = run_trials(run_id, args.output_dir)
+        if trials is None:
+            return 1
+        summaries.append(run_diff.summarize_trials(filter_trials(trials, filters)))
+
+    diffs = run_diff.diff_runs(*summaries)
+    run_diff.print_diff(diffs, args.run_a, args.run_b, show_all=args.all)
+    print(f"\nDiffed in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download and inspect Terminal-Bench run logs"
@@ -187,7 +520,111 @@ def main():
         default=CACHE_DIR,
         help=f"Output directory (default: {CACHE_DIR})",
     )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Fetch only result.json files, then agent/verifier logs for the "
+        "trials whose details are shown (failures, or all with -v)",
+    )
+    parser.add_argument(
+        "--keep-archives",
+        action="store_true",
+        help="Keep the downloaded artifact zips in <run-id>/.archives (e.g. for "
+        "prepare_leaderboard_submission.py --artifacts-dir)",
+    )
+    parser.add_argument(
+        "--max-cache-size",
+        type=run_cache.parse_size,
+        help="Cap the run-log cache (e.g. 20G); least recently used runs are "
+        "deleted. See run_cache.py to pack old runs instead",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print trials as they are found instead of collecting the whole "
+        "run first (constant memory). Opt-in because each model's pass count "
+        "then follows its trials instead of heading them, and a cold run is "
+        "not indexed for the next invocation; not with --lazy, which needs "
+        "every failure before fetching logs",
+    )
+    sub = parser.add_subparsers(dest="command")
+    search_parser = sub.add_parser(
+        "search", help="Search agent and verifier logs of all cached runs"
+    )
+    search_parser.add_argument("text", help="Substring to find (case-insensitive)")
+    # Distinct dests: a subparser default would reset the top-level option
+    # (--task and --model are merged below, --run-id where it is used)
+    search_parser.add_argument(
+        "--run-id", dest="search_run_id", help="Only search this run"
+    )
+    search_parser.add_argument(
+        "--task", dest="sub_task", help="Filter to task name (substring)"
+    )
+    search_parser.add_argument(
+        "--kind", choices=["stdout", "stderr", "verifier"], help="Only this log kind"
+    )
+    search_parser.add_argument(
+        "--failures-only", action="store_true", help="Only failed trials"
+    )
+    search_parser.add_argument("--limit", type=int, default=50)
+    search_parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="Search the existing index without indexing new downloads",
+    )
+    cluster_parser = sub.add_parser(
+        "cluster", help="Group failures of cached runs by error signature"
+    )
+    cluster_parser.add_argument(
+        "--run-id",
+        dest="cluster_run_ids",
+        action="append",
+        help="Only this run (repeatable; default: every cached run)",
+    )
+    cluster_parser.add_argument(
+        "--task", dest="sub_task", help="Filter to task name (substring)"
+    )
+    cluster_parser.add_argument(
+        "--model", dest="sub_model", help="Filter to model (substring)"
+    )
+    cluster_parser.add_argument("--top", type=int, default=20)
+    cluster_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=failure_clusters.DEFAULT_THRESHOLD,
+        help="Minimum estimated Jaccard similarity to merge (default: %(default)s)",
+    )
+    diff_parser = sub.add_parser(
+        "diff", help="Tasks that flipped between two runs, with usage changes"
+    )
+    diff_parser.add_argument("run_a", help="Baseline run ID")
+    diff_parser.add_argument("run_b", help="Run ID to compare against the baseline")
+    diff_parser.add_argument(
+        "--task", dest="sub_task", help="Filter to task name (substring)"
+    )
+    diff_parser.add_argument(
+        "--model", dest="sub_model", help="Filter to model (substring)"
+    )
+    diff_parser.add_argument(
+        "--all", action="store_true", help="Also list tasks whose status is unchanged"
+    )
     args = parser.parse_args()
+    args.task = getattr(args, "sub_task", None) or args.task
+    args.model = getattr(args, "sub_model", None) or args.model
+    if args.stream and args.lazy:
+        parser.error("--stream cannot be combined with --lazy")
+    if args.command == "diff":
+        for run_id in (args.run_a, args.run_b):
+            if not run_id.isdigit():
+                parser.error(f"diff: run ID must be numeric, got {run_id!r}")
+    started = time.perf_counter()
+
+    if args.command == "search":
+        return search_logs(args)
+    if args.command == "cluster":
+        return cluster_logs(args)
+    if args.command == "diff":
+        return diff_run_results(args)
 
     # List runs mode
     if args.list_runs:
@@ -218,32 +655,58 @@ def main():
         run_id = completed_runs[0]["databaseId"]
         print(f"Using latest completed run: {run_id}")
 
-    # Download if needed - include smoke test artifacts for log inspection
-    run_dir = args.output_dir / str(run_id)
-    if not run_dir.exists():
-        if not download_run_artifacts(
-            run_id, run_dir, include_smoke_test=True, verbose=True
-        ):
-            return 1
+    # Download missing or partial artifacts (complete ones are kept from the
+    # manifest) - include smoke test artifacts for log inspection
+    run_dir = run_cache.ensure_hot(args.output_dir, str(run_id))
+    run_cache.touch(args.output_dir, str(run_id))
+    stats: FetchStats | None = None
+    if run_download_complete(run_dir) or (
+        not load_download_manifest(run_dir) and has_artifacts(run_dir)
+    ):
+        # Complete, or downloaded before the manifest existed: no gh calls
+        print(f"Using cached run data in {run_dir}")
     else:
-        print(f"Using cached run data from {run_dir}")
+        if args.lazy:
+            stats = fetch_run_results(
+                run_id, run_dir, include_smoke_test=True, verbose=True
+            )
+            ok = stats is not None
+        else:
+            ok = download_run_artifacts(
+                run_id,
+                run_dir,
+                include_smoke_test=True,
+                verbose=True,
+                keep_archives=args.keep_archives,
+            )
+        if not ok:
+            if not has_artifacts(run_dir):
+                return 1
+            print(
+                f"Warning: download failed; using the cached data in {run_dir}",
+                file=sys.stderr,
+            )
+    # Evict after the download so this run's size counts toward the limit
+    if args.max_cache_size:
+        evicted = run_cache.enforce_limit(
+            args.output_dir, args.max_cache_size, keep=(str(run_id),)
+        )
+        if evicted:
+            print(f"Evicted {len(evicted)} least recently used run(s) from the cache")
+
+    if args.stream:
+        counts = print_streaming_summary(
+            filter_trials(iter_trial_results(run_dir), args),
+            failures_only=args.failures_only,
+            verbose=args.verbose,
+        )
+        if not counts:
+            print("No matching results found")
+        print(f"\nStreamed in {time.perf_counter() - started:.1f}s")
+        return 0
 
     # Find and filter results
-    results = find_trial_results(run_dir)
-
-    if args.task:
-        results = [r for r in results if args.task.lower() in r["task_name"].lower()]
-
-    if args.model:
-        # Filter by checking the artifact path
-        def matches_model(r):
-            path_str = str(r["path"]).lower()
-            return args.model.lower().replace("/", "-") in path_str
-
-        results = [r for r in results if matches_model(r)]
-
-    if args.failures_only:
-        results = [r for r in results if r["passed"] is False]
+    results = list(filter_trials(find_trial_results(run_dir), args))
 
     if not results:
         print("No matching results found")
@@ -252,14 +715,13 @@ def main():
     # Group by model (artifact name)
     by_model: dict[str, list[dict]] = {}
     for r in results:
-        # Extract model from path
-        parts = r["path"].parts
-        model = "unknown"
-        for p in parts:
-            if p.startswith("terminal-bench-results-"):
-                model = p.replace("terminal-bench-results-", "")
-                break
-        by_model.setdefault(model, []).append(r)
+        by_model.setdefault(model_name(r), []).append(r)
+    time_to_summary = time.perf_counter() - started
+
+    if stats is not None:
+        # Tier 2: logs only for trials whose details are printed below
+        drill = [r["path"].parent for r in results if args.verbose or not r["passed"]]
+        log_stats = fetch_trial_payloads(run_id, run_dir, drill, verbose=True)
 
     # Print results
     for model, trials in sorted(by_model.items()):
@@ -270,6 +732,14 @@ def main():
             if not args.failures_only or not trial["passed"]:
                 print_trial_summary(trial, verbose=args.verbose)
 
+    print(f"\nSummary ready in {time_to_summary:.1f}s")
+    if stats is not None:
+        print(
+            f"Transferred {stats.bytes_transferred / 1e6:.1f} MB in "
+            f"{stats.requests} request(s) for results, "
+            f"{log_stats.bytes_transferred / 1e6:.1f} MB for logs of {len(drill)} "
+            f"trial(s); full artifacts are {stats.full_bytes / 1e6:.1f} MB"
+        )
     return 0
 
 
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from . import download_run_logs
+from .download_run_logs import INDEX_FILE, find_trial_results
+
+
+def _trial(job_dir: Path, name: str, reward: float) -> None:
+    trial_dir = job_dir / name
+    trial_dir.mkdir(parents=True)
+    result = {"verifier_result": {"rewards": {"reward": reward}}}
+    (trial_dir / "result.json").write_text(json.dumps(result))
+
+
+def test_trial_index_is_reused_until_a_directory_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / "123"
+    job_dir = run_dir / "terminal-bench-results-opus" / "jobs" / "2026-01-16__00-15-05"
+    _trial(job_dir, "fix-git__abc", 1.0)
+    _trial(job_dir, "chess-best-move__def", 0.0)
+    (job_dir / "result.json").write_text("{}")
+
+    scanned = find_trial_results(run_dir)
+    assert (run_dir / INDEX_FILE).exists()
+    assert [(r["task_name"], r["artifact"], r["passed"]) for r in scanned] == [
+        ("chess-best-move", "terminal-bench-results-opus", False),
+        ("fix-git", "terminal-bench-results-opus", True),
+    ]
+
+    def no_scan(run_dir: Path) -> list[dict]:
+        raise AssertionError("index should have been used")
+
+    with monkeypatch.context() as m:
+        m.setattr(download_run_logs, "_scan_trial_results", no_scan)
+        assert find_trial_results(run_dir) == scanned
+
+    # A new trial bumps the job directory's mtime and forces a rescan
+    _trial(job_dir, "fix-git__ghi", 0.0)
+    stat = job_dir.stat()
+    os.utime(job_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert len(find_trial_results(run_dir)) == 3
+
+
+def test_streaming_summary_prints_a_cold_run_without_indexing_it(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run_dir = tmp_path / "123"
+    for model, rewards in (("opus", [1.0, 0.0]), ("sonnet", [1.0])):
+        job_dir = run_dir / f"terminal-bench-results-{model}" / "jobs" / "j"
+        for i, reward in enumerate(rewards):
+            _trial(job_dir, f"task-{i}__abc", reward)
+    # Trial directories are not descended into
+    nested = job_dir / "task-0__abc" / "agent" / "sub"
+    nested.mkdir(parents=True)
+    (nested / "result.json").write_text('{"passed": false}')
+
+    args = download_run_logs.argparse.Namespace(
+        task=None, model=None, failures_only=False
+    )
+    trials = download_run_logs.filter_trials(
+        download_run_logs.iter_trial_results(run_dir), args
+    )
+    counts = download_run_logs.print_streaming_summary(trials)
+    assert counts == {"opus": (1, 2), "sonnet": (1, 1)}
+    assert not (run_dir / INDEX_FILE).exists()
+    out = capsys.readouterr().out
+    assert out.index("opus: 1/2 passed") < out.index("\nsonnet:")
+
+    # Once indexed, the same order is replayed from the index
+    streamed = list(download_run_logs.iter_trial_results(run_dir))
+    assert find_trial_results(run_dir) == streamed
+    assert list(download_run_logs.iter_trial_results(run_dir)) == streamed
+
+
+def test_subcommands_keep_top_level_run_id_and_validate_diff_ids(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    seen = {}
+    monkeypatch.setattr(
+        download_run_logs, "search_logs", lambda args: seen.setdefault("args", args)
+    )
+    monkeypatch.setattr(
+        "sys.argv", ["download_run_logs.py", "--run-id", "5", "search", "boom"]
+    )
+    download_run_logs.main()
+    assert (seen["args"].run_id, seen["args"].search_run_id) == (5, None)
+
+    # Filters given before or after the subcommand both apply
+    monkeypatch.setattr(
+        download_run_logs, "cluster_logs", lambda args: seen.update(args=args)
+    )
+    for argv in (["--task", "fix-git", "cluster"], ["cluster", "--task", "fix-git"]):
+        monkeypatch.setattr("sys.argv", ["download_run_logs.py", *argv, "--model", "o"])
+        download_run_logs.main()
+        assert (seen["args"].task, seen["args"].model) == ("fix-git", "o")
+
+    monkeypatch.setattr(
+        "sys.argv", ["download_run_logs.py", "diff", "21230456195", "latest"]
+    )
+    with pytest.raises(SystemExit) as exc:
+        download_run_logs.main()
+    assert exc.value.code == 2
+
+
+def test_trial_summary_skips_a_result_that_vanished(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    _trial(tmp_path, "fix-git__abc", 0.0)
+    (trial,) = find_trial_results(tmp_path)
+    (tmp_path / "fix-git__abc" / "result.json").write_text('{"verifier_')
+    download_run_logs.print_trial_summary(trial)
+    (tmp_path / "fix-git__abc" / "result.json").unlink()
+    download_run_logs.print_trial_summary(trial)
+    assert capsys.readouterr().out.count("FAIL  fix-git") == 2
+
+
+def test_cached_runs_are_used_without_or_despite_a_download(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    # Downloaded before the manifest existed
+    job_dir = tmp_path / "123" / "terminal-bench-results-opus" / "jobs" / "j"
+    _trial(job_dir, "fix-git__abc", 1.0)
+    downloads = []
+
+    def offline(run_id: int, run_dir: Path, **kwargs: object) -> bool:
+        downloads.append(run_id)
+        return False
+
+    monkeypatch.setattr(download_run_logs, "download_run_artifacts", offline)
+    argv = ["download_run_logs.py", "--output-dir", str(tmp_path), "--run-id"]
+    monkeypatch.setattr("sys.argv", [*argv, "123"])
+    assert download_run_logs.main() == 0
+    assert downloads == []
+    assert "opus: 1/1 passed" in capsys.readouterr().out
+
+    # A partial download is reused when the rest cannot be fetched
+    (tmp_path / "123" / ".download_manifest.json").write_text(
+        json.dumps({"artifacts": {"terminal-bench-results-opus": {}}})
+    )
+    assert download_run_logs.main() == 0
+    assert downloads == [123]
+    assert "using the cached data" in capsys.readouterr().err
+
+    monkeypatch.setattr("sys.argv", [*argv, "456"])
+    assert download_run_logs.main() == 1
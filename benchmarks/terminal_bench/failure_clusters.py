@@ -0,0 +1,232 @@
+"""
+Group failed trials by near-duplicate error signatures (MinHash + LSH).
+
+Each failure is reduced to a normalized error tail: the last lines of the
+agent's stderr plus the trial's exception info, with paths, hashes, UUIDs and
+numbers replaced by placeholders so that "the same error" on different tasks,
+runs and containers reads the same. Tails are shingled into word 3-grams and
+summarized by a MinHash signature; signatures are split into LSH bands, and
+trials that share a band bucket with a similar-enough representative are
+merged (union-find).
+
+Every trial is hashed once and compared only against the first and the most
+recent member of each bucket it lands in, so the pass is linear in the number
+of failures.
+Identical normalized tails are collapsed before hashing.
+
+Used by ``download_run_logs.py cluster``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .tbench_utils import tail_lines
+except ImportError:
+    from tbench_utils import tail_lines  # type: ignore[import-not-found,no-redef]
+
+# Lines of stderr that make up a failure's error tail
+TAIL_LINES = 20
+# MinHash permutations, split into BANDS bands of NUM_PERM // BANDS rows;
+# 16 x 8 puts the LSH threshold at ~0.7 Jaccard similarity
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.7
+
+_NORMALIZERS = [
+    (
+        re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"),
+        "<uuid>",
+    ),
+    (re.compile(r"(?:[A-Za-z]:)?(?:[\w.~-]*/)+[\w.@-]*"), "<path>"),
+    (re.compile(r"\b(?=[0-9a-f]*[0-9])(?=[0-9a-f]*[a-f])[0-9a-f]{7,}\b"), "<hex>"),
+    (re.compile(r"0x[0-9a-f]+"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"[ \t]+"), " "),
+]
+
+
+def normalize_error(text: str) -> str:
+    """Lower-case text and replace volatile tokens with placeholders."""
+    text = text.lower()
+    for pattern, replacement in _NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def error_tail(trial: dict, n_lines: int = TAIL_LINES) -> str:
+    """Raw error tail of a trial record from download_run_logs.find_trial_results."""
+    trial_dir = trial["path"].parent
+    parts = []
+    for stderr_file in sorted((trial_dir / "agent").glob("command-*/stderr.txt")):
+        parts.extend(tail_lines(stderr_file, n_lines))
+    if trial.get("has_exception"):
+        data = json.loads(trial["path"].read_text())
+        exception = data.get("exception_info")
+        parts.append(
+            json.dumps(exception) if isinstance(exception, dict) else str(exception)
+        )
+    return "\n".join(parts)
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set[str]:
+    """Word k-grams of text (the whole text for tails shorter than k words)."""
+    words = text.split()
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHasher:
+    """MinHash over CRC32 shingle hashes with multiply-shift permutations."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        # Odd 64-bit multipliers; uint64 arithmetic wraps mod 2**64
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, items: set[str]) -> np.ndarray:
+        if not items:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for s in items), dtype=np.uint64, count=len(items)
+        )
+        # Multiply-shift: the high 32 bits of a*h + b (mod 2**64)
+        permuted = self._a[:, None] * hashes[None, :] + self._b[:, None]
+        return (permuted >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+@dataclass(slots=True)
+class FailureCluster:
+    """Failed trials sharing a near-identical normalized error tail."""
+
+    signature: str
+    trials: list[dict] = field(default_factory=list)
+
+    @property
+    def tasks(self) -> Counter[str]:
+        return Counter(t["task_name"] for t in self.trials)
+
+    @property
+    def models(self) -> Counter[str]:
+        return Counter(
+            (t.get("artifact") or "unknown").replace("terminal-bench-results-", "")
+            for t in self.trials
+        )
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_failures(
+    failures: list[tuple[dict, str]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+    seed: int = 0,
+) -> list[FailureCluster]:
+    """
+    Cluster (trial, raw error tail) pairs; largest clusters first.
+
+    Two tails end up together when they share an LSH bucket and the
+    estimated Jaccard similarity (fraction of equal MinHash values) between
+    one of them and the bucket's first or latest member is at least
+    ``threshold``.
+    """
+    rows = num_perm // bands
+    min_equal = threshold * num_perm
+    hasher = MinHasher(num_perm, seed)
+
+    # Collapse identical normalized tails; only distinct ones are hashed
+    distinct: dict[str, list[dict]] = {}
+    for trial, tail in failures:
+        distinct.setdefault(normalize_error(tail), []).append(trial)
+    texts = list(distinct)
+    signatures = [hasher.signature(shingles(text)) for text in texts]
+
+    parent = list(range(len(texts)))
+    # Per bucket: its first member and the most recently added one
+    buckets: dict[tuple[int, bytes], list[int]] = {}
+    for i, sig in enumerate(signatures):
+        for band in range(bands):
+            key = (band, sig[band * rows : (band + 1) * rows].tobytes())
+            members = buckets.get(key)
+            if members is None:
+                buckets[key] = [i, i]
+                continue
+            for other in members:
+                if np.count_nonzero(signatures[other] == sig) >= min_equal:
+                    root_i, root_other = _find(parent, i), _find(parent, other)
+                    if root_i != root_other:
+                        parent[root_i] = root_other
+            members[1] = i
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(texts)):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    clusters = []
+    for members in groups.values():
+        # Label the cluster with its most frequent normalized tail
+        label = max(members, key=lambda i: len(distinct[texts[i]]))
+        cluster = FailureCluster(texts[label])
+        for i in members:
+            cluster.trials.extend(distinct[texts[i]])
+        clusters.append(cluster)
+    clusters.sort(key=lambda c: (-len(c.trials), c.signature))
+    return clusters
+
+
+def collect_failures(trials: list[dict]) -> list[tuple[dict, str]]:
+    """Failed trials with their raw error tails (unreadable logs are skipped)."""
+    failures = []
+    for trial in trials:
+        if trial["passed"] is not False:
+            continue
+        try:
+            failures.append((trial, error_tail(trial)))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return failures
+
+
+def print_clusters(
+    clusters: list[FailureCluster], top: int, tail_lines: int = 6
+) -> None:
+    total = sum(len(c.trials) for c in clusters)
+    print(f"{total} failure(s) in {len(clusters)} cluster(s)\n")
+    for rank, cluster in enumerate(clusters[:top], 1):
+        tasks = cluster.tasks
+        models = ", ".join(f"{m} ({n})" for m, n in cluster.models.most_common())
+        task_list = ", ".join(t for t, _ in tasks.most_common(8))
+        if len(tasks) > 8:
+            task_list += f", ... (+{len(tasks) - 8})"
+        print(
+            f"#{rank}  {len(cluster.trials)} failure(s), {len(tasks)} task(s)  [{models}]"
+        )
+        print(f"    tasks: {task_list}")
+        lines = (
+            cluster.signature.split("\n")[-tail_lines:]
+            if cluster.signature
+            else ["(no error output)"]
+        )
+        for line in lines:
+            print(f"    | {line[:120]}")
+        example: Path = cluster.trials[0]["path"].parent
+        print(f"    e.g. {example}\n")
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from .failure_clusters import cluster_failures, normalize_error
+
+
+def _trial(task: str, artifact: str = "terminal-bench-results-opus") -> dict:
+    path = Path("/runs/1") / artifact / "jobs" / "j" / f"{task}__abc" / "result.json"
+    return {"task_name": task, "artifact": artifact, "passed": False, "path": path}
+
+
+def test_normalization_hides_paths_hashes_and_numbers() -> None:
+    assert normalize_error(
+        "Error at /tmp/build-7f3a/app.ts:42:7 (commit 9f8e7d6c5b4a)\n\n  took 3.5s"
+    ) == normalize_error(
+        "Error at /home/u/x/app.ts:17:1 (commit 0a1b2c3d4e5f)\n  took 12s"
+    )
+
+
+def test_near_duplicate_failures_share_a_cluster() -> None:
+    bun = (
+        "running install step\nsh: 1: bun: command not found\n"
+        "error: script 'build' exited with code {n} in /work/{task}"
+    )
+    pytest_failure = (
+        "FAILED tests/test_outputs.py::test_{task} - AssertionError: "
+        "expected 3 lines of output but found {n}\n= 1 failed, 2 passed in 0.4s ="
+    )
+    failures = [
+        (_trial(f"task-{i}", artifact), bun.format(n=i, task=f"task-{i}"))
+        for i, artifact in enumerate(
+            ["terminal-bench-results-opus", "terminal-bench-results-gpt"] * 3
+        )
+    ]
+    failures += [
+        (_trial(f"other-{i}"), pytest_failure.format(n=i, task=f"t{i}"))
+        for i in range(2)
+    ]
+    failures.append((_trial("silent"), ""))
+
+    clusters = cluster_failures(failures)
+    assert [len(c.trials) for c in clusters] == [6, 2, 1]
+    assert clusters[0].models == {"opus": 3, "gpt": 3}
+    assert "bun: command not found" in clusters[0].signature
+    assert len(clusters[1].tasks) == 2
@@ -0,0 +1,413 @@
+"""
+Columnar task x agent pass/fail matrix for failure-rate analysis.
+
+Results are stored as interned integer codes in NumPy arrays:
+
+    task_codes[i], agent_codes[i]   -> which (task, agent) cell row i belongs to
+    n_passed[i], n_total[i]         -> trial counts contributed by row i
+
+A single ``np.bincount`` pass folds any number of rows into dense
+``passes``/``totals`` matrices of shape (n_tasks, n_agents), from which failure
+rates and M/O ratios for every Unix config are computed with array operations.
+
+Codes are assigned in order of first appearance, so iterating tasks/agents by
+code reproduces the insertion order of the dict-based implementation this
+replaced (which keeps ``--json`` output byte-for-byte identical).
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+# Added to the denominator of the M/O ratio to avoid division by zero
+RATIO_EPSILON = 0.01
+
+
+class Interner:
+    """Maps strings to dense integer codes in first-seen order."""
+
+    __slots__ = ("index", "values")
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class AgentInterner:
+    """Interns (agent, model) pairs, building each "<agent>__<model>" key once."""
+
+    __slots__ = ("index", "keys", "agent_names", "model_names")
+
+    def __init__(self) -> None:
+        self.index: dict[str, dict[str, int]] = {}
+        self.keys: list[str] = []
+        self.agent_names: list[str] = []
+        self.model_names: list[str] = []
+
+    def code(self, agent_name: str, model_name: str) -> int:
+        models = self.index.get(agent_name)
+        if models is None:
+            models = self.index[agent_name] = {}
+        code = models.get(model_name)
+        if code is None:
+            code = models[model_name] = len(self.keys)
+            self.keys.append(f"{agent_name}__{model_name}")
+            self.agent_names.append(agent_name)
+            self.model_names.append(model_name)
+        return code
+
+
+@dataclass
+class ResultColumns:
+    """Pass/total counts per observation, keyed by interned task and agent codes.
+
+    ``agents[i]`` is the "<agent>__<model>" key for agent code ``i``;
+    ``agent_names``/``model_names`` hold its parts so nothing downstream has to
+    split keys back apart.
+    """
+
+    tasks: list[str]
+    agents: list[str]
+    agent_names: list[str]
+    model_names: list[str]
+    task_codes: np.ndarray
+    agent_codes: np.ndarray
+    n_passed: np.ndarray
+    n_total: np.ndarray
+
+    @classmethod
+    def _build(
+        cls,
+        tasks: Interner,
+        agents: AgentInterner,
+        task_codes: np.ndarray,
+        agent_codes: np.ndarray,
+        n_passed: np.ndarray,
+        n_total: np.ndarray,
+    ) -> ResultColumns:
+        return cls(
+            tasks=tasks.values,
+            agents=agents.keys,
+            agent_names=agents.agent_names,
+            model_names=agents.model_names,
+            task_codes=np.asarray(task_codes, dtype=np.int32),
+            agent_codes=np.asarray(agent_codes, dtype=np.int32),
+            n_passed=np.asarray(n_passed, dtype=np.int32),
+            n_total=np.asarray(n_total, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_results(cls, results: Iterable) -> ResultColumns:
+        """Build columns from TaskResult-like objects (one trial per row)."""
+        tasks = Interner()
+        agents = AgentInterner()
+        task_codes = array("i")
+        agent_codes = array("i")
+        passed = array("b")
+        for r in results:
+            task_codes.append(tasks.code(r.task_id))
+            agent_codes.append(agents.code(r.agent_name, r.model_name))
+            passed.append(r.passed)
+
+        n_passed = np.frombuffer(passed, dtype=np.int8)
+        return cls._build(
+            tasks,
+            agents,
+            np.frombuffer(task_codes, dtype=np.int32),
+            np.frombuffer(agent_codes, dtype=np.int32),
+            n_passed,
+            np.ones(len(n_passed), dtype=np.int32),
+        )
+
+    @classmethod
+    def from_counts(
+        cls, rows: Iterable[tuple[str, str, str, int, int]]
+    ) -> ResultColumns:
+        """Build columns from (task, agent, model, n_passed, n_total) rows."""
+        tasks = Interner()
+        agents = AgentInterner()
+        task_codes = array("i")
+        agent_codes = array("i")
+        n_passed = array("i")
+        n_total = array("i")
+        for task, agent_name, model_name, passed, total in rows:
+            task_codes.append(tasks.code(task))
+            agent_codes.append(agents.code(agent_name, model_name))
+            n_passed.append(passed)
+            n_total.append(total)
+
+        return cls._build(
+            tasks,
+            agents,
+            np.frombuffer(task_codes, dtype=np.int32),
+            np.frombuffer(agent_codes, dtype=np.int32),
+            np.frombuffer(n_passed, dtype=np.int32),
+            np.frombuffer(n_total, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable) -> ResultColumns:
+        """Build columns from per-job scan chunks without per-trial objects.
+
+        Each chunk carries one agent/model and its own task vocabulary, so the
+        only Python-level work is re-coding that (small) vocabulary; the trial
+        arrays are mapped with NumPy fancy indexing.
+        """
+        tasks = Interner()
+        agents = AgentInterner()
+        task_parts: list[np.ndarray] = []
+        agent_parts: list[np.ndarray] = []
+        passed_parts: list[np.ndarray] = []
+        for chunk in chunks:
+            n = len(chunk.passed)
+            if not n:
+                continue
+            task_map = np.array([tasks.code(t) for t in chunk.task_ids], dtype=np.int32)
+            codes = np.frombuffer(chunk.task_codes, dtype=np.uint32)
+            task_parts.append(task_map[codes])
+            agent_code = agents.code(chunk.agent_name, chunk.model_name)
+            agent_parts.append(np.full(n, agent_code, dtype=np.int32))
+            passed_parts.append(np.frombuffer(chunk.passed, dtype=np.int8))
+
+        n_passed = _concat(passed_parts)
+        return cls._build(
+            tasks,
+            agents,
+            _concat(task_parts),
+            _concat(agent_parts),
+            n_passed,
+            np.ones(len(n_passed), dtype=np.int32),
+        )
+
+    @classmethod
+    def concat(cls, parts: list[ResultColumns]) -> ResultColumns:
+        """Concatenate columns, re-coding each part into shared vocabularies."""
+        tasks = Interner()
+        agents = AgentInterner()
+        task_codes = []
+        agent_codes = []
+        for part in parts:
+            task_map = np.array([tasks.code(t) for t in part.tasks], dtype=np.int32)
+            agent_map = np.array(
+                [agents.code(a, m) for a, m in zip(part.agent_names, part.model_names)],
+                dtype=np.int32,
+            )
+            task_codes.append(task_map[part.task_codes])
+            agent_codes.append(agent_map[part.agent_codes])
+
+        return cls._build(
+            tasks,
+            agents,
+            _concat(task_codes),
+            _concat(agent_codes),
+            _concat([p.n_passed for p in parts]),
+            _concat([p.n_total for p in parts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.task_codes)
+
+    def nbytes(self) -> int:
+        """Bytes held by the code/count arrays (excluding the vocabularies)."""
+        return sum(
+            a.nbytes
+            for a in (self.task_codes, self.agent_codes, self.n_passed, self.n_total)
+        )
+
+
+def _concat(arrays: list[np.ndarray]) -> np.ndarray:
+    return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int32)
+
+
+@dataclass
+class TaskAgentMatrix:
+    """Dense (n_tasks, n_agents) pass and attempt counts."""
+
+    tasks: list[str]
+    agents: list[str]
+    passes: np.ndarray
+    totals: np.ndarray
+    # Rank of each task by first appearance among the rows used to build the
+    # matrix (-1 for tasks with no such rows)
+    task_order: np.ndarray
+
+    @classmethod
+    def from_columns(
+        cls, columns: ResultColumns, agent_mask: np.ndarray | None = None
+    ) -> TaskAgentMatrix:
+        """Fold columns into a dense matrix, optionally keeping only some agents."""
+        n_tasks, n_agents = len(columns.tasks), len(columns.agents)
+        task_codes = columns.task_codes
+        agent_codes = columns.agent_codes
+        n_passed = columns.n_passed
+        n_total = columns.n_total
+        if agent_mask is not None:
+            rows = agent_mask[agent_codes]
+            task_codes = task_codes[rows]
+            agent_codes = agent_codes[rows]
+            n_passed = n_passed[rows]
+            n_total = n_total[rows]
+
+        cell = task_codes.astype(np.int64) * n_agents + agent_codes
+        size = n_tasks * n_agents
+        passes = np.bincount(cell, weights=n_passed, minlength=size)
+        totals = np.bincount(cell, weights=n_total, minlength=size)
+
+        # np.unique returns the first row index of each task; ranking those
+        # indices recovers first-appearance order.
+        seen, first_row = np.unique(task_codes, return_index=True)
+        task_order = np.full(n_tasks, -1, dtype=np.int64)
+        task_order[seen[np.argsort(first_row, kind="stable")]] = np.arange(len(seen))
+
+        return cls(
+            tasks=columns.tasks,
+            agents=columns.agents,
+            passes=passes.astype(np.int64).reshape(n_tasks, n_agents),
+            totals=totals.astype(np.int64).reshape(n_tasks, n_agents),
+            task_order=task_order,
+        )
+
+    def fail_rates(self) -> np.ndarray:
+        """Failure rate per cell; 0.0 where an agent has no trials for a task."""
+        fails = (self.totals - self.passes).astype(np.float64)
+        totals = self.totals.astype(np.float64)
+        return np.divide(fails, totals, out=np.zeros_like(fails), where=totals > 0)
+
+    def ordered_tasks(self) -> np.ndarray:
+        """Task codes present in the matrix, in first-appearance order."""
+        present = np.flatnonzero(self.task_order >= 0)
+        return present[np.argsort(self.task_order[present], kind="stable")]
+
+
+def average_fail_rate(
+    fail_rates: np.ndarray, present: np.ndarray, agent_codes: list[int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mean failure rate per task over the given agents that attempted it.
+
+    The sum is accumulated agent by agent (vectorized over tasks) rather than
+    with ``ndarray.sum``, whose pairwise summation would round differently from
+    summing the same rates in Python.
+
+    Returns (avg_fail_rate, n_agents) arrays over the leading axes.
+    """
+    total = np.zeros(fail_rates.shape[:-1], dtype=np.float64)
+    count = np.zeros(fail_rates.shape[:-1], dtype=np.int64)
+    for code in agent_codes:
+        has = present[..., code]
+        total = total + np.where(has, fail_rates[..., code], 0.0)
+        count += has
+    avg = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+    return avg, count
+
+
+def mo_ratios(
+    matrix: TaskAgentMatrix, unix_codes: list[int], top_codes: list[int]
+) -> dict[str, np.ndarray]:
+    """
+    Compute M/O ratios for every (Unix agent, task) pair in one pass.
+
+    Rows are ordered Unix agent by Unix agent, tasks in first-appearance order,
+    and filtered to pairs where the Unix agent attempted the task, at least one
+    top agent did, and the Unix failure rate is non-zero.
+    """
+    tasks = matrix.ordered_tasks()
+    present = matrix.totals[tasks] > 0
+    rates = matrix.fail_rates()[tasks]
+    avg_other, n_other = average_fail_rate(rates, present, top_codes)
+
+    unix = np.asarray(unix_codes, dtype=np.int64)
+    mux_rate = rates[:, unix].T  # (n_unix, n_tasks)
+    keep = present[:, unix].T & (n_other > 0) & (mux_rate > 0)
+    ratio = mux_rate / (avg_other + RATIO_EPSILON)
+
+    unix_idx, task_idx = np.nonzero(keep)
+    return {
+        "task": tasks[task_idx],
+        "agent": unix[unix_idx],
+        "mux_fail_rate": mux_rate[unix_idx, task_idx],
+        "avg_other_fail_rate": avg_other[task_idx],
+        "ratio": ratio[unix_idx, task_idx],
+        "n_other_agents": n_other[task_idx],
+    }
+
+
+def rank_by_ratio(ratio: np.ndarray) -> np.ndarray:
+    """Indices sorting ratios descending; ties keep their original order."""
+    return np.argsort(-ratio, kind="stable")
+
+
+@dataclass
+class BootstrapSummary:
+    """Per-opportunity bootstrap statistics, aligned with the input pairs."""
+
+    ratio_low: np.ndarray
+    ratio_high: np.ndarray
+    rank_stability: np.ndarray  # Fraction of resamples ranking the pair in the top N
+
+
+def bootstrap_mo_ratios(
+    matrix: TaskAgentMatrix,
+    top_codes: list[int],
+    pair_tasks: np.ndarray,
+    pair_agents: np.ndarray,
+    n_resamples: int = 1000,
+    top_n: int = 20,
+    confidence: float = 0.95,
+    seed: int | None = None,
+    batch_size: int = 256,
+) -> BootstrapSummary:
+    """
+    Bootstrap M/O ratios for the given (task, Unix agent) pairs.
+
+    Resampling the n trials of a cell with replacement makes its failure count
+    Binomial(n, observed fail rate), so each resample is a single batched
+    ``rng.binomial`` draw over every cell of the matrix rather than a loop over
+    trials. Pairs are re-ranked in every resample; ``rank_stability`` is how
+    often a pair lands in the top ``top_n``.
+    """
+    rng = np.random.default_rng(seed)
+    tasks = matrix.ordered_tasks()
+    # Map task codes to rows of the reduced matrix
+    row_of = np.empty(len(matrix.tasks), dtype=np.int64)
+    row_of[tasks] = np.arange(len(tasks))
+    rows = row_of[pair_tasks]
+
+    totals = matrix.totals[tasks]
+    present = totals > 0
+    p_fail = matrix.fail_rates()[tasks]
+    safe_totals = np.maximum(totals, 1)
+
+    n_pairs = len(rows)
+    ratios = np.empty((n_resamples, n_pairs), dtype=np.float64)
+    for start in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - start)
+        fails = rng.binomial(totals, p_fail, size=(size, *totals.shape))
+        rates = np.where(present, fails / safe_totals, 0.0)
+        avg_other, _ = average_fail_rate(rates, present, top_codes)
+        mux_rate = rates[:, rows, pair_agents]
+        ratios[start : start + size] = mux_rate / (avg_other[:, rows] + RATIO_EPSILON)
+
+    tail = (1.0 - confidence) / 2 * 100
+    low, high = np.percentile(ratios, [tail, 100 - tail], axis=0)
+
+    # Rank of each pair within each resample (0 = highest ratio)
+    order = np.argsort(-ratios, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(n_pairs)[None, :], axis=1)
+    stability = (ranks < top_n).mean(axis=0)
+
+    return BootstrapSummary(ratio_low=low, ratio_high=high, rank_stability=stability)
@@ -0,0 +1,246 @@
+"""
+Full-text index over cached Terminal-Bench trial logs.
+
+Agent stdout/stderr and verifier output of every trial under ``.run_logs`` are
+loaded into a SQLite FTS5 table with the trigram tokenizer, so arbitrary
+substrings ("bun: command not found", a pytest assertion) are matched through
+trigram postings (``LIKE '%text%'``) instead of grepping every file. Postings
+are stored without positions (detail=none), which keeps the index at about a
+third of the size of a full-detail one; FTS5 re-checks candidates against the
+stored text. The index is updated incrementally: runs whose download manifest
+(or trial index) is unchanged are skipped, and within a run only new or
+modified files are (re)indexed.
+
+Used by ``download_run_logs.py search``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+try:
+    from .tbench_utils import DOWNLOAD_MANIFEST
+except ImportError:
+    from tbench_utils import DOWNLOAD_MANIFEST  # type: ignore[import-not-found,no-redef]
+
+INDEX_NAME = ".log_index.sqlite"
+# Written by download_run_logs.find_trial_results
+TRIAL_INDEX = ".trial_index.json"
+# Very large logs are indexed by their head and tail only
+MAX_INDEXED_BYTES = 4 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    run_id TEXT NOT NULL,
+    artifact TEXT,
+    task_name TEXT,
+    trial_name TEXT,
+    passed INTEGER,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_log_files_run ON log_files (run_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS log_text USING fts5(
+    content, tokenize='trigram', detail=none
+);
+CREATE TABLE IF NOT EXISTS indexed_runs (
+    run_id TEXT PRIMARY KEY,
+    signature TEXT
+);
+"""
+
+
+def connect(cache_dir: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the log index of a .run_logs cache."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_dir / INDEX_NAME)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def trial_log_files(trial_dir: Path) -> Iterator[tuple[str, Path]]:
+    """(kind, path) of the logs of one trial: agent stdout/stderr and verifier files."""
+    agent_dir = trial_dir / "agent"
+    if agent_dir.is_dir():
+        for cmd_dir in sorted(agent_dir.glob("command-*")):
+            for name in ("stdout", "stderr"):
+                path = cmd_dir / f"{name}.txt"
+                if path.is_file():
+                    yield name, path
+    verifier_dir = trial_dir / "verifier"
+    if verifier_dir.is_dir():
+        for path in sorted(verifier_dir.rglob("*")):
+            if path.is_file():
+                yield "verifier", path
+
+
+def _read_log(path: Path, size: int) -> str:
+    with path.open("rb") as f:
+        if size <= MAX_INDEXED_BYTES:
+            data = f.read()
+        else:
+            half = MAX_INDEXED_BYTES // 2
+            head = f.read(half)
+            f.seek(size - half)
+            data = head + b"\n" + f.read()
+    return data.decode("utf-8", errors="replace")
+
+
+def _run_signature(run_dir: Path) -> str | None:
+    """Changes whenever download_run_artifacts or a lazy fetch adds files.
+
+    Runs downloaded before the manifest existed fall back to the trial index,
+    which is rewritten when trial directories change.
+    """
+    for name in (DOWNLOAD_MANIFEST, TRIAL_INDEX):
+        try:
+            stat = (run_dir / name).stat()
+        except OSError:
+            continue
+        return f"{name}:{stat.st_mtime_ns}:{stat.st_size}"
+    return None
+
+
+def index_run(conn: sqlite3.Connection, run_dir: Path, trials: list[dict]) -> int:
+    """
+    Bring the index up to date for one run.
+
+    ``trials`` are the records from download_run_logs.find_trial_results().
+    Returns the number of files (re)indexed; files that vanished are dropped.
+    """
+    run_id = run_dir.name
+    signature = _run_signature(run_dir)
+    if signature is not None:
+        row = conn.execute(
+            "SELECT signature FROM indexed_runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row and row["signature"] == signature:
+            return 0
+
+    known = {
+        r["path"]: (r["id"], r["size"], r["mtime_ns"])
+        for r in conn.execute(
+            "SELECT id, path, size, mtime_ns FROM log_files WHERE run_id = ?", (run_id,)
+        )
+    }
+    seen = set()
+    indexed = 0
+    for trial in trials:
+        for kind, path in trial_log_files(trial["path"].parent):
+            key = str(path)
+            seen.add(key)
+            stat = path.stat()
+            previous = known.get(key)
+            if previous and previous[1:] == (stat.st_size, stat.st_mtime_ns):
+                continue
+            if previous:
+                conn.execute("DELETE FROM log_text WHERE rowid = ?", (previous[0],))
+                conn.execute("DELETE FROM log_files WHERE id = ?", (previous[0],))
+            cursor = conn.execute(
+                """
+                INSERT INTO log_files (
+                    path, run_id, artifact, task_name, trial_name, passed, kind,
+                    size, mtime_ns
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    run_id,
+                    trial.get("artifact"),
+                    trial["task_name"],
+                    trial["trial_name"],
+                    trial["passed"],
+                    kind,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ),
+            )
+            conn.execute(
+                "INSERT INTO log_text (rowid, content) VALUES (?, ?)",
+                (cursor.lastrowid, _read_log(path, stat.st_size)),
+            )
+            indexed += 1
+
+    for key, (file_id, _, _) in known.items():
+        if key not in seen:
+            conn.execute("DELETE FROM log_text WHERE rowid = ?", (file_id,))
+            conn.execute("DELETE FROM log_files WHERE id = ?", (file_id,))
+    conn.execute(
+        "INSERT OR REPLACE INTO indexed_runs (run_id, signature) VALUES (?, ?)",
+        (run_id, signature),
+    )
+    conn.commit()
+    return indexed
+
+
+def drop_run(conn: sqlite3.Connection, run_id: str) -> None:
+    """Remove every indexed file of a run (e.g. after it was evicted)."""
+    conn.execute(
+        "DELETE FROM log_text WHERE rowid IN (SELECT id FROM log_files WHERE run_id = ?)",
+        (run_id,),
+    )
+    conn.execute("DELETE FROM log_files WHERE run_id = ?", (run_id,))
+    conn.execute("DELETE FROM indexed_runs WHERE run_id = ?", (run_id,))
+    conn.commit()
+
+
+def search(
+    conn: sqlite3.Connection,
+    text: str,
+    run_id: str | None = None,
+    task: str | None = None,
+    kind: str | None = None,
+    failures_only: bool = False,
+    limit: int = 50,
+) -> list[sqlite3.Row]:
+    """
+    Log files containing ``text`` (case-insensitive), newest run first.
+
+    Trigram matching needs at least three characters. Each row carries a
+    ``snippet`` of the text around the first match.
+    """
+    if len(text) < 3:
+        raise ValueError("search text must be at least 3 characters")
+    # ESCAPE would stop FTS5 from using the trigram index, so % and _ in the
+    # text stay wildcards and the literal text is re-checked with instr()
+    clauses = ["t.content LIKE :pattern"]
+    if "%" in text or "_" in text:
+        clauses.append("instr(lower(t.content), lower(:text)) > 0")
+    if run_id:
+        clauses.append("f.run_id = :run_id")
+    if task:
+        clauses.append("instr(lower(f.task_name), lower(:task)) > 0")
+    if kind:
+        clauses.append("f.kind = :kind")
+    if failures_only:
+        clauses.append("f.passed = 0")
+    return conn.execute(
+        f"""
+        SELECT f.run_id, f.artifact, f.task_name, f.trial_name, f.passed, f.kind,
+               f.path,
+               substr(
+                   t.content,
+                   max(instr(lower(t.content), lower(:text)) - 80, 1),
+                   length(:text) + 160
+               ) AS snippet
+        FROM log_text t
+        JOIN log_files f ON f.id = t.rowid
+        WHERE {" AND ".join(clauses)}
+        ORDER BY f.run_id DESC, f.task_name, f.path
+        LIMIT :limit
+        """,
+        {
+            "pattern": f"%{text}%",
+            "text": text,
+            "run_id": run_id,
+            "task": task,
+            "kind": kind,
+            "limit": limit,
+        },
+    ).fetchall()
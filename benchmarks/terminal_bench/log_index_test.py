@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from . import log_index
+from .download_run_logs import find_trial_results
+from .tbench_utils import DOWNLOAD_MANIFEST
+
+
+def _trial(run_dir: Path, name: str, passed: bool, stderr: str) -> Path:
+    trial_dir = (
+        run_dir / "terminal-bench-results-opus" / "jobs" / "2026-01-16__00-15-05" / name
+    )
+    (trial_dir / "agent" / "command-0").mkdir(parents=True)
+    (trial_dir / "verifier").mkdir()
+    result = {"verifier_result": {"rewards": {"reward": 1.0 if passed else 0.0}}}
+    (trial_dir / "result.json").write_text(json.dumps(result))
+    (trial_dir / "agent" / "command-0" / "stderr.txt").write_text(stderr)
+    (trial_dir / "verifier" / "test-stdout.txt").write_text(
+        "1 passed" if passed else "E   AssertionError: boom"
+    )
+    return trial_dir
+
+
+def test_search_finds_substrings_and_reindexes_changed_files(tmp_path: Path) -> None:
+    run_dir = tmp_path / "21230456195"
+    _trial(run_dir, "fix-git__abc", True, "ok")
+    broken = _trial(run_dir, "build-app__def", False, "sh: 1: bun: command not found\n")
+
+    conn = log_index.connect(tmp_path)
+    assert log_index.index_run(conn, run_dir, find_trial_results(run_dir)) == 4
+
+    matches = log_index.search(conn, "BUN: COMMAND not")
+    assert [(m["run_id"], m["task_name"], m["kind"], m["passed"]) for m in matches] == [
+        ("21230456195", "build-app", "stderr", 0)
+    ]
+    assert "sh: 1: bun: command not found" in matches[0]["snippet"]
+    assert [
+        m["task_name"]
+        for m in log_index.search(conn, "AssertionError", kind="verifier")
+    ] == ["build-app"]
+
+    # Unchanged run (same trial index, no manifest): skipped without a walk
+    (broken / "agent" / "command-0" / "stderr.txt").write_text(
+        "npm ERR! missing script\n"
+    )
+    assert log_index.index_run(conn, run_dir, find_trial_results(run_dir)) == 0
+
+    # A download rewrites the manifest; only the changed file is re-read
+    (run_dir / DOWNLOAD_MANIFEST).write_text('{"artifacts": {}}')
+    assert log_index.index_run(conn, run_dir, find_trial_results(run_dir)) == 1
+    assert log_index.search(conn, "command not found") == []
+    assert len(log_index.search(conn, "missing script", failures_only=True)) == 1
@@ -4,7 +4,8 @@ Prepare Terminal-Bench results for leaderboard submission.
 
 This script:
 1. Downloads the latest nightly benchmark results from GitHub Actions
-2. Constructs the submission folder structure required by the leaderboard
+2. Constructs the submission folder structure required by the leaderboard,
+   streaming trial files straight out of the artifact zips
 3. Prints instructions to submit via `hf` CLI
 
 Usage:
@@ -17,6 +18,16 @@ Usage:
     # Use existing downloaded artifacts
     python prepare_leaderboard_submission.py --artifacts-dir ./downloads
 
+    # ... or artifact zips kept by download_run_logs.py --keep-archives
+    python prepare_leaderboard_submission.py \\
+        --artifacts-dir .run_logs/20939412042/.archives
+
+    # Force real copies (default: reflink/hardlink when on the same filesystem)
+    python prepare_leaderboard_submission.py --artifacts-dir ./downloads --link-mode copy
+
+    # Cap agent logs at 1 MB, hardlink duplicate files, show what takes space
+    python prepare_leaderboard_submission.py --max-log-size 1M --dedupe --size-report
+
     # Then submit with hf CLI:
     hf upload alexgshaw/terminal-bench-2-leaderboard \\
         ./leaderboard_submission/submissions submissions \\
@@ -38,25 +49,42 @@ Output structure (per leaderboard requirements):
 """
 
 import argparse
+import contextlib
+import errno
+import fnmatch
 import json
 import os
 import shutil
 import sys
 import tempfile
+import threading
+import zipfile
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 try:
+    import fcntl
+except ImportError:  # Windows: no reflinks
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    from . import submission_manifest
+    from .run_cache import parse_size
     from .tbench_utils import (
-        download_run_artifacts,
+        download_run_archives,
         list_artifacts_for_run,
         list_nightly_runs,
         run_command,
         SMOKE_TEST_MODEL,
     )
 except ImportError:
+    import submission_manifest  # type: ignore[import-not-found,no-redef]
+    from run_cache import parse_size  # type: ignore[import-not-found,no-redef]
     from tbench_utils import (  # type: ignore[import-not-found,no-redef]
-        download_run_artifacts,
+        download_run_archives,
         list_artifacts_for_run,
         list_nightly_runs,
         run_command,
@@ -108,6 +136,119 @@ MODEL_METADATA = {
 }
 
 
+# Files left out of submissions
+IGNORED_FILES = (
+    "unix-app.tar.gz",  # Large agent binary (~5MB each)
+    "unix-tokens.json",  # Token usage (not needed for leaderboard)
+)
+
+# How trial files get into the submission (see FileCopier)
+# Agent logs that --max-log-size may truncate (trial-relative agent/ files)
+TRUNCATED_LOG_SUFFIXES = (".txt", ".log")
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+COPY_WORKERS = 8
+# Linux ioctl that makes dst share src's extents (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+# Errors meaning "this filesystem (pair) cannot do that", as opposed to a
+# problem with one file
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EINVAL,
+    errno.EPERM,
+    errno.ENOSYS,
+}
+
+
+class FileCopier:
+    """
+    Put files into the submission by reflink, hardlink or plain copy.
+
+    ``auto`` tries a reflink (copy-on-write clone: no extra space, and the
+    copies stay independent), then a hardlink (no extra space, shares the
+    inode with the downloaded artifact), then a byte copy. A method that
+    fails because the filesystem does not support it is not retried for
+    that source/destination device pair. Safe to call from several threads.
+    """
+
+    def __init__(self, mode: str = "auto") -> None:
+        if mode not in LINK_MODES:
+            raise ValueError(f"unknown link mode: {mode}")
+        self.methods = ["reflink", "hardlink", "copy"] if mode == "auto" else [mode]
+        self.counts: Counter[str] = Counter()
+        self.bytes_copied = 0
+        self._unsupported: set[tuple[str, int, int]] = set()
+        self._lock = threading.Lock()
+
+    def copy(self, src: Path, dst: Path) -> str:
+        """Copy one file; returns the method that was used."""
+        # Never write through an existing (possibly hardlinked) destination
+        dst.unlink(missing_ok=True)
+        devices = (os.stat(src).st_dev, os.stat(dst.parent).st_dev)
+        for method in self.methods:
+            key = (method, *devices)
+            if key in self._unsupported:
+                continue
+            try:
+                getattr(self, f"_{method}")(src, dst)
+            except OSError as e:
+                dst.unlink(missing_ok=True)
+                if method == self.methods[-1]:
+                    raise
+                if e.errno in _UNSUPPORTED_ERRNOS:
+                    with self._lock:
+                        self._unsupported.add(key)
+                continue
+            with self._lock:
+                self.counts[method] += 1
+                if method == "copy":
+                    self.bytes_copied += dst.stat().st_size
+            return method
+        raise OSError(errno.EOPNOTSUPP, f"cannot {'/'.join(self.methods)}", str(src))
+
+    @staticmethod
+    def _reflink(src: Path, dst: Path) -> None:
+        if fcntl is None:
+            raise OSError(errno.EOPNOTSUPP, "reflinks need fcntl")
+        with src.open("rb") as s, dst.open("wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        shutil.copystat(src, dst)
+
+    @staticmethod
+    def _hardlink(src: Path, dst: Path) -> None:
+        os.link(src, dst)
+
+    @staticmethod
+    def _copy(src: Path, dst: Path) -> None:
+        shutil.copy2(src, dst)
+
+    def summary(self) -> str:
+        parts = [
+            f"{self.counts[m]} {m}ed" for m in ("reflink", "hardlink") if self.counts[m]
+        ]
+        parts.append(f"{self.counts['copy']} copied ({self.bytes_copied / 1e6:.1f} MB)")
+        return ", ".join(parts)
+
+
+def tree_files(src_dir: Path) -> list[tuple[Path, str]]:
+    """(source file, path relative to src_dir) of every file to submit.
+
+    Files matching IGNORED_FILES are skipped (like ``shutil.ignore_patterns``).
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        rel = Path(dirpath).relative_to(src_dir)
+        dirnames[:] = [
+            d for d in dirnames if not any(fnmatch.fnmatch(d, p) for p in IGNORED_FILES)
+        ]
+        for name in filenames:
+            if any(fnmatch.fnmatch(name, p) for p in IGNORED_FILES):
+                continue
+            files.append((Path(dirpath) / name, (rel / name).as_posix()))
+    return files
+
+
 def get_latest_successful_nightly_run() -> dict | None:
     """Get the latest successful nightly Terminal-Bench run."""
     print("Fetching latest successful nightly run...")
@@ -185,13 +326,135 @@ def find_job_folders(artifacts_dir: Path) -> list[Path]:
     return job_folders
 
 
+def _source_size(src: submission_manifest.Source) -> int:
+    if isinstance(src, bytes):
+        return len(src)
+    if isinstance(src, submission_manifest.ArchiveMember):
+        return src.info.file_size
+    return src.stat().st_size
+
+
+def is_agent_log(rel: str) -> bool:
+    """Whether a submission path is an agent log (``<job>/<trial>/agent/...``)."""
+    parts = rel.split("/")
+    return (
+        len(parts) > 3 and parts[2] == "agent" and rel.endswith(TRUNCATED_LOG_SUFFIXES)
+    )
+
+
+def truncate_log(src: submission_manifest.Source, max_bytes: int) -> bytes:
+    """
+    The first and last ``max_bytes / 2`` bytes of a log, with a marker line
+    giving the number of bytes cut in between.
+
+    The result only depends on the content, so an unchanged log truncates to
+    the same bytes and is not re-uploaded by an incremental build.
+    """
+    half = max_bytes // 2
+    size = _source_size(src)
+    if isinstance(src, bytes):
+        head, tail = src[:half], src[size - half :]
+    elif isinstance(src, submission_manifest.ArchiveMember):
+        # Zip members cannot seek; keep a rolling window for the tail
+        with src.archive.open(src.info) as f:
+            head = f.read(half)
+            window = b""
+            while chunk := f.read(submission_manifest.CHUNK_SIZE):
+                window = (window + chunk)[-half:]
+        tail = window
+    else:
+        with src.open("rb") as f:
+            head = f.read(half)
+            f.seek(max(half, size - half))
+            tail = f.read()
+    cut = size - len(head) - len(tail)
+    return head + f"\n... [{cut} bytes truncated] ...\n".encode() + tail
+
+
+def _submission_name(model: str) -> str:
+    """Unix__<Model> style folder name of a model's submission."""
+    model_info = MODEL_METADATA.get(model, {})
+    model_folder_name = model_info.get("folder_name", model.split("/")[-1].title())
+    return f"Mux__{model_folder_name}"
+
+
+def write_submissions(
+    model_sources: dict[str, dict[str, submission_manifest.Source]],
+    output_dir: Path,
+    copy: Callable[[Path, Path], object],
+    workers: int = COPY_WORKERS,
+    max_log_bytes: int | None = None,
+) -> dict[str, Path]:
+    """
+    Sync each model's submission directory with its sources.
+
+    ``model_sources`` maps a model to the files of its submission (paths
+    relative to the submission directory, without metadata.yaml, which is
+    generated here). Builds are incremental: a per-submission content
+    manifest (see submission_manifest.py) limits the work to trials whose
+    files changed, and trials no longer in the artifacts are removed.
+
+    With ``max_log_bytes``, agent logs larger than that are replaced by
+    their truncate_log() head and tail.
+
+    Returns a dict mapping model names to their submission directories.
+    """
+    submissions: dict[str, Path] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for model, files in model_sources.items():
+            submission_name = _submission_name(model)
+            submission_dir = (
+                output_dir / "submissions" / "terminal-bench" / "2.0" / submission_name
+            )
+            submission_dir.mkdir(parents=True, exist_ok=True)
+            sources: dict[str, submission_manifest.Source] = {
+                "metadata.yaml": create_metadata_yaml(model).encode(),
+                **files,
+            }
+            if max_log_bytes is not None:
+                oversized = [
+                    rel
+                    for rel, src in files.items()
+                    if is_agent_log(rel) and _source_size(src) > max_log_bytes
+                ]
+                truncated = pool.map(
+                    truncate_log,
+                    [files[rel] for rel in oversized],
+                    [max_log_bytes] * len(oversized),
+                )
+                sources.update(zip(oversized, truncated))
+                if oversized:
+                    print(
+                        f"  {submission_name}: truncated {len(oversized)} agent "
+                        f"log(s) over {max_log_bytes / 1e6:g} MB"
+                    )
+            # Only trials whose content changed since the last build are rewritten
+            changes = submission_manifest.sync_submission(
+                submission_dir,
+                sources,
+                submission_manifest.manifest_path(output_dir, submission_name),
+                copy,
+                pool,
+            )
+            submission_manifest.print_changes(changes)
+            submissions[model] = submission_dir
+    return submissions
+
+
 def prepare_submission(
     artifacts_dir: Path,
     output_dir: Path,
     models_filter: list[str] | None = None,
+    link_mode: str = "auto",
+    workers: int = COPY_WORKERS,
+    max_log_bytes: int | None = None,
 ) -> dict[str, Path]:
     """
-    Prepare submission folders from downloaded artifacts.
+    Prepare submission folders from downloaded (extracted) artifacts.
+
+    Files are reflinked, hardlinked or copied (``link_mode``, see FileCopier)
+    by a pool of ``workers`` threads; see write_submissions for how rebuilds
+    are limited to what changed.
 
     Leaderboard structure:
         submissions/terminal-bench/2.0/<agent>__<model>/
@@ -207,13 +470,11 @@ def prepare_submission(
 
     Returns a dict mapping model names to their submission directories.
     """
-    submissions: dict[str, Path] = {}
-
     # Find all job folders in the artifacts
     job_folders = find_job_folders(artifacts_dir)
     if not job_folders:
         print("No job folders found in artifacts")
-        return submissions
+        return {}
 
     print(f"Found {len(job_folders)} job folder(s)")
 
@@ -250,63 +511,146 @@ def prepare_submission(
     if models_filter:
         model_trials = {m: t for m, t in model_trials.items() if m in models_filter}
 
-    # Create submissions for each model
+    # Files of each submission: job-level files and trial files
+    model_sources: dict[str, dict[str, submission_manifest.Source]] = {}
     for model, trials in model_trials.items():
-        # Create submission directory: Unix__<Model>
-        model_info = MODEL_METADATA.get(model, {})
-        model_folder_name = model_info.get("folder_name", model.split("/")[-1].title())
-        submission_name = f"Mux__{model_folder_name}"
-
-        submission_dir = (
-            output_dir / "submissions" / "terminal-bench" / "2.0" / submission_name
-        )
-        submission_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create metadata.yaml
-        metadata_path = submission_dir / "metadata.yaml"
-        if not metadata_path.exists():
-            metadata_path.write_text(create_metadata_yaml(model))
-
-        # Group trials by source job folder (preserve original job structure)
-        trials_by_job: dict[str, list[Path]] = {}
+        sources = model_sources.setdefault(model, {})
         for trial_src, job_folder in trials:
             job_name = job_folder.name
-            if job_name not in trials_by_job:
-                trials_by_job[job_name] = []
-            trials_by_job[job_name].append(trial_src)
+            # Copy job-level config/result if present
+            job_root = model_jobs[model][job_name]
+            for filename in ("config.json", "result.json"):
+                source_file = job_root / filename
+                if source_file.exists():
+                    sources[f"{job_name}/{filename}"] = source_file
+            for src, rel in tree_files(trial_src):
+                sources[f"{job_name}/{trial_src.name}/{rel}"] = src
+
+    copier = FileCopier(link_mode)
+    submissions = write_submissions(
+        model_sources, output_dir, copier.copy, workers, max_log_bytes
+    )
+    if model_trials:
+        print(f"  Files: {copier.summary()}")
+    return submissions
 
-        # Copy trials into job folders
-        total_trials = 0
-        for job_name, trial_paths in trials_by_job.items():
-            dest_job_folder = submission_dir / job_name
-            dest_job_folder.mkdir(parents=True, exist_ok=True)
 
-            # Copy job-level config/result if present
-            job_root = model_jobs[model].get(job_name)
-            if job_root:
-                for filename in ("config.json", "result.json"):
-                    source_file = job_root / filename
-                    if source_file.exists():
-                        shutil.copy2(source_file, dest_job_folder / filename)
-
-            for trial_src in trial_paths:
-                dest_trial_dir = dest_job_folder / trial_src.name
-                if dest_trial_dir.exists():
-                    shutil.rmtree(dest_trial_dir)
-                shutil.copytree(
-                    trial_src,
-                    dest_trial_dir,
-                    ignore=shutil.ignore_patterns(
-                        "unix-app.tar.gz",  # Large agent binary (~5MB each)
-                        "unix-tokens.json",  # Token usage (not needed for leaderboard)
-                    ),
+def archive_sources(
+    archives: list[zipfile.ZipFile],
+) -> dict[str, dict[str, submission_manifest.Source]]:
+    """
+    Route the members of artifact zips to their submission paths, per model.
+
+    Same selection as prepare_submission on extracted artifacts -- trials
+    are ``jobs/<job>/<trial>/`` directories with a result.json, attributed to
+    the model in their config.json, plus the job-level config/result -- but
+    read from the zip directories, so nothing is extracted up front.
+    """
+    model_sources: dict[str, dict[str, submission_manifest.Source]] = {}
+    for zf in archives:
+        job_files: dict[str, list[zipfile.ZipInfo]] = {}
+        trials: dict[tuple[str, str], list[tuple[zipfile.ZipInfo, str]]] = {}
+        for info in zf.infolist():
+            parts = PurePosixPath(info.filename).parts
+            if info.is_dir() or len(parts) < 3 or parts[0] != "jobs":
+                continue
+            if any(p in ("", ".", "..") for p in parts) or info.filename.startswith(
+                "/"
+            ):
+                continue
+            if len(parts) == 3:
+                if parts[2] in ("config.json", "result.json"):
+                    job_files.setdefault(parts[1], []).append(info)
+                continue
+            rest = parts[3:]
+            if any(fnmatch.fnmatch(p, pat) for p in rest for pat in IGNORED_FILES):
+                continue
+            trials.setdefault((parts[1], parts[2]), []).append((info, "/".join(rest)))
+
+        for (job, trial), members in sorted(trials.items()):
+            by_name = {rel: info for info, rel in members}
+            if "result.json" not in by_name:
+                continue
+            model = None
+            if "config.json" in by_name:
+                try:
+                    config = json.loads(zf.read(by_name["config.json"]))
+                    model = config.get("agent", {}).get("model_name")
+                except json.JSONDecodeError:
+                    pass
+            if not model:
+                print(f"  Warning: Could not determine model for {trial}")
+                continue
+            sources = model_sources.setdefault(model, {})
+            for info in job_files.get(job, []):
+                name = PurePosixPath(info.filename).name
+                sources[f"{job}/{name}"] = submission_manifest.ArchiveMember(zf, info)
+            for rel, info in by_name.items():
+                sources[f"{job}/{trial}/{rel}"] = submission_manifest.ArchiveMember(
+                    zf, info
                 )
-                total_trials += 1
+    return model_sources
 
-        print(f"  {model}: copied {total_trials} trial(s)")
-        submissions[model] = submission_dir
 
-    return submissions
+def prepare_submission_from_archives(
+    archives: list[Path],
+    output_dir: Path,
+    models_filter: list[str] | None = None,
+    workers: int = COPY_WORKERS,
+    max_log_bytes: int | None = None,
+) -> dict[str, Path]:
+    """
+    Prepare submission folders straight from artifact zips, in one pass.
+
+    Each trial member is streamed from its zip to its
+    ``<agent>__<model>/<job>/<trial>`` destination (IGNORED_FILES are never
+    decompressed), instead of extracting the artifacts and copying the
+    result. Unchanged members are recognized from the zip directory alone.
+    """
+    with contextlib.ExitStack() as stack:
+        zips = [stack.enter_context(zipfile.ZipFile(a)) for a in archives]
+        model_sources = archive_sources(zips)
+        if models_filter:
+            model_sources = {
+                m: f for m, f in model_sources.items() if m in models_filter
+            }
+        print(f"Found {len(model_sources)} model(s) in {len(archives)} archive(s)")
+
+        def no_copy(src: Path, dst: Path) -> None:
+            raise AssertionError("archive sources are never copied")
+
+        return write_submissions(
+            model_sources, output_dir, no_copy, workers, max_log_bytes
+        )
+
+
+def report_submissions(
+    submissions: dict[str, Path],
+    output_dir: Path,
+    dedupe: bool = False,
+    size_report: int = 0,
+) -> None:
+    """
+    Hardlink duplicate files within each submission and/or print the
+    ``size_report`` largest file kinds of each, from the build manifests.
+    """
+    for submission_dir in submissions.values():
+        manifest_file = submission_manifest.manifest_path(
+            output_dir, submission_dir.name
+        )
+        files = submission_manifest.load_manifest(manifest_file)
+        if dedupe:
+            linked, saved = submission_manifest.dedupe_files(submission_dir, files)
+            print(
+                f"  {submission_dir.name}: hardlinked {linked} duplicate file(s), "
+                f"{saved / 1e6:.1f} MB saved"
+            )
+        if size_report:
+            submission_manifest.print_size_report(
+                submission_dir.name,
+                submission_manifest.size_report(files),
+                limit=size_report,
+            )
 
 
 def main():
@@ -321,7 +665,8 @@ def main():
     parser.add_argument(
         "--artifacts-dir",
         type=Path,
-        help="Use existing downloaded artifacts instead of downloading",
+        help="Use existing downloaded artifacts (extracted, or a directory of "
+        "artifact zips) instead of downloading",
     )
     parser.add_argument(
         "--output-dir",
@@ -334,15 +679,72 @@ def main():
         nargs="+",
         help="Only process specific models (e.g., anthropic/claude-opus-4-5)",
     )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="auto",
+        help="How trial files are put into the submission: reflink/hardlink "
+        "when possible with copy fallback (auto), or one method only (default: auto)",
+    )
+    parser.add_argument(
+        "--copy-workers",
+        type=int,
+        default=COPY_WORKERS,
+        help=f"Threads copying files (default: {COPY_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-log-size",
+        help="Truncate agent logs larger than this (e.g. 1M) to their head and "
+        "tail (default: keep logs whole)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Hardlink files with identical content within each submission "
+        "(uploaded as regular files)",
+    )
+    parser.add_argument(
+        "--size-report",
+        type=int,
+        nargs="?",
+        const=10,
+        default=0,
+        metavar="N",
+        help="Print the N largest file kinds of each submission (default N: 10)",
+    )
     args = parser.parse_args()
+    try:
+        max_log_bytes = parse_size(args.max_log_size) if args.max_log_size else None
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     # Determine what artifacts to use
     if args.artifacts_dir:
         if not args.artifacts_dir.exists():
             print(f"Error: Artifacts directory {args.artifacts_dir} does not exist")
             sys.exit(1)
-        artifacts_dir = args.artifacts_dir
         run_date = datetime.now().strftime("%Y-%m-%d")
+        print(f"\nPreparing submission in {args.output_dir}...")
+        archives = sorted(args.artifacts_dir.glob("*.zip"))
+        if archives and not find_job_folders(args.artifacts_dir):
+            # e.g. .run_logs/<run-id>/.archives of download_run_logs.py
+            submissions = prepare_submission_from_archives(
+                archives,
+                args.output_dir,
+                args.models,
+                workers=args.copy_workers,
+                max_log_bytes=max_log_bytes,
+            )
+        else:
+            submissions = prepare_submission(
+                args.artifacts_dir,
+                args.output_dir,
+                args.models,
+                link_mode=args.link_mode,
+                workers=args.copy_workers,
+                max_log_bytes=max_log_bytes,
+            )
     else:
         # Download from GitHub Actions
         if args.run_id:
@@ -375,22 +777,32 @@ def main():
             ]
             print(f"Filtered to {len(artifacts)} artifact(s) for specified models")
 
-        # Download artifacts
-        artifacts_dir = Path(tempfile.mkdtemp(prefix="tbench-"))
-        artifact_names = [a["name"] for a in artifacts]
-        if not download_run_artifacts(
-            run_id, artifacts_dir, artifact_names, verbose=True
-        ):
-            print("Failed to download artifacts")
-            sys.exit(1)
-
-    # Prepare submission
-    print(f"\nPreparing submission in {args.output_dir}...")
-    submissions = prepare_submission(artifacts_dir, args.output_dir, args.models)
+        # Assemble straight from the downloaded zips; they are only needed
+        # until the submission is built
+        archive_dir = Path(tempfile.mkdtemp(prefix="tbench-"))
+        try:
+            artifact_names = [a["name"] for a in artifacts]
+            archives = download_run_archives(
+                run_id, archive_dir, artifact_names, verbose=True
+            )
+            if not archives:
+                print("Failed to download artifacts")
+                sys.exit(1)
+            print(f"\nPreparing submission in {args.output_dir}...")
+            submissions = prepare_submission_from_archives(
+                archives,
+                args.output_dir,
+                args.models,
+                workers=args.copy_workers,
+                max_log_bytes=max_log_bytes,
+            )
+        finally:
+            shutil.rmtree(archive_dir, ignore_errors=True)
 
     if not submissions:
         print("No valid submissions created")
         sys.exit(1)
+    report_submissions(submissions, args.output_dir, args.dedupe, args.size_report)
 
     print(f"\n✅ Created {len(submissions)} submission(s):")
     for model, path in submissions.items():
@@ -403,11 +815,6 @@ def main():
     print(f"    --repo-type dataset --create-pr \\")
     print(f'    --commit-message "Unix submission ({run_date})"')
 
-    # Clean up temp directory if we created one
-    if not args.artifacts_dir and artifacts_dir.exists():
-        print(f"\nNote: Downloaded artifacts are in {artifacts_dir}")
-        print("      Delete with: rm -rf " + str(artifacts_dir))
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import errno
+import json
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from . import prepare_leaderboard_submission as pls
+from . import submission_manifest
+
+
+def _artifacts(root: Path, trial_name: str = "fix-git__abc") -> Path:
+    job = root / "terminal-bench-results-opus" / "jobs" / "2026-01-16__00-15-05"
+    trial = job / trial_name
+    (trial / "agent" / "command-0").mkdir(parents=True)
+    (job / "result.json").write_text("{}")
+    (job / "config.json").write_text("{}")
+    (trial / "config.json").write_text(
+        json.dumps({"agent": {"model_name": "anthropic/claude-opus-4-5"}})
+    )
+    (trial / "result.json").write_text('{"passed": true}')
+    (trial / "agent" / "command-0" / "stdout.txt").write_text("log")
+    (trial / "agent" / "unix-app.tar.gz").write_bytes(b"binary")
+    return root
+
+
+def test_hardlinks_fall_back_to_copies_across_devices(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifacts = _artifacts(tmp_path / "artifacts")
+    submissions = pls.prepare_submission(
+        artifacts, tmp_path / "out", link_mode="hardlink"
+    )
+    trial = (
+        submissions["anthropic/claude-opus-4-5"]
+        / "2026-01-16__00-15-05"
+        / "fix-git__abc"
+    )
+    stdout = trial / "agent" / "command-0" / "stdout.txt"
+    assert stdout.stat().st_nlink == 2
+    assert not (trial / "agent" / "unix-app.tar.gz").exists()
+
+    # A rebuild without a manifest replaces links instead of writing through
+    job_result = trial.parent / "result.json"
+    assert job_result.stat().st_nlink == 2
+    shutil.rmtree(tmp_path / "out" / submission_manifest.MANIFEST_DIR)
+    pls.prepare_submission(artifacts, tmp_path / "out", link_mode="copy")
+    assert job_result.stat().st_nlink == 1
+    src = next(artifacts.rglob("stdout.txt"))
+    assert src.stat().st_nlink == 1
+
+    def cross_device(src: Path, dst: Path) -> None:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(pls.FileCopier, "_reflink", staticmethod(cross_device))
+    monkeypatch.setattr(pls.FileCopier, "_hardlink", staticmethod(cross_device))
+    copier = pls.FileCopier("auto")
+    dst = tmp_path / "dst.txt"
+    dst.write_text("stale")
+    assert copier.copy(src, dst) == "copy"
+    assert copier.copy(src, tmp_path / "dst2.txt") == "copy"
+    assert dst.read_text() == "log"
+    assert copier.counts == {"copy": 2}
+    # The unsupported methods were only tried once
+    assert len(copier._unsupported) == 2
+
+
+def test_rebuilds_only_touch_changed_trials(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifacts = _artifacts(tmp_path / "artifacts")
+    _artifacts(artifacts, "chess__def")
+    out = tmp_path / "out"
+
+    def build() -> submission_manifest.SubmissionChanges:
+        changes = []
+        monkeypatch.setattr(submission_manifest, "print_changes", changes.append)
+        pls.prepare_submission(artifacts, out, link_mode="copy")
+        (change,) = changes
+        return change
+
+    first = build()
+    assert first.trials_added == [
+        "2026-01-16__00-15-05/chess__def",
+        "2026-01-16__00-15-05/fix-git__abc",
+    ]
+    assert "metadata.yaml" in first.uploaded
+    assert not build().changed
+
+    # One changed log, one new trial, one removed trial, new metadata
+    job = next(artifacts.rglob("2026-01-16__00-15-05"))
+    (job / "fix-git__abc" / "agent" / "command-0" / "stdout.txt").write_text("log 2")
+    _artifacts(artifacts, "new-task__ghi")
+    shutil.rmtree(job / "chess__def")
+    monkeypatch.setitem(
+        pls.UNIX_METADATA, "agent_display_name", "Unix (fixed metadata)"
+    )
+    change = build()
+    assert change.trials_added == ["2026-01-16__00-15-05/new-task__ghi"]
+    assert change.trials_replaced == ["2026-01-16__00-15-05/fix-git__abc"]
+    assert change.trials_removed == ["2026-01-16__00-15-05/chess__def"]
+    assert change.uploaded == [
+        "2026-01-16__00-15-05/fix-git__abc/agent/command-0/stdout.txt",
+        "2026-01-16__00-15-05/new-task__ghi/agent/command-0/stdout.txt",
+        "2026-01-16__00-15-05/new-task__ghi/config.json",
+        "2026-01-16__00-15-05/new-task__ghi/result.json",
+        "metadata.yaml",
+    ]
+    assert change.deleted == [
+        "2026-01-16__00-15-05/chess__def/agent/command-0/stdout.txt",
+        "2026-01-16__00-15-05/chess__def/config.json",
+        "2026-01-16__00-15-05/chess__def/result.json",
+    ]
+    submission = out / "submissions" / "terminal-bench" / "2.0" / "Mux__Claude-Opus-4.5"
+    assert not (submission / "2026-01-16__00-15-05" / "chess__def").exists()
+    assert "fixed metadata" in (submission / "metadata.yaml").read_text()
+
+
+def test_assembles_from_zips_without_extracting(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifacts = _artifacts(tmp_path / "artifacts")
+    artifact = artifacts / "terminal-bench-results-opus"
+    archive = Path(
+        shutil.make_archive(str(tmp_path / "zips" / artifact.name), "zip", artifact)
+    )
+    out = tmp_path / "out"
+    changes: list[submission_manifest.SubmissionChanges] = []
+    monkeypatch.setattr(submission_manifest, "print_changes", changes.append)
+
+    submissions = pls.prepare_submission_from_archives([archive], out)
+    trial = (
+        submissions["anthropic/claude-opus-4-5"]
+        / "2026-01-16__00-15-05"
+        / "fix-git__abc"
+    )
+    assert (trial / "agent" / "command-0" / "stdout.txt").read_text() == "log"
+    assert not (trial / "agent" / "unix-app.tar.gz").exists()
+    assert (trial.parent / "result.json").exists()
+    assert changes[-1].trials_added == ["2026-01-16__00-15-05/fix-git__abc"]
+
+    # Unchanged members are recognized from the zip directory, and the
+    # extracted artifacts hash to the same content
+    pls.prepare_submission_from_archives([archive], out)
+    assert not changes[-1].changed
+    pls.prepare_submission(artifacts, out, link_mode="copy")
+    assert not changes[-1].changed
+    pls.prepare_submission_from_archives([archive], out)
+    assert not changes[-1].changed
+
+
+def test_budget_truncation_dedupe_and_size_report(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    artifacts = _artifacts(tmp_path / "artifacts")
+    _artifacts(artifacts, "chess__def")
+    job = next(artifacts.rglob("2026-01-16__00-15-05"))
+    big_log = job / "chess__def" / "agent" / "command-0" / "stderr.txt"
+    big_log.write_bytes(b"a" * 3000 + b"b" * 5000 + b"c" * 3000)
+    out = tmp_path / "out"
+
+    submissions = pls.prepare_submission(
+        artifacts, out, link_mode="copy", max_log_bytes=4000
+    )
+    submission = submissions["anthropic/claude-opus-4-5"]
+    truncated = (submission / big_log.relative_to(job.parent)).read_bytes()
+    assert (
+        truncated == b"a" * 2000 + b"\n... [7000 bytes truncated] ...\n" + b"c" * 2000
+    )
+    assert pls.truncate_log(big_log.read_bytes(), 4000) == truncated
+    with zipfile.ZipFile(tmp_path / "log.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(big_log, "stderr.txt")
+    with zipfile.ZipFile(tmp_path / "log.zip") as zf:
+        member = submission_manifest.ArchiveMember(zf, zf.getinfo("stderr.txt"))
+        assert pls.truncate_log(member, 4000) == truncated
+
+    capsys.readouterr()
+    pls.report_submissions(submissions, out, dedupe=True, size_report=10)
+    report = capsys.readouterr().out
+    assert "agent/command-N/stdout.txt" in report
+    # Same stdout.txt/result.json/config.json in both trials, and the job's
+    # config.json and result.json are both "{}"
+    assert "hardlinked 4 duplicate file(s)" in report
+    stdouts = sorted(submission.rglob("stdout.txt"))
+    assert stdouts[0].stat().st_ino == stdouts[1].stat().st_ino
+
+    # Rebuilding replaces a deduped file instead of writing through the link
+    (job / "chess__def" / "agent" / "command-0" / "stdout.txt").write_text("new")
+    pls.prepare_submission(artifacts, out, link_mode="copy", max_log_bytes=4000)
+    assert sorted(p.read_text() for p in stdouts) == ["log", "new"]
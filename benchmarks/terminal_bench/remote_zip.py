@@ -0,0 +1,309 @@
+"""
+Read selected members of a remote zip archive with HTTP range requests.
+
+Only the end-of-central-directory record, the central directory and the
+requested members are transferred, so a few small files can be pulled out of
+a large artifact zip without downloading all of it. Used by the tiered
+fetch in tbench_utils (results first, trial logs on demand).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import threading
+import urllib.error
+import urllib.request
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+# Local file header: signature, version, flags, method, time, date, crc,
+# compressed size, size, name length, extra length
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+# Bytes fetched from the end first: EOCD (22) + max comment (64k), which
+# usually covers the central directory of a small archive as well
+_TAIL_BYTES = 64 * 1024 + 22
+# Members closer than this are fetched in one request
+MAX_GAP = 32 * 1024
+# Allowance for a local extra field longer than the central one
+_HEADER_SLACK = 256
+# extract_many copies members larger than this (compressed) to disk in chunks
+# of this size instead of decompressing them in memory
+STREAM_CHUNK = 1024 * 1024
+
+
+class RangeReader:
+    """Fetch byte ranges of a URL, counting requests and bytes transferred.
+
+    ``url_factory`` is called again if the server answers 401/403, which is
+    how short-lived signed URLs (like GitHub's artifact blob URLs) expire.
+    """
+
+    def __init__(self, url_factory: Callable[[], str], timeout: float = 60) -> None:
+        self._url_factory = url_factory
+        self._url = url_factory()
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.bytes_transferred = 0
+        self.requests = 0
+
+    def fetch(self, start: int, end: int) -> bytes:
+        """Return bytes ``[start, end)``."""
+        for attempt in range(2):
+            request = urllib.request.Request(
+                self._url, headers={"Range": f"bytes={start}-{end - 1}"}
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self._timeout) as resp:
+                    data = resp.read()
+                    status = resp.status
+            except urllib.error.HTTPError as e:
+                if e.code in (401, 403) and attempt == 0:
+                    self._url = self._url_factory()
+                    continue
+                raise
+            with self._lock:
+                self.bytes_transferred += len(data)
+                self.requests += 1
+            if status != 206:
+                # Server ignored the Range header and sent the whole body
+                return data[start:end]
+            return data
+        raise AssertionError("unreachable")
+
+
+class _RemoteFile(io.RawIOBase):
+    """Seekable read-only view of a remote file for zipfile's directory parsing."""
+
+    def __init__(self, reader: RangeReader, size: int) -> None:
+        self._reader = reader
+        self._size = size
+        self._pos = 0
+        self._cache_start = max(0, size - _TAIL_BYTES)
+        self._cache = self.tail = reader.fetch(self._cache_start, size)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._pos = offset
+        return offset
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        end = min(self._pos + len(buffer), self._size)
+        if end <= self._pos:
+            return 0
+        cache_end = self._cache_start + len(self._cache)
+        if not (self._cache_start <= self._pos and end <= cache_end):
+            self._cache_start = self._pos
+            self._cache = self._reader.fetch(self._pos, end)
+        offset = self._pos - self._cache_start
+        data = self._cache[offset : offset + end - self._pos]
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def _decode_member(info: zipfile.ZipInfo, raw: bytes) -> bytes:
+    """Decompress a member from bytes starting at its local file header."""
+    fields = _LOCAL_HEADER.unpack_from(raw)
+    if fields[0] != _LOCAL_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    start = _LOCAL_HEADER.size + fields[9] + fields[10]
+    payload = raw[start : start + info.compress_size]
+    if info.compress_type == zipfile.ZIP_STORED:
+        data = payload
+    elif info.compress_type == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(payload, -15)
+    else:
+        raise NotImplementedError(
+            f"{info.filename}: compression method {info.compress_type}"
+        )
+    if zlib.crc32(data) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for {info.filename}")
+    return data
+
+
+class RemoteZip:
+    """Central directory of a remote zip plus parallel member extraction."""
+
+    def __init__(
+        self, url_factory: Callable[[], str], size: int, timeout: float = 60
+    ) -> None:
+        self.reader = RangeReader(url_factory, timeout)
+        self.size = size
+        remote_file = _RemoteFile(self.reader, size)
+        # The tail prefetched for the directory often holds small members too
+        self._tail_start = max(0, size - _TAIL_BYTES)
+        self._tail = remote_file.tail
+        with zipfile.ZipFile(remote_file) as zf:
+            self._infos = zf.infolist()
+
+    def infolist(self) -> list[zipfile.ZipInfo]:
+        return list(self._infos)
+
+    def _spans(
+        self, infos: list[zipfile.ZipInfo], max_gap: int
+    ) -> list[tuple[int, int, list[zipfile.ZipInfo]]]:
+        """Group members into byte ranges, merging neighbours closer than max_gap."""
+        spans: list[tuple[int, int, list[zipfile.ZipInfo]]] = []
+        for info in sorted(infos, key=lambda i: i.header_offset):
+            start = info.header_offset
+            end = min(
+                self.size,
+                start
+                + _LOCAL_HEADER.size
+                + len(info.orig_filename.encode())
+                + len(info.extra)
+                + info.compress_size
+                + _HEADER_SLACK,
+            )
+            if spans and start - spans[-1][1] <= max_gap:
+                prev_start, prev_end, members = spans[-1]
+                members.append(info)
+                spans[-1] = (prev_start, max(prev_end, end), members)
+            else:
+                spans.append((start, end, [info]))
+        return spans
+
+    def _read_span(
+        self, span: tuple[int, int, list[zipfile.ZipInfo]]
+    ) -> list[tuple[zipfile.ZipInfo, bytes]]:
+        start, end, members = span
+        if start >= self._tail_start:
+            raw = self._tail[start - self._tail_start : end - self._tail_start]
+        else:
+            raw = self.reader.fetch(start, end)
+        out = []
+        for info in members:
+            offset = info.header_offset - start
+            header = _LOCAL_HEADER.unpack_from(raw, offset)
+            needed = _LOCAL_HEADER.size + header[9] + header[10] + info.compress_size
+            chunk = raw[offset : offset + needed]
+            if len(chunk) < needed:
+                # Local extra field was larger than the slack allowed for
+                chunk = self.reader.fetch(
+                    info.header_offset, info.header_offset + needed
+                )
+            out.append((info, _decode_member(info, chunk)))
+        return out
+
+    def iter_many(
+        self,
+        infos: Iterable[zipfile.ZipInfo],
+        workers: int = 8,
+        max_gap: int = MAX_GAP,
+    ) -> Iterator[tuple[zipfile.ZipInfo, bytes]]:
+        """Fetch and decompress members concurrently, yielding them span by span.
+
+        A span's members are yielded as soon as it is read (in offset order),
+        and at most ``workers`` spans are read ahead of the consumer, so
+        callers can write members out instead of holding them all at once.
+        """
+        spans = iter(self._spans([i for i in infos if not i.is_dir()], max_gap))
+        workers = max(1, workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: deque[Future[list[tuple[zipfile.ZipInfo, bytes]]]] = deque(
+                pool.submit(self._read_span, span)
+                for _, span in zip(range(workers), spans)
+            )
+            while pending:
+                chunk = pending.popleft().result()
+                span = next(spans, None)
+                if span is not None:
+                    pending.append(pool.submit(self._read_span, span))
+                yield from chunk
+
+    def copy_member(
+        self, info: zipfile.ZipInfo, out: BinaryIO, chunk_size: int = STREAM_CHUNK
+    ) -> None:
+        """Decompress one member into ``out``, holding at most a chunk at a time."""
+        raw = self.reader.fetch(
+            info.header_offset, info.header_offset + _LOCAL_HEADER.size
+        )
+        fields = _LOCAL_HEADER.unpack(raw)
+        if fields[0] != _LOCAL_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            inflate = zlib.decompressobj(-15)
+        elif info.compress_type != zipfile.ZIP_STORED:
+            raise NotImplementedError(
+                f"{info.filename}: compression method {info.compress_type}"
+            )
+        start = info.header_offset + _LOCAL_HEADER.size + fields[9] + fields[10]
+        end = start + info.compress_size
+        crc = 0
+        for pos in range(start, end, chunk_size):
+            data = self.reader.fetch(pos, min(pos + chunk_size, end))
+            if info.compress_type == zipfile.ZIP_STORED:
+                crc = zlib.crc32(data, crc)
+                out.write(data)
+                continue
+            # Bound the output too: logs can inflate a hundredfold
+            while data:
+                block = inflate.decompress(data, chunk_size)
+                crc = zlib.crc32(block, crc)
+                out.write(block)
+                data = inflate.unconsumed_tail
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            block = inflate.flush()
+            crc = zlib.crc32(block, crc)
+            out.write(block)
+        if crc != info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for {info.filename}")
+
+    def extract_many(
+        self, infos: Iterable[zipfile.ZipInfo], dest: Path, workers: int = 8
+    ) -> list[Path]:
+        """Extract members under dest (write-then-rename per file).
+
+        Members larger than STREAM_CHUNK are copied in chunks (see
+        copy_member); the rest are fetched in merged spans (see iter_many).
+        """
+        root = dest.resolve()
+        infos = [i for i in infos if not i.is_dir()]
+
+        def write(info: zipfile.ZipInfo, fill: Callable[[BinaryIO], object]) -> Path:
+            target = (dest / info.filename).resolve()
+            if root not in target.parents:
+                raise zipfile.BadZipFile(f"Unsafe member path: {info.filename}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.part")
+            with tmp.open("wb") as f:
+                fill(f)
+            os.replace(tmp, target)
+            return target
+
+        small = [i for i in infos if i.compress_size <= STREAM_CHUNK]
+        written = [
+            write(info, lambda f, data=data: f.write(data))
+            for info, data in self.iter_many(small, workers)
+        ]
+        large = [i for i in infos if i.compress_size > STREAM_CHUNK]
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            written.extend(
+                pool.map(
+                    lambda info: write(
+                        info, lambda f: self.copy_member(info, f, STREAM_CHUNK)
+                    ),
+                    large,
+                )
+            )
+        return written
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+import random
+import threading
+import zipfile
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from . import remote_zip
+from .remote_zip import RemoteZip
+
+
+def _archive() -> bytes:
+    rng = random.Random(0)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(20):
+            trial = f"jobs/2026-01-01__00-00-00/task-{i}__abc"
+            zf.writestr(f"{trial}/result.json", f'{{"trial": {i}}}')
+            # Incompressible and larger than MAX_GAP, so it is never fetched
+            zf.writestr(f"{trial}/agent/command-0/stdout.txt", rng.randbytes(64_000))
+        zf.writestr("jobs/stored.txt", "plain", compress_type=zipfile.ZIP_STORED)
+        # Inflates about a thousandfold
+        zf.writestr("jobs/verifier.log", b"error: boom\n" * 500_000)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def served() -> Iterator[tuple[str, bytes]]:
+    body = _archive()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            start, end = self.headers["Range"].removeprefix("bytes=").split("-")
+            chunk = body[int(start) : int(end) + 1]
+            self.send_response(206)
+            self.send_header("Content-Length", str(len(chunk)))
+            self.end_headers()
+            self.wfile.write(chunk)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/artifact.zip", body
+    server.shutdown()
+
+
+def test_extracts_selected_members_with_range_requests(
+    served: tuple[str, bytes], tmp_path: Path
+) -> None:
+    url, body = served
+    remote = RemoteZip(lambda: url, len(body))
+    members = [
+        i
+        for i in remote.infolist()
+        if i.filename.endswith("result.json") or i.filename == "jobs/stored.txt"
+    ]
+    written = remote.extract_many(members, tmp_path)
+
+    assert len(written) == 21
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        for info in members:
+            assert (tmp_path / info.filename).read_bytes() == zf.read(info)
+    # Logs were skipped: far less than the archive went over the wire
+    assert remote.reader.bytes_transferred < len(body) / 4
+
+
+def test_large_members_are_copied_in_chunks(
+    served: tuple[str, bytes], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url, body = served
+    monkeypatch.setattr(remote_zip, "STREAM_CHUNK", 4096)
+    remote = RemoteZip(lambda: url, len(body))
+    members = [
+        i
+        for i in remote.infolist()
+        if i.filename.endswith(
+            ("task-3__abc/result.json", "task-3__abc/agent/command-0/stdout.txt")
+        )
+        or i.filename in ("jobs/stored.txt", "jobs/verifier.log")
+    ]
+    fetched: list[int] = []
+    fetch = remote.reader.fetch
+    monkeypatch.setattr(
+        remote.reader,
+        "fetch",
+        lambda start, end: fetched.append(end - start) or fetch(start, end),
+    )
+    written = remote.extract_many(members, tmp_path)
+
+    assert len(written) == 4
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        for info in members:
+            assert (tmp_path / info.filename).read_bytes() == zf.read(info)
+    assert max(fetched) <= 4096 + remote_zip._HEADER_SLACK
+
+
+def test_iter_many_reads_at_most_workers_spans_ahead(
+    served: tuple[str, bytes], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url, body = served
+    remote = RemoteZip(lambda: url, len(body))
+    results = [i for i in remote.infolist() if i.filename.endswith("result.json")]
+    read = []
+    read_span = remote._read_span
+    monkeypatch.setattr(
+        remote, "_read_span", lambda span: read.append(span) or read_span(span)
+    )
+
+    members = remote.iter_many(results, workers=2)
+    next(members)
+    # The archive's logs keep every result.json in its own span
+    assert len(read) <= 3
+    assert len(list(members)) == len(results) - 1
+    assert len(read) == len(results)
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Incremental local mirror of the BigQuery tbench_results rows (the
+tbench_results_compat view, see tbench_utils.BQ_TABLE).
+
+Keeps a SQLite copy of tbench_results next to the leaderboard cache and only
+fetches rows whose ``ingested_at`` is at or after the stored watermark, so
+repeated analysis sessions query locally instead of re-reading the whole table
+through the bq CLI. The large ``*_json`` blob columns are not mirrored.
+
+The same schema also backs a local results database written directly by
+``scripts/upload-tbench-results.py --sink sqlite`` (append_rows), so uploads
+and analysis can run entirely offline, without BigQuery credentials.
+
+Usage:
+    # Fetch rows ingested since the last sync
+    python benchmarks/terminal_bench/results_mirror.py sync
+
+    # Drop the mirror and re-download everything
+    python benchmarks/terminal_bench/results_mirror.py sync --full
+
+    # Show row count, watermark and last sync time
+    python benchmarks/terminal_bench/results_mirror.py status
+
+    # Analyze against the mirror
+    python benchmarks/terminal_bench/analyze_failure_rates.py --mirror
+
+    # Write results to a local database instead of BigQuery, and analyze it
+    python scripts/upload-tbench-results.py --sink sqlite
+    python benchmarks/terminal_bench/analyze_failure_rates.py --local-db
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from .tbench_utils import (
+        BQ_TABLE,
+        BQError,
+        bq_query_pages,
+        extract_task_id,
+        parse_bq_csv,
+        run_bq,
+    )
+except ImportError:
+    from tbench_utils import (  # type: ignore[import-not-found,no-redef]
+        BQ_TABLE,
+        BQError,
+        bq_query_pages,
+        extract_task_id,
+        parse_bq_csv,
+        run_bq,
+    )
+
+MIRROR_PATH = Path(__file__).parent / ".leaderboard_cache" / "tbench_results.sqlite"
+# Local results database (not a mirror: rows are written here instead of BigQuery)
+LOCAL_DB_PATH = (
+    Path(__file__).parent / ".leaderboard_cache" / "tbench_results_local.sqlite"
+)
+
+# Column order of tbench_results (see scripts/upload-tbench-results.py)
+COLUMNS: dict[str, str] = {
+    "run_id": "TEXT",
+    "task_id": "TEXT",
+    "github_run_id": "INTEGER",
+    "github_workflow": "TEXT",
+    "github_sha": "TEXT",
+    "github_ref": "TEXT",
+    "github_actor": "TEXT",
+    "github_event_name": "TEXT",
+    "model_name": "TEXT",
+    "thinking_level": "TEXT",
+    "mode": "TEXT",
+    "dataset": "TEXT",
+    "experiments": "TEXT",
+    "run_started_at": "TEXT",
+    "run_completed_at": "TEXT",
+    "n_resolved": "INTEGER",
+    "n_unresolved": "INTEGER",
+    "accuracy": "REAL",
+    "passed": "INTEGER",
+    "score": "REAL",
+    "n_input_tokens": "INTEGER",
+    "n_output_tokens": "INTEGER",
+    "run_result_json": "TEXT",
+    "run_metadata_json": "TEXT",
+    "task_result_json": "TEXT",
+    "ingested_at": "TEXT",
+    "trial_started_at": "TEXT",
+    "trial_finished_at": "TEXT",
+    "trial_duration_sec": "REAL",
+    "environment_setup_sec": "REAL",
+    "agent_setup_sec": "REAL",
+    "agent_execution_sec": "REAL",
+    "verifier_sec": "REAL",
+}
+TIMESTAMP_COLUMNS = (
+    "run_started_at",
+    "run_completed_at",
+    "ingested_at",
+    "trial_started_at",
+    "trial_finished_at",
+)
+# Blob columns left out of the mirror (they dominate bytes scanned)
+SKIPPED_COLUMNS = ("run_result_json", "run_metadata_json", "task_result_json")
+MIRRORED_COLUMNS = [c for c in COLUMNS if c not in SKIPPED_COLUMNS]
+
+
+def _schema_sql() -> str:
+    columns = ",\n    ".join(f"{name} {kind}" for name, kind in COLUMNS.items())
+    return f"""
+CREATE TABLE IF NOT EXISTS tbench_results (
+    row_key TEXT PRIMARY KEY,
+    {columns}
+);
+CREATE TABLE IF NOT EXISTS mirror_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def row_key(row: dict) -> str:
+    """Identity of a tbench_results row (rows have no primary key upstream)."""
+    return "|".join(
+        str(row.get(c) or "")
+        for c in ("run_id", "task_id", "model_name", "ingested_at")
+    )
+
+
+def connect(path: Path = MIRROR_PATH) -> sqlite3.Connection:
+    """Open (creating if needed) the mirror database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_schema_sql())
+    # Databases created before a column was added keep their old table
+    existing = {r["name"] for r in conn.execute("PRAGMA table_info(tbench_results)")}
+    for name, kind in COLUMNS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE tbench_results ADD COLUMN {name} {kind}")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tbench_results_ingested_at "
+        "ON tbench_results (ingested_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tbench_results_trial "
+        "ON tbench_results (run_id, task_id)"
+    )
+    conn.create_function("task_name", 1, extract_task_id, deterministic=True)
+    return conn
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO mirror_meta (key, value) VALUES (?, ?)", (key, value)
+    )
+
+
+def _convert(column: str, value: str) -> object:
+    """Convert a bq CSV cell to the SQLite column type (empty string = NULL)."""
+    if value == "":
+        return None
+    kind = COLUMNS[column]
+    if column == "passed":
+        return 1 if value.lower() == "true" else 0
+    if kind == "INTEGER":
+        return int(value)
+    if kind == "REAL":
+        return float(value)
+    return value
+
+
+def insert_rows(conn: sqlite3.Connection, rows: list[dict]) -> int:
+    """
+    Insert rows (keyed by row_key), ignoring ones already mirrored.
+
+    A trial (run_id and task_id) is kept once, at its latest ingested_at: the
+    results view lists trials uploaded while their run was still going, then
+    again with the job-level fields once the run row lands. Returns the
+    number of rows inserted.
+    """
+    columns = ["row_key", *MIRRORED_COLUMNS]
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(
+        "DELETE FROM tbench_results "
+        "WHERE run_id = ? AND task_id = ? AND ingested_at < ?",
+        (
+            (row.get("run_id"), row.get("task_id"), row.get("ingested_at"))
+            for row in rows
+        ),
+    )
+    before = conn.total_changes
+    conn.executemany(
+        f"INSERT OR IGNORE INTO tbench_results ({', '.join(columns)}) "
+        f"SELECT {placeholders} WHERE NOT EXISTS (SELECT 1 FROM tbench_results "
+        "WHERE run_id = ? AND task_id = ? AND ingested_at > ?)",
+        (
+            [
+                row_key(row),
+                *(row.get(c) for c in MIRRORED_COLUMNS),
+                row.get("run_id"),
+                row.get("task_id"),
+                row.get("ingested_at"),
+            ]
+            for row in rows
+        ),
+    )
+    return conn.total_changes - before
+
+
+def format_timestamp(value: str | None) -> str | None:
+    """ISO-8601 timestamp in the mirror's fixed-width UTC form (sorts as text)."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def append_rows(path: Path, rows: Iterable[dict]) -> int:
+    """
+    Write freshly built tbench_results rows to a local results database.
+
+    Unlike the mirror, all columns (including the JSON blobs) are kept. Rows
+    are keyed by run and trial folder (the BigQuery insert ID), so uploading
+    the same results again replaces them instead of adding duplicates.
+    Returns the number of rows written.
+    """
+    columns = ["row_key", *COLUMNS]
+    placeholders = ", ".join("?" for _ in columns)
+    conn = connect(path)
+    try:
+        before = conn.total_changes
+        conn.executemany(
+            f"INSERT OR REPLACE INTO tbench_results ({', '.join(columns)}) "
+            f"VALUES ({placeholders})",
+            (
+                [
+                    f"{row['run_id']}/{row['task_id']}",
+                    *(
+                        format_timestamp(row.get(c))
+                        if c in TIMESTAMP_COLUMNS
+                        else row.get(c)
+                        for c in COLUMNS
+                    ),
+                ]
+                for row in rows
+            ),
+        )
+        conn.commit()
+        return conn.total_changes - before
+    finally:
+        conn.close()
+
+
+def remote_columns(table: str = BQ_TABLE) -> set[str]:
+    """Columns BigQuery currently has for ``project.dataset.table``.
+
+    Columns are added to tbench_results by the first upload that writes them,
+    so a newer mirror can run ahead of the table. Raises BQError on failure.
+    """
+    project, dataset, name = table.split(".")
+    query = (
+        f"SELECT column_name FROM `{project}.{dataset}.INFORMATION_SCHEMA.COLUMNS`"
+        " WHERE table_name = @table_name"
+    )
+    output = run_bq(
+        [
+            "query",
+            "--use_legacy_sql=false",
+            "--format=csv",
+            "--max_rows=10000",
+            f"--parameter=table_name:STRING:{name}",
+            query,
+        ]
+    )
+    columns = {row["column_name"] for row in parse_bq_csv(output or "")}
+    if not columns:
+        raise BQError(f"no columns found for {table}")
+    return columns
+
+
+def sync(path: Path = MIRROR_PATH, full: bool = False, page_size: int = 50000) -> int:
+    """
+    Bring the mirror up to date with BigQuery.
+
+    Fetches rows with ``ingested_at >= watermark`` (the newest mirrored
+    timestamp). The bound is inclusive so rows sharing the watermark timestamp
+    that arrived after the last sync are picked up; duplicates are dropped by
+    row_key. ``full=True`` discards the mirror and re-fetches everything.
+
+    Columns BigQuery does not have yet are mirrored as NULL.
+
+    Returns the number of new rows.
+    """
+    try:
+        available = remote_columns()
+    except BQError:
+        print("Mirror sync failed: could not read the table's columns", file=sys.stderr)
+        return 0
+    missing = [c for c in MIRRORED_COLUMNS if c not in available]
+    if missing:
+        print(f"Not in BigQuery yet (NULL): {', '.join(missing)}", file=sys.stderr)
+
+    if full and path.exists():
+        path.unlink()
+    conn = connect(path)
+    watermark = get_meta(conn, "watermark")
+
+    # Timestamps are formatted as fixed-width ISO-8601 UTC so they sort
+    # lexicographically in SQLite and round-trip through TIMESTAMP().
+    select = ",\n        ".join(
+        f"FORMAT_TIMESTAMP('%Y-%m-%dT%H:%M:%E6SZ', {c}) AS {c}"
+        if c in TIMESTAMP_COLUMNS
+        else c
+        for c in MIRRORED_COLUMNS
+        if c in available
+    )
+    query = f"""
+    SELECT
+        {select}
+    FROM `{BQ_TABLE}`
+    {"WHERE ingested_at >= TIMESTAMP(@watermark)" if watermark else ""}
+    """
+    params = [f"--parameter=watermark:STRING:{watermark}"] if watermark else []
+
+    if watermark:
+        print(f"Syncing tbench_results since {watermark}...", file=sys.stderr)
+    else:
+        print("Downloading full tbench_results mirror...", file=sys.stderr)
+
+    added = 0
+    try:
+        for page in bq_query_pages(query, params, page_size):
+            rows = [
+                {c: _convert(c, row.get(c, "")) for c in MIRRORED_COLUMNS}
+                for row in page
+            ]
+            added += insert_rows(conn, rows)
+            conn.commit()
+    except BQError:
+        # Keep what was fetched but leave last_sync alone so the next run retries
+        conn.close()
+        print(f"Mirror sync incomplete ({added} row(s) added)", file=sys.stderr)
+        return added
+
+    newest = conn.execute("SELECT MAX(ingested_at) FROM tbench_results").fetchone()[0]
+    if newest:
+        set_meta(conn, "watermark", newest)
+    set_meta(conn, "last_sync", str(time.time()))
+    conn.commit()
+    conn.close()
+    print(f"Mirror sync added {added} row(s)", file=sys.stderr)
+    return added
+
+
+def sync_age_hours(path: Path = MIRROR_PATH) -> float | None:
+    """Hours since the last successful sync, or None if never synced."""
+    if not path.exists():
+        return None
+    conn = connect(path)
+    last_sync = get_meta(conn, "last_sync")
+    conn.close()
+    return (time.time() - float(last_sync)) / 3600 if last_sync else None
+
+
+def query_mux_counts(
+    path: Path = MIRROR_PATH,
+    dataset: str = "terminal-bench@2.0",
+    since: str | None = None,
+    until: str | None = None,
+    run_ids: list[str] | None = None,
+) -> list[dict]:
+    """
+    Per (task, model, thinking level) pass/attempt counts from the mirror.
+
+    Same shape as the aggregated BigQuery query in analyze_failure_rates.py:
+    task_id (trial hash stripped), model_name, thinking_level, n_passed,
+    n_total and n_incomplete. ``since``/``until`` are ISO dates or timestamps
+    (naive ones are UTC), compared in the mirror's stored form.
+    """
+    clauses = ["dataset = ?"]
+    params: list[object] = [dataset]
+    if since:
+        clauses.append("ingested_at >= ?")
+        params.append(format_timestamp(since))
+    if until:
+        clauses.append("ingested_at < ?")
+        params.append(format_timestamp(until))
+    if run_ids:
+        clauses.append(f"run_id IN ({', '.join('?' for _ in run_ids)})")
+        params.extend(run_ids)
+
+    conn = connect(path)
+    rows = conn.execute(
+        f"""
+        SELECT
+            task_name(task_id) AS task_id,
+            model_name,
+            thinking_level,
+            COALESCE(SUM(passed), 0) AS n_passed,
+            COUNT(passed) AS n_total,
+            SUM(passed IS NULL) AS n_incomplete
+        FROM tbench_results
+        WHERE {" AND ".join(clauses)}
+        GROUP BY 1, model_name, thinking_level
+        ORDER BY 1, model_name, thinking_level
+        """,
+        params,
+    ).fetchall()
+    conn.close()
+    # NULLs come back as None; the bq CSV path renders them as empty strings
+    return [{k: ("" if row[k] is None else row[k]) for k in row.keys()} for row in rows]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Maintain a local mirror of the tbench_results BigQuery table"
+    )
+    parser.add_argument(
+        "--path",
+        type=Path,
+        default=MIRROR_PATH,
+        help=f"Mirror database (default: {MIRROR_PATH})",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_parser = sub.add_parser("sync", help="Fetch rows newer than the watermark")
+    sync_parser.add_argument(
+        "--full", action="store_true", help="Discard the mirror and re-fetch all rows"
+    )
+    sub.add_parser("status", help="Show mirror size and watermark")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        sync(args.path, full=args.full)
+        return 0
+
+    if not args.path.exists():
+        print(f"No mirror at {args.path}; run 'sync' first")
+        return 1
+    conn = connect(args.path)
+    n_rows = conn.execute("SELECT COUNT(*) FROM tbench_results").fetchone()[0]
+    watermark = get_meta(conn, "watermark")
+    conn.close()
+    age = sync_age_hours(args.path)
+    print(f"Mirror:    {args.path} ({args.path.stat().st_size / 1e6:.1f} MB)")
+    print(f"Rows:      {n_rows}")
+    print(f"Watermark: {watermark or '-'}")
+    print(f"Last sync: {f'{age:.1f}h ago' if age is not None else 'never'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
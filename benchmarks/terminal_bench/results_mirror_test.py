@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from . import results_mirror
+
+
+def _row(
+    task_id: str, passed: int | None, ingested_at: str, run_id: str = "r1"
+) -> dict:
+    return {
+        "run_id": run_id,
+        "task_id": task_id,
+        "model_name": "anthropic/claude-opus-4-5",
+        "thinking_level": "high",
+        "dataset": "terminal-bench@2.0",
+        "passed": passed,
+        "ingested_at": ingested_at,
+    }
+
+
+def test_insert_is_idempotent_and_counts_strip_trial_hash(tmp_path: Path) -> None:
+    path = tmp_path / "mirror.sqlite"
+    rows = [
+        _row("chess-best-move__abc", 1, "2026-01-01T00:00:00.000000Z"),
+        _row("chess-best-move__def", 0, "2026-01-02T00:00:00.000000Z"),
+        _row("chess-best-move__ghi", None, "2026-01-02T00:00:00.000000Z"),
+    ]
+    conn = results_mirror.connect(path)
+    assert results_mirror.insert_rows(conn, rows) == 3
+    # Re-fetching from an inclusive watermark must not duplicate rows
+    assert results_mirror.insert_rows(conn, rows[1:]) == 0
+    conn.commit()
+    conn.close()
+
+    counts = results_mirror.query_mux_counts(path)
+    assert [
+        (c["task_id"], c["n_passed"], c["n_total"], c["n_incomplete"]) for c in counts
+    ] == [("chess-best-move", 1, 2, 1)]
+
+    windowed = results_mirror.query_mux_counts(path, since="2026-01-02")
+    assert [(c["n_passed"], c["n_total"]) for c in windowed] == [(0, 1)]
+    # Space separators and UTC offsets mean the same instants
+    for since, until in (
+        ("2026-01-01 12:00:00", "2026-01-02 00:00:00.000001"),
+        ("2026-01-01T14:00:00+02:00", "2026-01-01T19:00:01-05:00"),
+    ):
+        windowed = results_mirror.query_mux_counts(path, since=since, until=until)
+        assert [(c["n_passed"], c["n_total"]) for c in windowed] == [(0, 1)]
+
+
+def test_a_trial_seen_again_later_replaces_its_partial_row(tmp_path: Path) -> None:
+    path = tmp_path / "mirror.sqlite"
+    # Uploaded while the run was going: no job-level fields yet
+    partial = {
+        **_row("fix-git__abc", 1, "2026-01-01T00:00:00.000000Z"),
+        "dataset": None,
+    }
+    complete = _row("fix-git__abc", 1, "2026-01-01T01:00:00.000000Z")
+    conn = results_mirror.connect(path)
+    assert results_mirror.insert_rows(conn, [partial]) == 1
+    assert results_mirror.insert_rows(conn, [complete]) == 1
+    # An older version arriving late does not come back
+    assert results_mirror.insert_rows(conn, [partial]) == 0
+    conn.commit()
+    n_rows = conn.execute("SELECT COUNT(*) FROM tbench_results").fetchone()[0]
+    conn.close()
+    assert n_rows == 1
+    counts = results_mirror.query_mux_counts(path)
+    assert [(c["n_passed"], c["n_total"]) for c in counts] == [(1, 1)]
+
+
+def test_local_db_keeps_blobs_and_replaces_reuploads(tmp_path: Path) -> None:
+    path = tmp_path / "local.sqlite"
+    rows = [
+        {
+            **_row("fix-git__abc", True, "2026-01-02T03:04:05.5+00:00"),
+            "task_result_json": '{"passed": true}',
+        },
+        _row("fix-git__def", False, "2026-01-01T23:00:00-02:00"),
+    ]
+    assert results_mirror.append_rows(path, iter(rows)) == 2
+    assert results_mirror.append_rows(path, rows) == 2
+
+    conn = results_mirror.connect(path)
+    stored = conn.execute(
+        "SELECT row_key, ingested_at, task_result_json FROM tbench_results "
+        "ORDER BY row_key"
+    ).fetchall()
+    conn.close()
+    assert [tuple(r) for r in stored] == [
+        ("r1/fix-git__abc", "2026-01-02T03:04:05.500000Z", '{"passed": true}'),
+        ("r1/fix-git__def", "2026-01-02T01:00:00.000000Z", None),
+    ]
+    counts = results_mirror.query_mux_counts(path, since="2026-01-02")
+    assert [(c["task_id"], c["n_passed"], c["n_total"]) for c in counts] == [
+        ("fix-git", 1, 2)
+    ]
+
+
+def test_connect_adds_timing_columns_to_older_databases(tmp_path: Path) -> None:
+    path = tmp_path / "local.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE tbench_results (row_key TEXT PRIMARY KEY, run_id TEXT)")
+    conn.close()
+
+    row = {
+        **_row("fix-git__abc", True, "2026-01-02T00:00:00+00:00"),
+        "trial_started_at": "2026-01-01T23:50:00",
+        "trial_duration_sec": 600.0,
+        "agent_execution_sec": 420.5,
+    }
+    assert results_mirror.append_rows(path, [row]) == 1
+    conn = results_mirror.connect(path)
+    stored = conn.execute(
+        "SELECT trial_started_at, trial_duration_sec, agent_execution_sec, "
+        "verifier_sec FROM tbench_results"
+    ).fetchone()
+    conn.close()
+    assert tuple(stored) == ("2026-01-01T23:50:00.000000Z", 600.0, 420.5, None)
+
+
+def test_sync_selects_only_columns_bigquery_has(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # tbench_results before the timing columns were added
+    old = [c for c in results_mirror.COLUMNS if c != "verifier_sec"]
+    monkeypatch.setattr(
+        results_mirror,
+        "run_bq",
+        lambda args: "column_name\n" + "\n".join(old) + "\n",
+    )
+    queries = []
+
+    def pages(query: str, params: list[str], page_size: int):
+        queries.append(query)
+        yield [{**_row("fix-git__abc", "true", "2026-01-01T00:00:00.000000Z")}]
+
+    monkeypatch.setattr(results_mirror, "bq_query_pages", pages)
+    path = tmp_path / "mirror.sqlite"
+    assert results_mirror.sync(path) == 1
+    assert "agent_execution_sec" in queries[0]
+    assert "verifier_sec" not in queries[0]
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Size-capped, two-tier cache of downloaded Terminal-Bench run logs.
+
+The hot tier is the layout download_run_logs.py already uses: one extracted
+directory per run under ``.run_logs/<run-id>/``. Runs that have not been used
+for a while can be compacted into the cold tier, a single deflate-compressed
+zip per run under ``.run_logs/.packs/<run-id>.zip``. The zip's central
+directory is the member index, so one log can be read straight out of a pack
+without unpacking the run; a pack is extracted back to the hot tier when the
+whole run is needed again (instead of re-downloading it).
+
+Each use of a run is recorded in ``.run_logs/.cache_state.json``; when the
+cache (both tiers) is over its size cap, least-recently-used runs are deleted
+until it fits, and dropped from the ``search`` index. Artifact zips kept
+under ``<run-id>/.archives`` (download_run_logs.py --keep-archives) are packed
+too, stored without recompression.
+
+Usage:
+    # Size and tier of every cached run, least recently used first
+    python benchmarks/terminal_bench/run_cache.py status
+
+    # Pack all but the 3 most recently used runs
+    python benchmarks/terminal_bench/run_cache.py compact --keep-hot 3
+
+    # Delete least-recently-used runs until the cache is at most 20 GB
+    python benchmarks/terminal_bench/run_cache.py evict --max-size 20G
+
+    # Print one log from a packed run
+    python benchmarks/terminal_bench/run_cache.py cat 21230456195 \\
+        terminal-bench-results-opus/jobs/2026-01-16__00-15-05/fix-git__abc/agent/command-0/stderr.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from . import log_index
+    from .tbench_utils import ARCHIVE_DIR
+except ImportError:
+    import log_index  # type: ignore[import-not-found,no-redef]
+    from tbench_utils import ARCHIVE_DIR  # type: ignore[import-not-found,no-redef]
+
+# Same as download_run_logs.CACHE_DIR
+CACHE_DIR = Path(__file__).parent / ".run_logs"
+PACK_DIR = ".packs"
+STATE_FILE = ".cache_state.json"
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+@dataclass(slots=True)
+class CachedRun:
+    run_id: str
+    tier: str  # "hot" (extracted directory) or "packed"
+    size_bytes: int
+    last_access: float
+
+
+def parse_size(text: str) -> int:
+    """Bytes in a size like ``500M`` or ``20G`` (binary units)."""
+    value = text.strip().upper().removesuffix("B")
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ""
+    try:
+        return int(float(value.removesuffix(unit)) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"invalid size: {text!r}") from None
+
+
+def pack_path(cache_dir: Path, run_id: str) -> Path:
+    return cache_dir / PACK_DIR / f"{run_id}.zip"
+
+
+def _load_state(cache_dir: Path) -> dict[str, float]:
+    try:
+        return json.loads((cache_dir / STATE_FILE).read_text())["last_access"]
+    except (OSError, json.JSONDecodeError, KeyError):
+        return {}
+
+
+def _write_state(cache_dir: Path, last_access: dict[str, float]) -> None:
+    path = cache_dir / STATE_FILE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"last_access": last_access}, indent=2))
+    os.replace(tmp, path)
+
+
+def touch(cache_dir: Path, run_id: str) -> None:
+    """Record that a run was just used (for LRU eviction)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    state = _load_state(cache_dir)
+    state[run_id] = time.time()
+    _write_state(cache_dir, state)
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+def cached_runs(cache_dir: Path) -> list[CachedRun]:
+    """Every run in either tier, least recently used first.
+
+    Runs never recorded by touch() count as last used when they were written.
+    """
+    state = _load_state(cache_dir)
+    runs = []
+    if cache_dir.is_dir():
+        for path in cache_dir.iterdir():
+            if path.is_dir() and not path.name.startswith("."):
+                last = state.get(path.name, path.stat().st_mtime)
+                runs.append(CachedRun(path.name, "hot", _tree_size(path), last))
+    packs = cache_dir / PACK_DIR
+    if packs.is_dir():
+        for path in packs.glob("*.zip"):
+            stat = path.stat()
+            last = state.get(path.stem, stat.st_mtime)
+            runs.append(CachedRun(path.stem, "packed", stat.st_size, last))
+    return sorted(runs, key=lambda r: (r.last_access, r.run_id))
+
+
+def _drop_from_index(cache_dir: Path, run_id: str) -> None:
+    """Remove a run's rows from the log search index (its paths are gone)."""
+    if (cache_dir / log_index.INDEX_NAME).exists():
+        conn = log_index.connect(cache_dir)
+        try:
+            log_index.drop_run(conn, run_id)
+        finally:
+            conn.close()
+
+
+def pack_run(cache_dir: Path, run_id: str) -> Path:
+    """
+    Compress a hot run into its pack and remove the extracted directory.
+
+    The run is dropped from the search index, whose paths point into the
+    extracted directory; it is re-indexed once unpacked.
+    """
+    run_dir = cache_dir / run_id
+    target = pack_path(cache_dir, run_id)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".zip.tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+        for dirpath, dirnames, filenames in os.walk(run_dir):
+            # Extraction staging dirs are leftovers of an interrupted download
+            dirnames[:] = sorted(d for d in dirnames if not d.endswith(".partial"))
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                rel = path.relative_to(run_dir)
+                # Kept artifact zips are already compressed
+                stored = rel.parts[0] == ARCHIVE_DIR and name.endswith(".zip")
+                zf.write(
+                    path,
+                    rel.as_posix(),
+                    compress_type=zipfile.ZIP_STORED if stored else None,
+                )
+    # Keep the run's place in the LRU order if it was never touch()ed
+    mtime = run_dir.stat().st_mtime
+    os.utime(tmp, (mtime, mtime))
+    os.replace(tmp, target)
+    shutil.rmtree(run_dir)
+    _drop_from_index(cache_dir, run_id)
+    return target
+
+
+def unpack_run(cache_dir: Path, run_id: str) -> Path:
+    """Extract a packed run back into the hot tier and remove the pack."""
+    pack = pack_path(cache_dir, run_id)
+    staging = cache_dir / f".{run_id}.partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    with zipfile.ZipFile(pack) as zf:
+        zf.extractall(staging)
+    run_dir = cache_dir / run_id
+    staging.rename(run_dir)
+    pack.unlink()
+    return run_dir
+
+
+def ensure_hot(cache_dir: Path, run_id: str) -> Path:
+    """The run's hot directory, unpacking it first if only a pack exists."""
+    run_dir = cache_dir / run_id
+    if not run_dir.is_dir() and pack_path(cache_dir, run_id).exists():
+        unpack_run(cache_dir, run_id)
+    return run_dir
+
+
+def read_packed(cache_dir: Path, run_id: str, member: str) -> bytes:
+    """One file of a packed run, by its path relative to the run directory."""
+    with zipfile.ZipFile(pack_path(cache_dir, run_id)) as zf:
+        return zf.read(member)
+
+
+def delete_run(cache_dir: Path, run: CachedRun) -> None:
+    """Delete a run from its tier, the LRU state and the log search index."""
+    if run.tier == "hot":
+        shutil.rmtree(cache_dir / run.run_id, ignore_errors=True)
+    else:
+        pack_path(cache_dir, run.run_id).unlink(missing_ok=True)
+    _drop_from_index(cache_dir, run.run_id)
+    state = _load_state(cache_dir)
+    if state.pop(run.run_id, None) is not None:
+        _write_state(cache_dir, state)
+
+
+def compact(cache_dir: Path, keep_hot: int) -> list[CachedRun]:
+    """Pack every hot run except the ``keep_hot`` most recently used ones."""
+    hot = [r for r in cached_runs(cache_dir) if r.tier == "hot"]
+    to_pack = hot[: max(0, len(hot) - keep_hot)]
+    for run in to_pack:
+        pack_run(cache_dir, run.run_id)
+    return to_pack
+
+
+def enforce_limit(
+    cache_dir: Path, max_bytes: int, keep: tuple[str, ...] = ()
+) -> list[CachedRun]:
+    """Delete least-recently-used runs until the cache fits in ``max_bytes``.
+
+    Runs in ``keep`` (e.g. the one being inspected) are never deleted, even
+    if the cache stays over the cap. Returns the deleted runs.
+    """
+    runs = cached_runs(cache_dir)
+    total = sum(r.size_bytes for r in runs)
+    evicted = []
+    for run in runs:
+        if total <= max_bytes:
+            break
+        if run.run_id in keep:
+            continue
+        delete_run(cache_dir, run)
+        total -= run.size_bytes
+        evicted.append(run)
+    return evicted
+
+
+def _print_runs(runs: list[CachedRun]) -> None:
+    for r in runs:
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(r.last_access))
+        print(f"  {r.run_id:<14} {r.tier:<7} {r.size_bytes / 1e6:>10.1f} MB  {used}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage the run-log cache")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=CACHE_DIR,
+        help=f"Run-log cache (default: {CACHE_DIR})",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="List cached runs, least recently used first")
+    compact_parser = sub.add_parser("compact", help="Pack least recently used runs")
+    compact_parser.add_argument("--keep-hot", type=int, default=3)
+    evict = sub.add_parser("evict", help="Delete LRU runs until under a size cap")
+    evict.add_argument("--max-size", required=True, help="e.g. 500M, 20G")
+    cat = sub.add_parser("cat", help="Print one file of a cached run")
+    cat.add_argument("run_id")
+    cat.add_argument("member", help="Path relative to the run directory")
+    unpack = sub.add_parser("unpack", help="Extract a packed run back to the hot tier")
+    unpack.add_argument("run_id")
+    args = parser.parse_args()
+    cache_dir: Path = args.cache_dir
+
+    if args.command == "status":
+        runs = cached_runs(cache_dir)
+        _print_runs(runs)
+        total = sum(r.size_bytes for r in runs)
+        print(f"{len(runs)} run(s), {total / 1e6:.1f} MB in {cache_dir}")
+    elif args.command == "compact":
+        packed = compact(cache_dir, args.keep_hot)
+        for run in packed:
+            size = pack_path(cache_dir, run.run_id).stat().st_size
+            print(
+                f"Packed {run.run_id}: {run.size_bytes / 1e6:.1f} -> {size / 1e6:.1f} MB"
+            )
+    elif args.command == "evict":
+        try:
+            max_bytes = parse_size(args.max_size)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        evicted = enforce_limit(cache_dir, max_bytes)
+        print(f"Evicted {len(evicted)} run(s)")
+        _print_runs(evicted)
+    elif args.command == "cat":
+        run_dir = cache_dir / args.run_id
+        try:
+            if run_dir.is_dir():
+                data = (run_dir / args.member).read_bytes()
+            else:
+                data = read_packed(cache_dir, args.run_id, args.member)
+        except (OSError, KeyError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        touch(cache_dir, args.run_id)
+        sys.stdout.buffer.write(data)
+    elif args.command == "unpack":
+        if not pack_path(cache_dir, args.run_id).exists():
+            print(f"No pack for run {args.run_id}", file=sys.stderr)
+            return 1
+        print(unpack_run(cache_dir, args.run_id))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
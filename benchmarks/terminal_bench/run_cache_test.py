@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+
+from . import log_index, run_cache
+from .download_run_logs import find_trial_results
+
+LOG = "terminal-bench-results-opus/jobs/j/fix-git__abc/agent/command-0/stderr.txt"
+
+
+def _run(cache_dir: Path, run_id: str, log_bytes: int) -> Path:
+    run_dir = cache_dir / run_id
+    (run_dir / LOG).parent.mkdir(parents=True)
+    (run_dir / LOG).write_text("error: boom\n" * (log_bytes // 12))
+    (run_dir / ".download_manifest.json").write_text("{}")
+    (run_dir / ".archives").mkdir()
+    (run_dir / ".archives" / "terminal-bench-results-opus.zip").write_bytes(b"x" * 100)
+    return run_dir
+
+
+def test_pack_read_and_unpack_round_trip(tmp_path: Path) -> None:
+    run_dir = _run(tmp_path, "1", 120_000)
+    original = (run_dir / LOG).read_bytes()
+
+    pack = run_cache.pack_run(tmp_path, "1")
+    assert not run_dir.exists()
+    assert pack.stat().st_size < len(original) // 10
+    assert run_cache.read_packed(tmp_path, "1", LOG) == original
+    with zipfile.ZipFile(pack) as zf:
+        info = zf.getinfo(".archives/terminal-bench-results-opus.zip")
+        assert info.compress_type == zipfile.ZIP_STORED
+    assert [(r.run_id, r.tier) for r in run_cache.cached_runs(tmp_path)] == [
+        ("1", "packed")
+    ]
+
+    assert run_cache.ensure_hot(tmp_path, "1") == run_dir
+    assert (run_dir / LOG).read_bytes() == original
+    assert (run_dir / ".download_manifest.json").exists()
+    # Artifact zips kept with --keep-archives survive the round trip
+    archive = run_dir / ".archives" / "terminal-bench-results-opus.zip"
+    assert archive.read_bytes() == b"x" * 100
+    assert not run_cache.pack_path(tmp_path, "1").exists()
+
+
+def test_eviction_is_least_recently_used_and_spares_kept_runs(tmp_path: Path) -> None:
+    for run_id in ("1", "2", "3", "4"):
+        run_dir = _run(tmp_path, run_id, 10_000)
+        os.utime(run_dir, (1000 + int(run_id), 1000 + int(run_id)))
+    run_cache.touch(tmp_path, "1")
+    run_cache.pack_run(tmp_path, "3")
+    sizes = {r.run_id: r.size_bytes for r in run_cache.cached_runs(tmp_path)}
+
+    # LRU order: 2, 3 (packed), 4, then 1 (touched); 2 is kept
+    limit = sizes["1"] + sizes["2"] + 1
+    evicted = run_cache.enforce_limit(tmp_path, limit, keep=("2",))
+    assert [r.run_id for r in evicted] == ["3", "4"]
+    assert sorted(r.run_id for r in run_cache.cached_runs(tmp_path)) == ["1", "2"]
+    assert run_cache.parse_size("1.5K") == 1536
+    assert run_cache.parse_size("20GB") == 20 * 1024**3
+
+
+def test_packing_drops_the_run_from_the_search_index(tmp_path: Path) -> None:
+    run_dir = _run(tmp_path, "1", 1200)
+    (run_dir / LOG).parent.parent.parent.joinpath("result.json").write_text("{}")
+    conn = log_index.connect(tmp_path)
+    assert log_index.index_run(conn, run_dir, find_trial_results(run_dir)) == 1
+    assert len(log_index.search(conn, "boom")) == 1
+
+    run_cache.pack_run(tmp_path, "1")
+    assert log_index.search(conn, "boom") == []
+
+    # Re-indexed once the run is hot again
+    run_cache.ensure_hot(tmp_path, "1")
+    assert log_index.index_run(conn, run_dir, find_trial_results(run_dir)) == 1
+    conn.close()
@@ -0,0 +1,145 @@
+"""
+Compare two Terminal-Bench runs task by task.
+
+Trials are aggregated per (model, task) -- pass count, attempts, mean token
+usage and mean duration -- from the trial records of
+download_run_logs.find_trial_results(), which only need the result.json
+files (a lazy results-only fetch or the cached trial index). A task whose
+pass count changed between the runs is a flip: a regression if it now passes
+less often, a fix if more.
+
+Used by ``download_run_logs.py diff``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Display order of TaskDiff.status values
+STATUSES = ("regressed", "fixed", "added", "removed", "unchanged")
+
+
+@dataclass(slots=True)
+class TaskStats:
+    """Outcome of one task for one model in a run."""
+
+    passes: int = 0
+    attempts: int = 0
+    input_tokens: float | None = None
+    output_tokens: float | None = None
+    duration_sec: float | None = None
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passes / self.attempts if self.attempts else 0.0
+
+
+@dataclass(slots=True)
+class TaskDiff:
+    model: str
+    task: str
+    before: TaskStats | None
+    after: TaskStats | None
+
+    @property
+    def status(self) -> str:
+        """One of STATUSES."""
+        if self.before is None:
+            return "added"
+        if self.after is None:
+            return "removed"
+        if self.after.pass_rate < self.before.pass_rate:
+            return "regressed"
+        if self.after.pass_rate > self.before.pass_rate:
+            return "fixed"
+        return "unchanged"
+
+    def delta(self, field: str) -> float | None:
+        if self.before is None or self.after is None:
+            return None
+        a, b = getattr(self.before, field), getattr(self.after, field)
+        return None if a is None or b is None else b - a
+
+
+def _mean(values: list) -> float | None:
+    present = [v for v in values if v is not None]
+    return sum(present) / len(present) if present else None
+
+
+def summarize_trials(trials: Iterable[dict]) -> dict[tuple[str, str], TaskStats]:
+    """Aggregate trial records per (model, task)."""
+    grouped: dict[tuple[str, str], list[dict]] = {}
+    for trial in trials:
+        model = (trial.get("artifact") or "unknown").replace(
+            "terminal-bench-results-", ""
+        )
+        grouped.setdefault((model, trial["task_name"]), []).append(trial)
+    return {
+        key: TaskStats(
+            passes=sum(1 for t in group if t["passed"]),
+            attempts=len(group),
+            input_tokens=_mean([t.get("n_input_tokens") for t in group]),
+            output_tokens=_mean([t.get("n_output_tokens") for t in group]),
+            duration_sec=_mean([t.get("duration_sec") for t in group]),
+        )
+        for key, group in grouped.items()
+    }
+
+
+def diff_runs(
+    before: dict[tuple[str, str], TaskStats],
+    after: dict[tuple[str, str], TaskStats],
+) -> list[TaskDiff]:
+    """Per-task differences, sorted by model and task."""
+    return [
+        TaskDiff(model, task, before.get((model, task)), after.get((model, task)))
+        for model, task in sorted(before.keys() | after.keys())
+    ]
+
+
+def _fmt_stats(stats: TaskStats | None) -> str:
+    return f"{stats.passes}/{stats.attempts}" if stats else "-"
+
+
+def _fmt_delta(value: float | None, unit: str = "") -> str:
+    if value is None:
+        return "-"
+    return f"{value:+,.0f}{unit}"
+
+
+def print_diff(
+    diffs: list[TaskDiff], run_a: str, run_b: str, show_all: bool = False
+) -> None:
+    """Per model: pass totals, then flipped tasks with token and duration deltas."""
+    print(f"Diff {run_a} -> {run_b}")
+    models = sorted({d.model for d in diffs})
+    for model in models:
+        rows = [d for d in diffs if d.model == model]
+        shown = [d for d in rows if show_all or d.status != "unchanged"]
+        before = sum(d.before.passes for d in rows if d.before)
+        after = sum(d.after.passes for d in rows if d.after)
+        counts = {
+            status: sum(1 for d in rows if d.status == status) for status in STATUSES
+        }
+        print(
+            f"\n{model}: {before} -> {after} passed "
+            f"({counts['regressed']} regressed, {counts['fixed']} fixed"
+            + (f", {counts['added']} added" if counts["added"] else "")
+            + (f", {counts['removed']} removed" if counts["removed"] else "")
+            + ")"
+        )
+        if not shown:
+            continue
+        print(
+            f"  {'status':<10} {'task':<40} {'pass':>9} {'Δ in tok':>11} "
+            f"{'Δ out tok':>10} {'Δ time':>8}"
+        )
+        for d in sorted(shown, key=lambda d: (STATUSES.index(d.status), d.task)):
+            passes = f"{_fmt_stats(d.before)}→{_fmt_stats(d.after)}"
+            print(
+                f"  {d.status:<10} {d.task[:40]:<40} {passes:>9} "
+                f"{_fmt_delta(d.delta('input_tokens')):>11} "
+                f"{_fmt_delta(d.delta('output_tokens')):>10} "
+                f"{_fmt_delta(d.delta('duration_sec'), 's'):>8}"
+            )
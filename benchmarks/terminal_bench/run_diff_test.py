@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from . import run_diff
+from .download_run_logs import find_trial_results
+
+
+def _run(root: Path, run_id: str, trials: dict[str, tuple[float, int, int]]) -> Path:
+    """trials: trial dir -> (reward, input tokens, duration seconds)."""
+    run_dir = root / run_id
+    job_dir = run_dir / "terminal-bench-results-opus" / "jobs" / "2026-01-16__00-15-05"
+    for name, (reward, tokens, seconds) in trials.items():
+        (job_dir / name).mkdir(parents=True)
+        result = {
+            "verifier_result": {"rewards": {"reward": reward}},
+            "agent_result": {"n_input_tokens": tokens, "n_output_tokens": 10},
+            "started_at": "2026-01-16T00:15:05Z",
+            "finished_at": f"2026-01-16T00:{15 + seconds // 60:02d}:{5 + seconds % 60:02d}Z",
+        }
+        (job_dir / name / "result.json").write_text(json.dumps(result))
+    return run_dir
+
+
+def test_diff_reports_flips_and_usage_deltas(tmp_path: Path) -> None:
+    before = _run(
+        tmp_path,
+        "1",
+        {
+            "fix-git__a": (1.0, 1000, 60),
+            "chess__a": (0.0, 5000, 300),
+            "chess__b": (1.0, 3000, 100),
+            "gone__a": (1.0, 10, 1),
+        },
+    )
+    after = _run(
+        tmp_path,
+        "2",
+        {
+            "fix-git__c": (0.0, 4000, 180),
+            "chess__c": (1.0, 2000, 50),
+            "chess__d": (1.0, 2000, 50),
+            "new__a": (0.0, 10, 1),
+        },
+    )
+
+    diffs = run_diff.diff_runs(
+        run_diff.summarize_trials(find_trial_results(before)),
+        run_diff.summarize_trials(find_trial_results(after)),
+    )
+    by_task = {d.task: d for d in diffs}
+    assert {t: d.status for t, d in by_task.items()} == {
+        "chess": "fixed",
+        "fix-git": "regressed",
+        "gone": "removed",
+        "new": "added",
+    }
+    assert by_task["fix-git"].delta("input_tokens") == 3000
+    assert by_task["fix-git"].delta("duration_sec") == 120
+    # Means over attempts: 1/2 -> 2/2 passes, 4000 -> 2000 tokens, 200s -> 50s
+    assert (by_task["chess"].before.passes, by_task["chess"].after.passes) == (1, 2)
+    assert by_task["chess"].delta("input_tokens") == -2000
+    assert by_task["chess"].delta("duration_sec") == -150
+    assert by_task["new"].delta("input_tokens") is None
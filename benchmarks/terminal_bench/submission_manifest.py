@@ -0,0 +1,355 @@
+"""
+Incremental builds of leaderboard submission directories.
+
+Each submission directory (``submissions/terminal-bench/2.0/<agent>__<model>``)
+has a manifest under ``<output-dir>/.submission_manifests/`` -- outside the
+tree that ``hf upload`` pushes -- recording, for every file, the SHA-256 of
+its content, its CRC-32 and the size/mtime of the source it came from. A
+rebuild hashes only sources whose size or mtime changed, and then adds,
+replaces or deletes just the files whose content hash differs, so re-running
+after fixing one model's metadata or adding one model leaves every other
+trial untouched. The resulting SubmissionChanges is what an incremental
+upload has to push.
+
+Sources can also be members of the downloaded artifact zips (ArchiveMember).
+Their CRC-32 and size come from the zip directory, so an unchanged member is
+recognized without decompressing it; a changed one is hashed while it is
+streamed into place.
+
+The manifest also backs the size report (bytes per file kind, bytes in
+duplicate files) and deduplication, which hardlinks files with identical
+content within a submission.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+import zlib
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MANIFEST_DIR = ".submission_manifests"
+MANIFEST_VERSION = 2
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveMember:
+    """A file inside an artifact zip, streamed out of the archive when placed."""
+
+    archive: zipfile.ZipFile
+    info: zipfile.ZipInfo
+
+
+Source = Path | bytes | ArchiveMember
+
+
+@dataclass(slots=True)
+class SubmissionChanges:
+    """Files and trials changed by one sync, relative to the submission dir."""
+
+    name: str
+    uploaded: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    upload_bytes: int = 0
+    trials_added: list[str] = field(default_factory=list)
+    trials_replaced: list[str] = field(default_factory=list)
+    trials_removed: list[str] = field(default_factory=list)
+    trials_unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.uploaded or self.deleted)
+
+
+def manifest_path(output_dir: Path, submission_name: str) -> Path:
+    return output_dir / MANIFEST_DIR / f"{submission_name}.json"
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _write_manifest(path: Path, files: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps({"version": MANIFEST_VERSION, "files": files}, sort_keys=True)
+    )
+    os.replace(tmp, path)
+
+
+def _hash_file(path: Path) -> tuple[str, int]:
+    """(SHA-256, CRC-32) of a file, in one read."""
+    digest = hashlib.sha256()
+    crc = 0
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return digest.hexdigest(), crc
+
+
+def _extract_member(member: ArchiveMember, dst: Path) -> str:
+    """Stream a zip member to dst; returns its SHA-256."""
+    digest = hashlib.sha256()
+    with member.archive.open(member.info) as src, dst.open("wb") as out:
+        while chunk := src.read(CHUNK_SIZE):
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+def _trial_of(rel: str) -> str | None:
+    """``<job>/<trial>`` for files inside a trial directory, else None."""
+    parts = rel.split("/")
+    return "/".join(parts[:2]) if len(parts) > 2 else None
+
+
+def sync_submission(
+    submission_dir: Path,
+    sources: dict[str, Source],
+    manifest_file: Path,
+    copy: Callable[[Path, Path], object],
+    pool: Executor,
+) -> SubmissionChanges:
+    """
+    Make submission_dir hold exactly ``sources``, touching only what changed.
+
+    ``sources`` maps paths relative to submission_dir to a source file, a
+    zip member or generated content (e.g. metadata.yaml). Source files are
+    placed with ``copy(src, dst)`` (a FileCopier.copy), zip members are
+    streamed out of their archive; both on ``pool``. Files in the directory
+    that are not in ``sources`` are deleted.
+    """
+    previous = load_manifest(manifest_file)
+    changes = SubmissionChanges(submission_dir.name)
+
+    def entry_for(item: tuple[str, Source]) -> tuple[str, dict]:
+        rel, src = item
+        old = previous.get(rel, {})
+        if isinstance(src, bytes):
+            return rel, {
+                "src": None,
+                "size": len(src),
+                "crc32": zlib.crc32(src),
+                "sha256": hashlib.sha256(src).hexdigest(),
+            }
+        if isinstance(src, ArchiveMember):
+            # The zip directory has size and CRC; the SHA-256 of a changed
+            # member is filled in when it is extracted
+            entry = {
+                "src": f"{src.archive.filename}:{src.info.filename}",
+                "size": src.info.file_size,
+                "crc32": src.info.CRC,
+            }
+            same = all(old.get(k) == entry[k] for k in ("size", "crc32"))
+            entry["sha256"] = old["sha256"] if same else None
+            return rel, entry
+        stat = src.stat()
+        entry = {"src": str(src), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if all(old.get(k) == entry[k] for k in ("src", "size", "mtime_ns")):
+            entry["sha256"], entry["crc32"] = old["sha256"], old.get("crc32")
+        else:
+            entry["sha256"], entry["crc32"] = _hash_file(src)
+        return rel, entry
+
+    current = dict(pool.map(entry_for, sources.items()))
+
+    def is_current(rel: str) -> bool:
+        old = previous.get(rel)
+        sha256 = current[rel]["sha256"]
+        if not old or sha256 is None or old["sha256"] != sha256:
+            return False
+        try:
+            return (submission_dir / rel).stat().st_size == current[rel]["size"]
+        except OSError:
+            return False
+
+    stale = [rel for rel in current if not is_current(rel)]
+
+    def place(rel: str) -> None:
+        dst = submission_dir / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        src = sources[rel]
+        if isinstance(src, Path):
+            copy(src, dst)
+            return
+        dst.unlink(missing_ok=True)
+        if isinstance(src, bytes):
+            dst.write_bytes(src)
+        else:
+            current[rel]["sha256"] = _extract_member(src, dst)
+
+    list(pool.map(place, stale))
+    changes.uploaded = sorted(stale)
+    changes.upload_bytes = sum(current[rel]["size"] for rel in stale)
+
+    # Anything else in the directory (dropped trials, files of pre-manifest
+    # builds) goes, so the tree matches what an upload should contain
+    on_disk = (
+        p.relative_to(submission_dir).as_posix()
+        for p in submission_dir.rglob("*")
+        if not p.is_dir()
+    )
+    for rel in sorted(set(on_disk) - current.keys()):
+        (submission_dir / rel).unlink()
+        changes.deleted.append(rel)
+    for d in sorted(
+        (p for p in submission_dir.rglob("*") if p.is_dir()),
+        key=lambda p: len(p.parts),
+        reverse=True,
+    ):
+        if not any(d.iterdir()):
+            d.rmdir()
+
+    before_trials = {_trial_of(rel) for rel in previous} - {None}
+    after_trials = {_trial_of(rel) for rel in current} - {None}
+    touched = {_trial_of(rel) for rel in [*changes.uploaded, *changes.deleted]}
+    changes.trials_added = sorted(after_trials - before_trials)
+    changes.trials_removed = sorted(before_trials - after_trials)
+    changes.trials_replaced = sorted((after_trials & before_trials) & touched)
+    changes.trials_unchanged = (
+        len(after_trials) - len(changes.trials_added) - len(changes.trials_replaced)
+    )
+    _write_manifest(manifest_file, current)
+    return changes
+
+
+def print_changes(changes: SubmissionChanges, limit: int = 20) -> None:
+    """Summary of one sync in terms of what an incremental upload pushes."""
+    print(
+        f"  {changes.name}: {len(changes.trials_added)} trial(s) added, "
+        f"{len(changes.trials_replaced)} replaced, {len(changes.trials_removed)} "
+        f"removed, {changes.trials_unchanged} unchanged"
+    )
+    if not changes.changed:
+        print("    nothing to upload")
+        return
+    print(
+        f"    upload {len(changes.uploaded)} file(s) "
+        f"({changes.upload_bytes / 1e6:.1f} MB), delete {len(changes.deleted)}"
+    )
+    trial_lines = [
+        *(f"+ {t}" for t in changes.trials_added),
+        *(f"~ {t}" for t in changes.trials_replaced),
+        *(f"- {t}" for t in changes.trials_removed),
+    ]
+    other = [
+        f"{'-' if rel in changes.deleted else '~'} {rel}"
+        for rel in [*changes.uploaded, *changes.deleted]
+        if _trial_of(rel) is None
+    ]
+    lines = other + trial_lines
+    for line in lines[:limit]:
+        print(f"    {line}")
+    if len(lines) > limit:
+        print(f"    ... and {len(lines) - limit} more")
+
+
+def file_kind(rel: str) -> str:
+    """
+    What a file is, independent of job, trial and numbering.
+
+    ``<job>/<trial>/agent/command-3/stdout.txt`` -> ``agent/command-N/stdout.txt``;
+    job-level files become ``job/<name>``.
+    """
+    parts = rel.split("/")
+    if len(parts) == 1:
+        return rel
+    kind = "/".join(parts[2:]) if len(parts) > 2 else f"job/{parts[1]}"
+    return re.sub(r"\d+", "N", kind)
+
+
+@dataclass(slots=True)
+class SizeReport:
+    total_bytes: int = 0
+    files: int = 0
+    duplicate_bytes: int = 0
+    # kind -> (files, bytes)
+    kinds: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+def size_report(files: dict[str, dict]) -> SizeReport:
+    """Sizes by file kind and the bytes a content dedupe would save."""
+    report = SizeReport(files=len(files))
+    kind_files: Counter[str] = Counter()
+    kind_bytes: Counter[str] = Counter()
+    seen: set[str] = set()
+    for rel, entry in files.items():
+        size = entry["size"]
+        report.total_bytes += size
+        kind = file_kind(rel)
+        kind_files[kind] += 1
+        kind_bytes[kind] += size
+        if entry.get("sha256") in seen:
+            report.duplicate_bytes += size
+        elif entry.get("sha256"):
+            seen.add(entry["sha256"])
+    report.kinds = {
+        kind: (kind_files[kind], size) for kind, size in kind_bytes.most_common()
+    }
+    return report
+
+
+def print_size_report(name: str, report: SizeReport, limit: int = 10) -> None:
+    """Largest contributors to a submission's size, by file kind."""
+    print(
+        f"  {name}: {report.total_bytes / 1e6:.1f} MB in {report.files} file(s), "
+        f"{report.duplicate_bytes / 1e6:.1f} MB in duplicates"
+    )
+    for kind, (count, size) in list(report.kinds.items())[:limit]:
+        share = size / report.total_bytes if report.total_bytes else 0.0
+        print(f"    {size / 1e6:>9.1f} MB {share:>6.1%} {count:>6}  {kind}")
+    if len(report.kinds) > limit:
+        print(f"    ... and {len(report.kinds) - limit} more kind(s)")
+
+
+def dedupe_files(submission_dir: Path, files: dict[str, dict]) -> tuple[int, int]:
+    """
+    Hardlink files with identical content (per the manifest) to one copy.
+
+    Uploads see regular files, so this only saves local disk and the bytes
+    read by the upload. Rebuilds replace files instead of writing through
+    them, so a shared inode is never modified in place. Returns the number
+    of files linked and the bytes saved.
+    """
+    groups: dict[str, list[str]] = {}
+    for rel, entry in files.items():
+        if entry["size"] and entry.get("sha256"):
+            groups.setdefault(entry["sha256"], []).append(rel)
+    linked = saved = 0
+    for rels in groups.values():
+        if len(rels) < 2:
+            continue
+        first, *rest = sorted(rels)
+        keep = submission_dir / first
+        keep_stat = keep.stat()
+        for rel in rest:
+            path = submission_dir / rel
+            stat = path.stat()
+            if (stat.st_dev, stat.st_ino) == (keep_stat.st_dev, keep_stat.st_ino):
+                continue
+            tmp = path.with_name(f".{path.name}.dedupe")
+            tmp.unlink(missing_ok=True)
+            try:
+                os.link(keep, tmp)
+            except OSError:
+                return linked, saved  # no hardlinks on this filesystem
+            os.replace(tmp, path)
+            linked += 1
+            saved += files[rel]["size"]
+    return linked, saved
@@ -9,10 +9,28 @@ This module consolidates common functionality used by:
 
 from __future__ import annotations
 
+import csv
+import functools
 import json
+import os
+import shutil
 import subprocess
 import sys
-from pathlib import Path
+import time
+import urllib.error
+import urllib.request
+import uuid
+import zipfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+
+try:
+    from .remote_zip import RemoteZip
+except ImportError:
+    from remote_zip import RemoteZip  # type: ignore[import-not-found,no-redef]
 
 # GitHub repository for fetching artifacts
 GITHUB_REPO = "coder/unix"
@@ -20,6 +38,18 @@ GITHUB_REPO = "coder/unix"
 # Smoke test model - excluded from submissions by default
 SMOKE_TEST_MODEL = "anthropic/claude-sonnet-4-5"
 
+# Artifact download bookkeeping (see download_run_artifacts)
+DOWNLOAD_MANIFEST = ".download_manifest.json"
+ARCHIVE_DIR = ".archives"
+DOWNLOAD_WORKERS = 4
+# Heavy per-trial payloads that a lazy download fetches only on demand
+TRIAL_PAYLOAD_DIRS = ("agent", "verifier")
+
+# Results written by scripts/upload-tbench-results.py: the view over the old
+# tbench_results table and the normalized tables CI uploads to (trials show up
+# there while a run is still going)
+BQ_TABLE = "unix-benchmarks.benchmarks.tbench_results_compat"
+
 
 def run_command(
     cmd: list[str], check: bool = True, verbose: bool = False
@@ -36,6 +66,87 @@ def run_command(
     return subprocess.run(cmd, capture_output=True, text=True, check=check)
 
 
+class BQError(RuntimeError):
+    """A bq CLI invocation failed (details were already printed to stderr)."""
+
+
+class ArtifactFetchError(RuntimeError):
+    """Reading members of a remote artifact zip failed."""
+
+
+def run_bq(args: list[str]) -> str | None:
+    """Run a bq CLI command, returning stdout or None (after printing) on error."""
+    try:
+        result = subprocess.run(
+            ["bq", *args], capture_output=True, text=True, check=True
+        )
+    except FileNotFoundError:
+        print(
+            "Error: bq CLI not found. Install Google Cloud SDK and run 'gcloud auth login'",
+            file=sys.stderr,
+        )
+        return None
+    except subprocess.CalledProcessError as e:
+        print(f"BigQuery error: {e.stderr}", file=sys.stderr)
+        return None
+    return result.stdout
+
+
+def parse_bq_csv(output: str) -> list[dict[str, str]]:
+    """Parse ``bq --format=csv`` output into row dicts (empty if no rows)."""
+    lines = output.strip().split("\n")
+    if len(lines) < 2:
+        return []
+    return list(csv.DictReader(lines))
+
+
+def bq_query_pages(
+    query: str, params: list[str], page_size: int
+) -> Iterator[list[dict[str, str]]]:
+    """
+    Run a query once, then page through its result table with ``bq head``.
+
+    Avoids the silent truncation of ``bq query --max_rows``: the query job's
+    destination table is read in ``page_size`` slices until it is exhausted.
+    Raises BQError if the query or any page fetch fails, so callers never
+    mistake a partial read for a complete one.
+    """
+    job_id = f"tbench_analysis_{uuid.uuid4().hex}"
+    submitted = run_bq(
+        [
+            "query",
+            "--use_legacy_sql=false",
+            f"--job_id={job_id}",
+            "--max_rows=0",
+            *params,
+            query,
+        ]
+    )
+    if submitted is None:
+        raise BQError("query failed")
+
+    start = 0
+    while True:
+        output = run_bq(
+            [
+                "--format=csv",
+                "head",
+                "-j",
+                f"--start_row={start}",
+                f"--max_rows={page_size}",
+                job_id,
+            ]
+        )
+        if output is None:
+            raise BQError(f"fetching rows {start}+ failed")
+        rows = parse_bq_csv(output)
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
 def get_passed(data: dict) -> bool | None:
     """Extract pass/fail status from Terminal-Bench result data.
 
@@ -61,6 +172,28 @@ def get_passed(data: dict) -> bool | None:
     return None
 
 
+def get_token_counts(data: dict) -> tuple[int | None, int | None]:
+    """(input, output) token counts of a trial result, top-level or agent_result."""
+    agent_result = data.get("agent_result") or {}
+    n_input = data.get("n_input_tokens")
+    n_output = data.get("n_output_tokens")
+    if n_input is None:
+        n_input = agent_result.get("n_input_tokens")
+    if n_output is None:
+        n_output = agent_result.get("n_output_tokens")
+    return n_input, n_output
+
+
+def get_duration_sec(data: dict) -> float | None:
+    """Wall-clock seconds of a trial from its started_at/finished_at timestamps."""
+    try:
+        started = datetime.fromisoformat(data["started_at"].replace("Z", "+00:00"))
+        finished = datetime.fromisoformat(data["finished_at"].replace("Z", "+00:00"))
+    except (KeyError, AttributeError, ValueError):
+        return None
+    return (finished - started).total_seconds()
+
+
 def extract_task_id(folder_name: str) -> str:
     """Extract task ID from a trial folder name.
 
@@ -70,6 +203,39 @@ def extract_task_id(folder_name: str) -> str:
     return folder_name.rsplit("__", 1)[0] if "__" in folder_name else folder_name
 
 
+def tail_lines(
+    path: Path,
+    n: int,
+    block_size: int = 64 * 1024,
+    max_bytes: int = 1024 * 1024,
+) -> list[str]:
+    """Last n lines of a text file, read backwards from the end in blocks.
+
+    Equivalent to ``path.read_text().strip().split("\\n")[-n:]`` (an empty
+    list for a blank file) but only reads the blocks that hold those lines, so
+    the cost does not depend on the size of the log. At most ``max_bytes``
+    are read; if the lines are longer than that, the first one is cut.
+    """
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            # Trailing whitespace is stripped, so it never counts as a line
+            if not data.rstrip():
+                data = b""
+                continue
+            if data.rstrip().count(b"\n") >= n or len(data) >= max_bytes:
+                break
+    text = data.rstrip().decode("utf-8", errors="replace")
+    if pos == 0:
+        text = text.lstrip()
+    return text.split("\n")[-n:] if text else []
+
+
 def list_nightly_runs(
     limit: int = 10, status: str | None = None, verbose: bool = False
 ) -> list[dict]:
@@ -138,52 +304,433 @@ def list_artifacts_for_run(
     return artifacts
 
 
+def load_download_manifest(output_dir: Path) -> dict[str, dict]:
+    """Per-artifact completion records written by download_run_artifacts."""
+    try:
+        data = json.loads((output_dir / DOWNLOAD_MANIFEST).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data.get("artifacts", {})
+
+
+def run_download_complete(output_dir: Path) -> bool:
+    """Whether every artifact of the run (smoke test included) was downloaded.
+
+    Set by download_run_artifacts, so a complete run can be reused without
+    listing its artifacts again.
+    """
+    try:
+        data = json.loads((output_dir / DOWNLOAD_MANIFEST).read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    return data.get("complete") is True
+
+
+def _write_download_manifest(
+    output_dir: Path, run_id: int, entries: dict[str, dict], complete: bool = False
+) -> None:
+    # Write-then-rename so an interrupted write never corrupts the manifest
+    path = output_dir / DOWNLOAD_MANIFEST
+    tmp = path.with_suffix(".tmp")
+    data = {"run_id": run_id, "complete": complete, "artifacts": entries}
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def artifact_is_complete(
+    output_dir: Path, artifact: dict, manifest: dict[str, dict], tier: str = "full"
+) -> bool:
+    """Whether an artifact was fully downloaded and extracted into output_dir.
+
+    With ``tier="results"``, an artifact whose trial result.json files were
+    fetched by fetch_run_results also counts.
+    """
+    entry = manifest.get(artifact["name"])
+    return (
+        entry is not None
+        and (tier == "results" or entry.get("tier", "full") == "full")
+        and entry.get("id") == artifact["id"]
+        and entry.get("size_in_bytes") == artifact["size_in_bytes"]
+        and (output_dir / artifact["name"]).is_dir()
+    )
+
+
+def fetch_artifact_archive(
+    artifact: dict, archive_dir: Path, verbose: bool = False
+) -> Path | None:
+    """Download one artifact zip to ``archive_dir/<name>.zip`` without extracting.
+
+    The download goes to a ``.zip.part`` file and is only renamed into place
+    once it matches ``size_in_bytes``; a previously verified zip is reused.
+    Returns None (after printing) on failure.
+    """
+    name = artifact["name"]
+    archive = archive_dir / f"{name}.zip"
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    if not (archive.exists() and archive.stat().st_size == artifact["size_in_bytes"]):
+        partial = archive.with_suffix(".zip.part")
+        cmd = [
+            "gh",
+            "api",
+            f"repos/{GITHUB_REPO}/actions/artifacts/{artifact['id']}/zip",
+        ]
+        if verbose:
+            print(f"  Running: {' '.join(cmd)} > {partial}")
+        with partial.open("wb") as f:
+            result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, check=False)
+        if result.returncode != 0:
+            print(
+                f"Error downloading {name}: {result.stderr.decode(errors='replace')}",
+                file=sys.stderr,
+            )
+            return None
+        size = partial.stat().st_size
+        if size != artifact["size_in_bytes"]:
+            print(
+                f"Error downloading {name}: got {size} bytes, "
+                f"expected {artifact['size_in_bytes']}",
+                file=sys.stderr,
+            )
+            return None
+        os.replace(partial, archive)
+    return archive
+
+
+def download_artifact(
+    artifact: dict,
+    output_dir: Path,
+    verbose: bool = False,
+    keep_archive: bool = False,
+) -> bool:
+    """Download one artifact zip, verify its size and extract it.
+
+    The zip is fetched into ``output_dir/.archives/<name>.zip`` (see
+    fetch_artifact_archive); it is then extracted to a staging directory and
+    renamed to ``output_dir/<name>`` so a crash never leaves a half-extracted
+    artifact that looks complete. The zip is deleted once extracted unless
+    ``keep_archive`` is set (the download manifest records completion).
+    """
+    name = artifact["name"]
+    archive = fetch_artifact_archive(artifact, output_dir / ARCHIVE_DIR, verbose)
+    if archive is None:
+        return False
+
+    staging = output_dir / f".{name}.partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            zf.extractall(staging)
+    except zipfile.BadZipFile as e:
+        print(f"Error extracting {name}: {e}", file=sys.stderr)
+        archive.unlink(missing_ok=True)
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+    target = output_dir / name
+    shutil.rmtree(target, ignore_errors=True)
+    staging.rename(target)
+    if not keep_archive:
+        archive.unlink(missing_ok=True)
+    return True
+
+
 def download_run_artifacts(
     run_id: int,
     output_dir: Path,
     artifact_names: list[str] | None = None,
     include_smoke_test: bool = False,
     verbose: bool = False,
+    workers: int = DOWNLOAD_WORKERS,
+    keep_archives: bool = False,
 ) -> bool:
-    """Download terminal-bench artifacts for a run.
+    """Download terminal-bench artifacts for a run, resuming earlier attempts.
+
+    Artifacts are fetched concurrently (at most ``workers`` at a time). Each
+    one that is verified and extracted is recorded in
+    ``output_dir/.download_manifest.json``; artifacts already recorded with a
+    matching id and size are skipped, so calling this again after an
+    interrupted or partially failed download only fetches what is missing.
 
     Args:
         run_id: GitHub Actions run ID
-        output_dir: Directory to download artifacts to
+        output_dir: Directory to download artifacts to (one subdirectory each)
         artifact_names: Specific artifact names to download, or None for all
         include_smoke_test: If True, include smoke test artifact (for log inspection)
         verbose: If True, print commands being run
+        workers: Maximum number of concurrent downloads
+        keep_archives: If True, keep the artifact zips in ``output_dir/.archives``
 
     Returns:
-        True if download succeeded, False otherwise
+        True if every requested artifact is complete, False otherwise. Once
+        all artifacts of the run are complete (``artifact_names`` is None and
+        ``include_smoke_test`` is set), the manifest marks the run complete
+        (see run_download_complete).
     """
-    if artifact_names is None:
-        artifacts = list_artifacts_for_run(
-            run_id, include_smoke_test=include_smoke_test, verbose=verbose
+    artifacts = list_artifacts_for_run(
+        run_id,
+        include_smoke_test=include_smoke_test or artifact_names is not None,
+        verbose=verbose,
+    )
+    if artifact_names is not None:
+        artifacts = [a for a in artifacts if a["name"] in artifact_names]
+    if not artifacts:
+        print(f"No artifacts found for run {run_id}", file=sys.stderr)
+        return False
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_download_manifest(output_dir)
+    whole_run = artifact_names is None and include_smoke_test
+    pending = [
+        a for a in artifacts if not artifact_is_complete(output_dir, a, manifest)
+    ]
+    if not pending:
+        if whole_run and not run_download_complete(output_dir):
+            _write_download_manifest(output_dir, run_id, manifest, complete=True)
+        if verbose:
+            print(f"All {len(artifacts)} artifact(s) already in {output_dir}")
+        return True
+    if verbose:
+        print(
+            f"Downloading {len(pending)} of {len(artifacts)} artifact(s) "
+            f"to {output_dir}..."
         )
-        if not artifacts:
-            print(f"No artifacts found for run {run_id}", file=sys.stderr)
-            return False
-        artifact_names = [a["name"] for a in artifacts]
 
+    ok = True
+    remaining = len(pending)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(download_artifact, a, output_dir, verbose, keep_archives): a
+            for a in pending
+        }
+        for future in as_completed(futures):
+            artifact = futures[future]
+            if not future.result():
+                ok = False
+                continue
+            manifest[artifact["name"]] = {
+                "id": artifact["id"],
+                "size_in_bytes": artifact["size_in_bytes"],
+                "tier": "full",
+                "completed_at": time.time(),
+            }
+            remaining -= 1
+            _write_download_manifest(
+                output_dir, run_id, manifest, complete=whole_run and not remaining
+            )
+            if verbose:
+                print(
+                    f"  ✓ {artifact['name']} ({artifact['size_in_bytes'] / 1e6:.1f} MB)"
+                )
+    return ok
+
+
+def download_run_archives(
+    run_id: int,
+    archive_dir: Path,
+    artifact_names: list[str] | None = None,
+    verbose: bool = False,
+    workers: int = DOWNLOAD_WORKERS,
+) -> list[Path] | None:
+    """Download a run's artifact zips concurrently, without extracting them.
+
+    For consumers that read members straight from the zips (e.g. the
+    leaderboard submission assembler). Returns None if any download failed.
+    """
+    artifacts = list_artifacts_for_run(
+        run_id, include_smoke_test=artifact_names is not None, verbose=verbose
+    )
+    if artifact_names is not None:
+        artifacts = [a for a in artifacts if a["name"] in artifact_names]
+    if not artifacts:
+        print(f"No artifacts found for run {run_id}", file=sys.stderr)
+        return None
     if verbose:
-        print(f"Downloading {len(artifact_names)} artifact(s) to {output_dir}...")
-    output_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Downloading {len(artifacts)} artifact zip(s) to {archive_dir}...")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        archives = list(
+            pool.map(
+                lambda a: fetch_artifact_archive(a, archive_dir, verbose), artifacts
+            )
+        )
+    if any(a is None for a in archives):
+        return None
+    return [a for a in archives if a is not None]
 
-    cmd = [
-        "gh",
-        "run",
-        "download",
-        str(run_id),
-        f"--repo={GITHUB_REPO}",
-        f"--dir={output_dir}",
+
+@dataclass(slots=True)
+class FetchStats:
+    """Bytes and requests spent by a tiered fetch, vs. the full artifact size."""
+
+    bytes_transferred: int = 0
+    requests: int = 0
+    full_bytes: int = 0
+
+    def add(self, remote: RemoteZip) -> None:
+        self.bytes_transferred += remote.reader.bytes_transferred
+        self.requests += remote.reader.requests
+
+
+@functools.cache
+def _gh_token() -> str:
+    try:
+        return run_command(["gh", "auth", "token"]).stdout.strip()
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise ArtifactFetchError(f"gh auth token failed: {e}") from e
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        return None
+
+
+def artifact_download_url(artifact_id: int) -> str:
+    """Resolve the short-lived signed URL an artifact zip redirects to.
+
+    The blob URL supports HTTP range requests (and must not receive the
+    GitHub token), so the redirect is captured instead of followed.
+    """
+    request = urllib.request.Request(
+        f"https://api.github.com/repos/{GITHUB_REPO}/actions/artifacts/{artifact_id}/zip",
+        headers={
+            "Authorization": f"Bearer {_gh_token()}",
+            "Accept": "application/vnd.github+json",
+        },
+    )
+    opener = urllib.request.build_opener(_NoRedirect)
+    try:
+        opener.open(request)
+    except urllib.error.HTTPError as e:
+        if e.code in (301, 302, 303, 307, 308):
+            return e.headers["Location"]
+        raise
+    raise ArtifactFetchError(
+        f"Artifact {artifact_id} did not redirect to a download URL"
+    )
+
+
+def _extract_remote_members(
+    artifact: dict, select: Callable[[str], bool], dest: Path
+) -> RemoteZip:
+    """Extract the members of a remote artifact zip whose names match ``select``.
+
+    Network, zip and auth failures are raised as ArtifactFetchError so callers
+    can report them per artifact.
+    """
+    try:
+        remote = RemoteZip(
+            lambda: artifact_download_url(artifact["id"]), artifact["size_in_bytes"]
+        )
+        members = [i for i in remote.infolist() if select(i.filename)]
+        remote.extract_many(members, dest)
+    except (OSError, zipfile.BadZipFile, NotImplementedError) as e:
+        # NotImplementedError: member compressed with an unsupported method
+        raise ArtifactFetchError(str(e) or type(e).__name__) from e
+    return remote
+
+
+def is_trial_result(member: str) -> bool:
+    """Whether a zip member path is a trial-level (or job-level) result.json."""
+    path = PurePosixPath(member)
+    return path.name == "result.json" and path.parent.name not in TRIAL_PAYLOAD_DIRS
+
+
+def fetch_run_results(
+    run_id: int,
+    output_dir: Path,
+    include_smoke_test: bool = False,
+    verbose: bool = False,
+    workers: int = DOWNLOAD_WORKERS,
+) -> FetchStats | None:
+    """Tier 1 of a lazy download: fetch only the result.json files of a run.
+
+    Members are read straight out of the remote artifact zips with range
+    requests and written to the same paths a full download would produce, so
+    find_trial_results() works unchanged. Artifacts already fetched (at
+    either tier) are skipped. Returns None if the run has no artifacts.
+    """
+    artifacts = list_artifacts_for_run(
+        run_id, include_smoke_test=include_smoke_test, verbose=verbose
+    )
+    if not artifacts:
+        print(f"No artifacts found for run {run_id}", file=sys.stderr)
+        return None
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_download_manifest(output_dir)
+    stats = FetchStats(full_bytes=sum(a["size_in_bytes"] for a in artifacts))
+    pending = [
+        a
+        for a in artifacts
+        if not artifact_is_complete(output_dir, a, manifest, tier="results")
     ]
-    for name in artifact_names:
-        cmd.extend(["--name", name])
+    if verbose and pending:
+        print(f"Fetching result.json files from {len(pending)} artifact(s)...")
 
-    result = run_command(cmd, check=False, verbose=verbose)
-    if result.returncode != 0:
-        print(f"Error downloading: {result.stderr}", file=sys.stderr)
-        return False
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(
+                _extract_remote_members,
+                a,
+                is_trial_result,
+                output_dir / a["name"],
+            ): a
+            for a in pending
+        }
+        for future in as_completed(futures):
+            artifact = futures[future]
+            try:
+                remote = future.result()
+            except ArtifactFetchError as e:
+                print(f"Error fetching {artifact['name']}: {e}", file=sys.stderr)
+                continue
+            stats.add(remote)
+            manifest[artifact["name"]] = {
+                "id": artifact["id"],
+                "size_in_bytes": artifact["size_in_bytes"],
+                "tier": "results",
+                "trials": [],
+                "completed_at": time.time(),
+            }
+            _write_download_manifest(output_dir, run_id, manifest)
+    return stats
 
-    return True
+
+def fetch_trial_payloads(
+    run_id: int, output_dir: Path, trial_dirs: list[Path], verbose: bool = False
+) -> FetchStats:
+    """Tier 2 of a lazy download: fetch everything under the given trial dirs.
+
+    ``trial_dirs`` are local trial directories produced by fetch_run_results
+    (``output_dir/<artifact>/.../<task>__<hash>``). Their agent/ and verifier/
+    payloads are pulled from the remote zips; trials fetched before and
+    fully downloaded artifacts are skipped.
+    """
+    manifest = load_download_manifest(output_dir)
+    by_artifact: dict[str, list[str]] = {}
+    for trial_dir in trial_dirs:
+        name, *rest = trial_dir.relative_to(output_dir).parts
+        entry = manifest.get(name)
+        prefix = "/".join(rest) + "/"
+        if entry and entry.get("tier") == "results" and prefix not in entry["trials"]:
+            by_artifact.setdefault(name, []).append(prefix)
+
+    stats = FetchStats()
+    for name, prefixes in by_artifact.items():
+        entry = manifest[name]
+        if verbose:
+            print(f"Fetching logs for {len(prefixes)} trial(s) from {name}...")
+        try:
+            remote = _extract_remote_members(
+                {"name": name, **entry},
+                lambda member, prefixes=tuple(prefixes): (
+                    member.startswith(prefixes) and not is_trial_result(member)
+                ),
+                output_dir / name,
+            )
+        except ArtifactFetchError as e:
+            print(f"Error fetching logs from {name}: {e}", file=sys.stderr)
+            continue
+        stats.add(remote)
+        entry["trials"].extend(prefixes)
+        _write_download_manifest(output_dir, run_id, manifest)
+    return stats
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import io
+import subprocess
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from . import tbench_utils
+
+
+def _zip_bytes(files: dict[str, str]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buf.getvalue()
+
+
+def test_download_resumes_only_missing_artifacts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    zips = {
+        1: _zip_bytes({"jobs/a/t__1/result.json": "{}"}),
+        2: _zip_bytes({"jobs/b/t__2/result.json": "{}"}),
+    }
+    artifacts = [
+        {"name": f"terminal-bench-results-m{i}", "id": i, "size_in_bytes": len(z)}
+        for i, z in zips.items()
+    ]
+    monkeypatch.setattr(
+        tbench_utils, "list_artifacts_for_run", lambda *args, **kwargs: artifacts
+    )
+
+    fetched: list[int] = []
+    truncate = {2}
+
+    def fake_run(cmd, stdout=None, **kwargs):
+        artifact_id = int(cmd[2].split("/")[-2])
+        fetched.append(artifact_id)
+        data = zips[artifact_id]
+        # First attempt at artifact 2 is cut short (e.g. dropped connection)
+        stdout.write(data[:10] if artifact_id in truncate else data)
+        truncate.discard(artifact_id)
+        return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+    monkeypatch.setattr(tbench_utils.subprocess, "run", fake_run)
+
+    out = tmp_path / "run"
+    assert not tbench_utils.download_run_artifacts(1, out, workers=2)
+    manifest = tbench_utils.load_download_manifest(out)
+    assert list(manifest) == ["terminal-bench-results-m1"]
+    assert (out / "terminal-bench-results-m1/jobs/a/t__1/result.json").exists()
+    assert not (out / "terminal-bench-results-m2").exists()
+    # Extracted zips are not kept; the manifest is enough to resume
+    assert not (
+        out / tbench_utils.ARCHIVE_DIR / "terminal-bench-results-m1.zip"
+    ).exists()
+
+    fetched.clear()
+    assert tbench_utils.download_run_artifacts(1, out, workers=2)
+    assert fetched == [2]
+    assert (out / "terminal-bench-results-m2/jobs/b/t__2/result.json").exists()
+
+    fetched.clear()
+    assert tbench_utils.download_run_artifacts(1, out)
+    assert fetched == []
+    # Only a download of the whole run marks it complete
+    assert not tbench_utils.run_download_complete(out)
+    assert tbench_utils.download_run_artifacts(1, out, include_smoke_test=True)
+    assert tbench_utils.run_download_complete(out)
+
+    kept = tmp_path / "kept"
+    assert tbench_utils.download_run_artifacts(1, kept, keep_archives=True)
+    assert sorted(p.name for p in (kept / tbench_utils.ARCHIVE_DIR).iterdir()) == [
+        "terminal-bench-results-m1.zip",
+        "terminal-bench-results-m2.zip",
+    ]
+
+
+def test_tail_lines_reads_backwards_across_blocks(tmp_path: Path) -> None:
+    log = tmp_path / "stderr.txt"
+    lines = [f"line {i} " + "x" * (i % 7) for i in range(500)]
+    log.write_text("\n".join(lines) + "\n\n  \n")
+    for n in (1, 10, 499, 600):
+        assert (
+            tbench_utils.tail_lines(log, n, block_size=16)
+            == (log.read_text().strip().split("\n")[-n:])
+        )
+
+    log.write_text("\n \n\t\n")
+    assert tbench_utils.tail_lines(log, 10, block_size=4) == []
+
+    # One endless line: reading stops at max_bytes
+    log.write_text("y" * 10_000 + "\nlast")
+    assert tbench_utils.tail_lines(log, 2, block_size=64, max_bytes=256) == [
+        "y" * 251,
+        "last",
+    ]
+
+
+def test_lazy_fetch_reports_failures_per_artifact(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    artifacts = [
+        {"name": f"terminal-bench-results-m{i}", "id": i, "size_in_bytes": 100}
+        for i in range(1, 5)
+    ]
+    monkeypatch.setattr(
+        tbench_utils, "list_artifacts_for_run", lambda *args, **kwargs: artifacts
+    )
+
+    def fake_run_command(cmd, **kwargs):
+        raise subprocess.CalledProcessError(1, cmd)
+
+    def fake_url(artifact_id: int) -> str:
+        if artifact_id == 1:
+            raise tbench_utils.ArtifactFetchError("did not redirect")
+        if artifact_id == 2:
+            tbench_utils._gh_token.cache_clear()
+            monkeypatch.setattr(tbench_utils, "run_command", fake_run_command)
+            tbench_utils._gh_token()
+        return f"https://blob/{artifact_id}"
+
+    class FakeRemote:
+        def __init__(self, url_factory, size: int) -> None:
+            self.url = url_factory()
+            # Has the bytes_transferred/requests counters FetchStats.add() reads
+            self.reader = tbench_utils.FetchStats()
+
+        def infolist(self) -> list[zipfile.ZipInfo]:
+            return [zipfile.ZipInfo("jobs/j/t__1/result.json")]
+
+        def extract_many(self, members, dest: Path) -> list[Path]:
+            if self.url.endswith("/3"):
+                raise NotImplementedError("compression method 14")
+            (dest / members[0].filename).parent.mkdir(parents=True)
+            (dest / members[0].filename).write_text("{}")
+            return [dest / members[0].filename]
+
+    monkeypatch.setattr(tbench_utils, "artifact_download_url", fake_url)
+    monkeypatch.setattr(tbench_utils, "RemoteZip", FakeRemote)
+
+    out = tmp_path / "run"
+    assert tbench_utils.fetch_run_results(1, out, workers=1) is not None
+    assert list(tbench_utils.load_download_manifest(out)) == [
+        "terminal-bench-results-m4"
+    ]
+    errors = sorted(capsys.readouterr().err.splitlines())
+    assert [e.split(":")[0] for e in errors] == [
+        f"Error fetching terminal-bench-results-m{i}" for i in (1, 2, 3)
+    ]
+    tbench_utils._gh_token.cache_clear()
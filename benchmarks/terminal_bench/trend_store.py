@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Cross-run trend store of per-task Terminal-Bench rollups.
+
+Each nightly run contributes one compact row per (task, config) -- passes,
+attempts, token totals and summed trial duration -- so trend questions are
+answered from a few thousand rollup rows instead of re-deriving everything
+from raw trial rows. A config is ``<model_name>@<thinking_level>``.
+
+The store is a SQLite file fed either by scripts/upload-tbench-results.py
+(``--trend-store PATH``) or from the local tbench_results mirror
+(results_mirror.py).
+
+Usage:
+    # Append rollups for runs that changed in the local mirror since last time
+    python benchmarks/terminal_bench/trend_store.py ingest-mirror
+
+    # Tasks whose pass rate on the latest night dropped >= 25 points vs. the
+    # previous 6 nights
+    python benchmarks/terminal_bench/trend_store.py regressions --nights 7
+
+    # Nightly and 7-night rolling pass rate for one task
+    python benchmarks/terminal_bench/trend_store.py rolling chess-best-move --window 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+try:
+    from . import results_mirror
+    from .tbench_utils import extract_task_id
+except ImportError:
+    import results_mirror  # type: ignore[import-not-found,no-redef]
+    from tbench_utils import extract_task_id  # type: ignore[import-not-found,no-redef]
+
+N = TypeVar("N", int, float)
+
+TREND_STORE_PATH = Path(__file__).parent / ".leaderboard_cache" / "tbench_trends.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_rollups (
+    run_key TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    config TEXT NOT NULL,
+    passes INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    duration_sec REAL,
+    PRIMARY KEY (run_key, task_id, config)
+);
+CREATE INDEX IF NOT EXISTS idx_task_rollups_config_date
+    ON task_rollups (config, run_date);
+CREATE INDEX IF NOT EXISTS idx_task_rollups_task
+    ON task_rollups (task_id, config, run_date);
+CREATE TABLE IF NOT EXISTS trend_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+@dataclass(slots=True)
+class TaskRollup:
+    """Aggregate of one run's trials for a single (task, config)."""
+
+    run_key: str
+    run_date: str
+    task_id: str
+    config: str
+    passes: int = 0
+    attempts: int = 0
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    duration_sec: float | None = None
+
+
+def connect(path: Path = TREND_STORE_PATH) -> sqlite3.Connection:
+    """Open (creating if needed) the trend store."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _add(total: N | None, value: N | None) -> N | None:
+    if value is None:
+        return total
+    return value if total is None else total + value
+
+
+def run_key(row: dict) -> str:
+    """Nightly runs span several job folders (one per model); group by workflow run."""
+    github_run_id = row.get("github_run_id")
+    return str(github_run_id) if github_run_id else str(row["run_id"])
+
+
+def run_date(row: dict) -> str:
+    """Night a row belongs to: the job folder date (YYYY-MM-DD__HH-MM-SS), else ingestion date."""
+    run_id = str(row.get("run_id") or "")
+    if len(run_id) >= 10 and run_id[4] == "-" and run_id[7] == "-":
+        return run_id[:10]
+    return str(row.get("ingested_at") or "")[:10]
+
+
+def rollups_from_rows(rows: Iterable[dict]) -> list[TaskRollup]:
+    """Fold tbench_results-shaped rows into per-(run, task, config) rollups.
+
+    Trials with an unknown outcome (``passed`` is None) are skipped, as in the
+    failure analysis.
+    """
+    rollups: dict[tuple[str, str, str], TaskRollup] = {}
+    for row in rows:
+        passed = row.get("passed")
+        if passed is None:
+            continue
+        key = (
+            run_key(row),
+            extract_task_id(str(row["task_id"])),
+            f"{row.get('model_name')}@{row.get('thinking_level')}",
+        )
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = TaskRollup(key[0], run_date(row), key[1], key[2])
+        rollup.attempts += 1
+        rollup.passes += 1 if passed else 0
+        rollup.input_tokens = _add(rollup.input_tokens, row.get("n_input_tokens"))
+        rollup.output_tokens = _add(rollup.output_tokens, row.get("n_output_tokens"))
+        rollup.duration_sec = _add(rollup.duration_sec, row.get("trial_duration_sec"))
+    return list(rollups.values())
+
+
+def append_rollups(conn: sqlite3.Connection, rollups: Iterable[TaskRollup]) -> int:
+    """Insert rollups, replacing any earlier rollup for the same run/task/config."""
+    before = conn.total_changes
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO task_rollups (
+            run_key, run_date, task_id, config, passes, attempts,
+            input_tokens, output_tokens, duration_sec
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            (
+                r.run_key,
+                r.run_date,
+                r.task_id,
+                r.config,
+                r.passes,
+                r.attempts,
+                r.input_tokens,
+                r.output_tokens,
+                r.duration_sec,
+            )
+            for r in rollups
+        ),
+    )
+    conn.commit()
+    return conn.total_changes - before
+
+
+def append_rows(path: Path, rows: Iterable[dict]) -> int:
+    """Roll up freshly built rows (e.g. from upload-tbench-results.py) into the store."""
+    conn = connect(path)
+    try:
+        return append_rollups(conn, rollups_from_rows(rows))
+    finally:
+        conn.close()
+
+
+def ingest_mirror(
+    path: Path = TREND_STORE_PATH, mirror_path: Path = results_mirror.MIRROR_PATH
+) -> int:
+    """
+    Roll up runs that gained rows in the mirror since the last ingest.
+
+    Runs can be ingested in several batches, so every workflow run (run_key)
+    touched at or after the stored watermark is re-rolled in full.
+    """
+    conn = connect(path)
+    mirror = results_mirror.connect(mirror_path)
+    try:
+        watermark = conn.execute(
+            "SELECT value FROM trend_meta WHERE key = 'mirror_watermark'"
+        ).fetchone()
+        since = watermark["value"] if watermark else ""
+        # Inclusive, like results_mirror.sync: rows sharing the watermark
+        # timestamp can arrive later. Re-rolling a run is idempotent.
+        mirror.create_function(
+            "run_key",
+            2,
+            lambda github_run_id, run_id: run_key(
+                {"github_run_id": github_run_id, "run_id": run_id}
+            ),
+            deterministic=True,
+        )
+        changed = mirror.execute(
+            """
+            SELECT DISTINCT run_key(github_run_id, run_id) AS run_key
+            FROM tbench_results
+            WHERE ingested_at >= ?
+            """,
+            (since,),
+        ).fetchall()
+        # Whole workflow runs: a rollup spans every job folder of the run
+        run_keys = [r["run_key"] for r in changed]
+        written = 0
+        for start in range(0, len(run_keys), 500):
+            batch = run_keys[start : start + 500]
+            rows = mirror.execute(
+                f"""
+                SELECT * FROM tbench_results
+                WHERE run_key(github_run_id, run_id) IN ({", ".join("?" for _ in batch)})
+                """,
+                batch,
+            ).fetchall()
+            written += append_rollups(conn, rollups_from_rows(dict(r) for r in rows))
+
+        newest = mirror.execute(
+            "SELECT MAX(ingested_at) FROM tbench_results"
+        ).fetchone()
+        if newest[0]:
+            conn.execute(
+                "INSERT OR REPLACE INTO trend_meta (key, value) "
+                "VALUES ('mirror_watermark', ?)",
+                (newest[0],),
+            )
+            conn.commit()
+        return written
+    finally:
+        mirror.close()
+        conn.close()
+
+
+def find_regressions(
+    conn: sqlite3.Connection,
+    nights: int = 7,
+    min_drop: float = 0.25,
+    config: str | None = None,
+) -> list[sqlite3.Row]:
+    """
+    Tasks whose latest-night pass rate fell vs. the preceding nights.
+
+    For every config, the most recent ``nights`` distinct run dates are taken;
+    the latest night is compared with the pooled pass rate of the rest.
+    Only rollups inside that window are read (via the (config, run_date) index).
+    """
+    return conn.execute(
+        """
+        WITH nights AS (
+            SELECT config, run_date,
+                   DENSE_RANK() OVER (PARTITION BY config ORDER BY run_date DESC) AS night
+            FROM (SELECT DISTINCT config, run_date FROM task_rollups)
+        ),
+        recent AS (
+            SELECT r.task_id, r.config, n.night, r.passes, r.attempts
+            FROM task_rollups r
+            JOIN nights n ON n.config = r.config AND n.run_date = r.run_date
+            WHERE n.night <= :nights
+              AND (:config IS NULL OR instr(lower(r.config), lower(:config)) > 0)
+        ),
+        rates AS (
+            SELECT task_id, config,
+                   1.0 * SUM(CASE WHEN night = 1 THEN passes END)
+                       / SUM(CASE WHEN night = 1 THEN attempts END) AS latest_rate,
+                   1.0 * SUM(CASE WHEN night > 1 THEN passes END)
+                       / SUM(CASE WHEN night > 1 THEN attempts END) AS prior_rate,
+                   SUM(CASE WHEN night > 1 THEN attempts END) AS prior_attempts
+            FROM recent
+            GROUP BY task_id, config
+        )
+        SELECT *, prior_rate - latest_rate AS drop_
+        FROM rates
+        WHERE latest_rate IS NOT NULL AND prior_rate IS NOT NULL
+          AND prior_rate - latest_rate >= :min_drop
+        ORDER BY drop_ DESC, task_id, config
+        """,
+        {"nights": nights, "min_drop": min_drop, "config": config},
+    ).fetchall()
+
+
+def rolling_pass_rates(
+    conn: sqlite3.Connection, task_id: str, window: int = 7, config: str | None = None
+) -> list[sqlite3.Row]:
+    """Nightly pass rate, tokens and duration of a task with a rolling-window rate."""
+    preceding = max(int(window) - 1, 0)
+    return conn.execute(
+        f"""
+        WITH nightly AS (
+            SELECT task_id, config, run_date,
+                   SUM(passes) AS passes, SUM(attempts) AS attempts,
+                   SUM(input_tokens) AS input_tokens,
+                   SUM(output_tokens) AS output_tokens,
+                   SUM(duration_sec) AS duration_sec
+            FROM task_rollups
+            WHERE task_id = :task
+              AND (:config IS NULL OR instr(lower(config), lower(:config)) > 0)
+            GROUP BY task_id, config, run_date
+        )
+        SELECT *,
+               1.0 * passes / attempts AS pass_rate,
+               1.0 * SUM(passes) OVER w / SUM(attempts) OVER w AS rolling_rate
+        FROM nightly
+        WINDOW w AS (
+            PARTITION BY config ORDER BY run_date
+            ROWS BETWEEN {preceding} PRECEDING AND CURRENT ROW
+        )
+        ORDER BY config, run_date
+        """,
+        {"task": task_id, "config": config},
+    ).fetchall()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Query Terminal-Bench pass-rate trends"
+    )
+    parser.add_argument(
+        "--path",
+        type=Path,
+        default=TREND_STORE_PATH,
+        help=f"Trend store database (default: {TREND_STORE_PATH})",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest-mirror", help="Roll up new runs from the mirror")
+    ingest.add_argument("--mirror-path", type=Path, default=results_mirror.MIRROR_PATH)
+
+    regress = sub.add_parser("regressions", help="Tasks whose pass rate dropped")
+    regress.add_argument("--nights", type=int, default=7)
+    regress.add_argument("--min-drop", type=float, default=0.25)
+    regress.add_argument("--config", help="Filter configs (substring match)")
+
+    rolling = sub.add_parser("rolling", help="Rolling pass rate for one task")
+    rolling.add_argument("task_id")
+    rolling.add_argument("--window", type=int, default=7)
+    rolling.add_argument("--config", help="Filter configs (substring match)")
+    args = parser.parse_args()
+
+    if args.command == "ingest-mirror":
+        written = ingest_mirror(args.path, args.mirror_path)
+        print(f"Wrote {written} rollup(s) to {args.path}")
+        return 0
+
+    conn = connect(args.path)
+    if args.command == "regressions":
+        rows = find_regressions(conn, args.nights, args.min_drop, args.config)
+        if not rows:
+            print("No regressions found")
+            return 0
+        print(f"{'Task ID':<40} {'Config':<36} {'Prior':>6} {'Latest':>7} {'Drop':>6}")
+        print("-" * 99)
+        for r in rows:
+            print(
+                f"{r['task_id']:<40} {r['config']:<36} "
+                f"{r['prior_rate'] * 100:>5.0f}% {r['latest_rate'] * 100:>6.0f}% "
+                f"{r['drop_'] * 100:>5.0f}%"
+            )
+        return 0
+
+    rows = rolling_pass_rates(conn, args.task_id, args.window, args.config)
+    if not rows:
+        print(f"No rollups for {args.task_id}")
+        return 0
+    print(
+        f"{'Config':<36} {'Night':<10} {'Pass':>7} {f'{args.window}-night':>9} "
+        f"{'Tokens in':>10} {'Duration':>9}"
+    )
+    for r in rows:
+        duration = f"{r['duration_sec']:.0f}s" if r["duration_sec"] is not None else "-"
+        print(
+            f"{r['config']:<36} {r['run_date']:<10} "
+            f"{r['passes']:>3}/{r['attempts']:<3} {r['rolling_rate'] * 100:>8.0f}% "
+            f"{r['input_tokens'] or 0:>10} {duration:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from . import results_mirror, trend_store
+
+
+def _night(
+    day: int, passes: list[int | None], task: str = "chess-best-move"
+) -> list[dict]:
+    run_id = f"2026-01-{day:02d}__00-15-05"
+    return [
+        {
+            "run_id": run_id,
+            "task_id": f"{task}__{day:02d}{i}",
+            "github_run_id": 1000 + day,
+            "model_name": "anthropic/claude-opus-4-5",
+            "thinking_level": "high",
+            "dataset": "terminal-bench@2.0",
+            "passed": passed,
+            "n_input_tokens": 100,
+            "n_output_tokens": 10,
+            "ingested_at": f"2026-01-{day:02d}T06:00:00.000000Z",
+        }
+        for i, passed in enumerate(passes)
+    ]
+
+
+def test_regression_and_rolling_rate_from_mirror(tmp_path: Path) -> None:
+    mirror_path = tmp_path / "mirror.sqlite"
+    store_path = tmp_path / "trends.sqlite"
+    mirror = results_mirror.connect(mirror_path)
+    for day in (1, 2, 3):
+        results_mirror.insert_rows(mirror, _night(day, [1, 1, None]))
+    results_mirror.insert_rows(mirror, _night(3, [1, 1], task="fix-git"))
+    mirror.commit()
+
+    assert trend_store.ingest_mirror(store_path, mirror_path) == 4
+    # Nothing new in the mirror: only runs at the (inclusive) watermark
+    assert trend_store.ingest_mirror(store_path, mirror_path) == 2
+
+    results_mirror.insert_rows(mirror, _night(4, [0, 1, 0]))
+    mirror.commit()
+    # Night 4, plus night 3's two runs at the old watermark
+    assert trend_store.ingest_mirror(store_path, mirror_path) == 3
+
+    # Another job folder of night 4's workflow run, same config and ingestion
+    # timestamp as the watermark: rolled up together with the first folder
+    late = [
+        {**row, "run_id": "2026-01-04__03-00-00", "task_id": f"{row['task_id']}x"}
+        for row in _night(4, [1, 1])
+    ]
+    results_mirror.insert_rows(mirror, late)
+    mirror.commit()
+    mirror.close()
+    assert trend_store.ingest_mirror(store_path, mirror_path) == 1
+
+    conn = trend_store.connect(store_path)
+    regressions = trend_store.find_regressions(conn, nights=3, min_drop=0.25)
+    assert [(r["task_id"], r["prior_rate"], r["latest_rate"]) for r in regressions] == [
+        ("chess-best-move", 1.0, 3 / 5)
+    ]
+
+    rolling = trend_store.rolling_pass_rates(conn, "chess-best-move", window=2)
+    assert [(r["run_date"], r["passes"], r["attempts"]) for r in rolling] == [
+        ("2026-01-01", 2, 2),
+        ("2026-01-02", 2, 2),
+        ("2026-01-03", 2, 2),
+        ("2026-01-04", 3, 5),
+    ]
+    assert rolling[-1]["rolling_rate"] == 5 / 7
+    assert rolling[-1]["input_tokens"] == 500
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+import types
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "upload-tbench-results.py"
+RUN_ID = "2026-01-10__00-00-00"
+
+
+def _load_script() -> types.ModuleType:
+    spec = importlib.util.spec_from_file_location("upload_tbench_results", SCRIPT)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _GoogleAPIError(Exception):
+    pass
+
+
+class _ServerError(_GoogleAPIError):
+    pass
+
+
+class _NotFound(_GoogleAPIError):
+    pass
+
+
+class _Conflict(_GoogleAPIError):
+    pass
+
+
+class FakeClient:
+    """Records inserts and loads; ``fail`` and ``job_fail`` hold errors to raise
+    on the next requests and load jobs."""
+
+    inserts: ClassVar[list[tuple[str, list[dict], list[str] | None]]] = []
+    fail: ClassVar[list[Exception]] = []
+    job_fail: ClassVar[list[Exception]] = []
+
+    def __init__(self, project: str | None = None) -> None:
+        pass
+
+    def insert_rows_json(self, table_id, rows, row_ids=None):
+        if self.fail:
+            raise self.fail.pop(0)
+        self.inserts.append((table_id.rsplit(".", 1)[-1], rows, row_ids))
+        return []
+
+    def get_table(self, table_id):
+        raise _NotFound(table_id)
+
+    def query(self, sql):
+        return types.SimpleNamespace(result=lambda: None)
+
+    def load_table_from_file(self, f, table_id, job_id=None, job_config=None):
+        if self.fail:
+            raise self.fail.pop(0)
+        rows = [json.loads(line) for line in f]
+
+        def result() -> None:
+            if self.job_fail:
+                raise self.job_fail.pop(0)
+            self.inserts.append((table_id.rsplit(".", 1)[-1], rows, None))
+
+        return types.SimpleNamespace(result=result)
+
+
+@pytest.fixture
+def upload(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> types.ModuleType:
+    exceptions = types.SimpleNamespace(
+        GoogleAPIError=_GoogleAPIError,
+        ServerError=_ServerError,
+        TooManyRequests=_ServerError,
+        NotFound=_NotFound,
+        Conflict=_Conflict,
+    )
+    bigquery = types.SimpleNamespace(
+        Client=FakeClient,
+        LoadJobConfig=lambda **kwargs: kwargs,
+        SourceFormat=types.SimpleNamespace(
+            NEWLINE_DELIMITED_JSON="NEWLINE_DELIMITED_JSON"
+        ),
+        WriteDisposition=types.SimpleNamespace(WRITE_APPEND="WRITE_APPEND"),
+    )
+    requests_exceptions = types.SimpleNamespace(
+        RequestException=OSError, ConnectionError=ConnectionError, Timeout=TimeoutError
+    )
+    modules = {
+        "google": types.SimpleNamespace(),
+        "google.api_core": types.SimpleNamespace(exceptions=exceptions),
+        "google.api_core.exceptions": exceptions,
+        "google.cloud": types.SimpleNamespace(bigquery=bigquery),
+        "google.cloud.bigquery": bigquery,
+        "requests": types.SimpleNamespace(exceptions=requests_exceptions),
+        "requests.exceptions": requests_exceptions,
+    }
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    FakeClient.inserts = []
+    FakeClient.fail = []
+    FakeClient.job_fail = []
+    monkeypatch.chdir(tmp_path)
+    module = _load_script()
+    monkeypatch.setattr(module, "RETRY_BASE_DELAY", 0.0)
+    return module
+
+
+def _trial(job: Path, name: str, reward: float) -> None:
+    (job / name).mkdir(parents=True, exist_ok=True)
+    result = {"verifier_result": {"rewards": {"reward": reward}}}
+    (job / name / "result.json").write_text(json.dumps(result))
+
+
+def test_watch_uploads_trials_and_sweep_writes_job_fields(
+    upload: types.ModuleType, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    job = tmp_path / "jobs" / RUN_ID
+    job.mkdir(parents=True)
+    (job / "config.json").write_text(json.dumps({"agents": [{"model_name": "m"}]}))
+    _trial(job, "fix-git__a", 1.0)
+    (job / "build-app__b").mkdir()  # still running
+    ledger = upload.UploadLedger(tmp_path / "ledger")
+
+    # A transient error is retried; an API error is left to the next poll
+    FakeClient.fail = [_ServerError("503")]
+    assert upload.upload_finished_trials("p", "d", ledger) == 1
+    FakeClient.fail = [_GoogleAPIError("table not ready")]
+    stop = threading.Event()
+    stop.set()
+    _trial(job, "cmd__c", 0.0)
+    upload.watch("p", "d", ledger, interval=0, stop=stop)
+    assert [(t, ids) for t, _, ids in FakeClient.inserts] == [
+        ("tbench_trials", [f"{RUN_ID}/fix-git__a"])
+    ]
+    trial_row = FakeClient.inserts[0][1][0]
+    assert set(trial_row) == set(upload.TRIAL_COLUMNS)
+    assert trial_row["model_name"] == "m"
+
+    # Ledgered trials are not read again
+    read = []
+    load_json = upload.load_json
+    monkeypatch.setattr(
+        upload,
+        "load_json",
+        lambda path: read.append(path.parent.name) or load_json(path),
+    )
+    assert upload.upload_finished_trials("p", "d", ledger) == 1
+    assert "fix-git__a" not in read
+    assert FakeClient.inserts[-1][2] == [f"{RUN_ID}/cmd__c"]
+
+    # The job finishes: the sweep writes complete rows, once
+    _trial(job, "build-app__b", 1.0)
+    stats = {"evals": {"e": {"metrics": [{"mean": 2 / 3}]}}}
+    (job / "result.json").write_text(json.dumps({"stats": stats}))
+    monkeypatch.setattr(sys, "argv", ["upload", "--ledger", str(ledger.path)])
+    upload.main()
+    table, rows, ids = FakeClient.inserts[-1]
+    assert table == "tbench_results"
+    assert sorted(ids) == sorted(
+        f"{RUN_ID}/{t}" for t in ("fix-git__a", "build-app__b", "cmd__c")
+    )
+    assert {(r["n_resolved"], r["n_unresolved"], r["accuracy"]) for r in rows} == {
+        (2, 1, 2 / 3)
+    }
+
+    n_inserts = len(FakeClient.inserts)
+    upload.main()
+    assert len(FakeClient.inserts) == n_inserts
+    # The ledger survives a restart and keeps tables apart
+    reloaded = upload.UploadLedger(ledger.path)
+    assert len(reloaded) == 5
+    assert f"{RUN_ID}/fix-git__a" in reloaded.uploaded("tbench_results")
+    assert f"{RUN_ID}/build-app__b" not in reloaded.uploaded("tbench_trials")
+
+
+def test_watch_does_not_hide_programming_errors(
+    upload: types.ModuleType, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def broken(*args: object) -> int:
+        raise TypeError("bug")
+
+    monkeypatch.setattr(upload, "upload_finished_trials", broken)
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(TypeError):
+        upload.watch("p", "d", upload.UploadLedger(tmp_path / "ledger"), stop=stop)
+
+
+def test_compat_view_lists_watched_trials_before_the_run_row(
+    upload: types.ModuleType,
+) -> None:
+    view = upload.normalized_schema_sql("p", "d")[-1]
+    assert "LEFT JOIN `p.d.tbench_runs` AS r" in view
+    # Swept into the wide table: listed from there only
+    assert "WHERE NOT EXISTS" in view
+
+
+def test_trial_timing_from_harbor_phases_and_file_mtimes(
+    upload: types.ModuleType, tmp_path: Path
+) -> None:
+    harbor = {
+        "started_at": "2026-01-10T00:00:00Z",
+        "finished_at": "2026-01-10T00:10:00+00:00",
+        "environment_setup": {
+            "started_at": "2026-01-10T00:00:00",
+            "finished_at": "2026-01-10T00:00:30",
+        },
+        "agent_execution": {
+            "started_at": "2026-01-10T00:01:00Z",
+            "finished_at": "2026-01-10T00:08:00Z",
+        },
+        "verifier": {"started_at": "2026-01-10T00:08:00Z"},
+    }
+    timing = upload.extract_trial_timing(harbor, tmp_path)
+    assert timing["trial_started_at"] == "2026-01-10T00:00:00+00:00"
+    assert timing["trial_duration_sec"] == 600.0
+    # Naive timestamps are UTC
+    assert timing["environment_setup_sec"] == 30.0
+    assert timing["agent_execution_sec"] == 420.0
+    assert timing["agent_setup_sec"] is None
+    assert timing["verifier_sec"] is None
+
+    # No trial timestamps: result.json's mtime still ends the trial when
+    # config.json is missing
+    (tmp_path / "result.json").write_text("{}")
+    os.utime(tmp_path / "result.json", (1_768_003_200, 1_768_003_200))
+    timing = upload.extract_trial_timing({}, tmp_path)
+    assert timing["trial_started_at"] is None
+    assert timing["trial_finished_at"] == "2026-01-10T00:00:00+00:00"
+    assert timing["trial_duration_sec"] is None
+
+    (tmp_path / "config.json").write_text("{}")
+    os.utime(tmp_path / "config.json", (1_768_002_900, 1_768_002_900))
+    assert upload.extract_trial_timing({}, tmp_path)["trial_duration_sec"] == 300.0
+
+
+def test_chunks_respect_row_and_byte_limits(upload: types.ModuleType) -> None:
+    rows = [
+        {"task_id": f"t{i}", "blob": "x" * size}
+        for i, size in enumerate([10, 10, 50, 100, 10, 500])
+    ]
+    sizes = [len(json.dumps(r)) for r in rows]
+    chunks = list(upload.iter_chunks(rows, max_rows=2, max_bytes=sizes[3] + sizes[4]))
+    assert [[r["task_id"] for r in c] for c in chunks] == [
+        ["t0", "t1"],
+        ["t2"],
+        ["t3", "t4"],
+        # A row over the byte limit still goes out, on its own
+        ["t5"],
+    ]
+
+
+def test_retries_transient_errors_then_gives_up(upload: types.ModuleType) -> None:
+    calls = []
+
+    def flaky(errors: list[Exception]):
+        def call() -> str:
+            calls.append(1)
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        return call
+
+    assert (
+        upload.with_retries(flaky([_ServerError("503"), ConnectionError("reset")]), "x")
+        == "ok"
+    )
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(_ServerError):
+        upload.with_retries(flaky([_ServerError("503")] * 3), "x", retries=2)
+    assert len(calls) == 3
+
+    # Permanent errors are not retried
+    calls.clear()
+    with pytest.raises(_GoogleAPIError):
+        upload.with_retries(flaky([_GoogleAPIError("bad request")]), "x")
+    assert calls == [1]
+
+
+def test_load_records_ledger_ids_only_after_the_job_succeeds(
+    upload: types.ModuleType, tmp_path: Path
+) -> None:
+    spool = tmp_path / "rows.ndjson"
+    rows = [{"run_id": RUN_ID, "task_id": f"t{i}"} for i in range(3)]
+    spool.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    ledger = upload.UploadLedger(tmp_path / "ledger")
+
+    FakeClient.job_fail = [_GoogleAPIError("invalid row")]
+    with pytest.raises(_GoogleAPIError):
+        upload.load_to_bigquery(spool, 3, "p", "d", ledger=ledger)
+    assert len(ledger) == 0
+    assert FakeClient.inserts == []
+
+    # The request fails transiently, then the job runs
+    FakeClient.fail = [_ServerError("503")]
+    upload.load_to_bigquery(spool, 3, "p", "d", ledger=ledger)
+    assert [(t, len(r)) for t, r, _ in FakeClient.inserts] == [("tbench_results", 3)]
+    assert sorted(ledger.uploaded("tbench_results")) == [
+        f"{RUN_ID}/t{i}" for i in range(3)
+    ]
+
+
+def test_normalized_split_bytes_report_and_view_columns(
+    upload: types.ModuleType, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    spool = tmp_path / "rows.ndjson"
+    rows = [
+        {
+            **dict.fromkeys(upload.RESULT_COLUMNS),
+            "run_id": run_id,
+            "task_id": f"task-{i}__abc",
+            "dataset": "terminal-bench@2.0",
+            "passed": True,
+            "run_result_json": json.dumps({"stats": "x" * 1000}),
+        }
+        for run_id in ("r1", "r2")
+        for i in range(3)
+    ]
+    spool.write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+    uploads = upload.write_upload_spools(spool, tmp_path, "normalized")
+    assert {table: n for table, (_, n) in uploads.items()} == {
+        "tbench_runs": 2,
+        "tbench_trials": 6,
+    }
+    runs = list(upload.iter_spool(uploads["tbench_runs"][0]))
+    trials = list(upload.iter_spool(uploads["tbench_trials"][0]))
+    assert [r["run_id"] for r in runs] == ["r1", "r2"]
+    assert {tuple(r) for r in runs} == {upload.RUN_COLUMNS}
+    assert {tuple(t) for t in trials} == {upload.TRIAL_COLUMNS}
+
+    # The job blob is stored once per run instead of once per trial
+    upload.print_bytes_report(spool)
+    report = capsys.readouterr().out
+    wide, normalized = (
+        float(mb)
+        for mb in re.search(
+            r"of which job blobs\s+([\d.]+) MB\s+([\d.]+) MB", report
+        ).groups()
+    )
+    assert normalized * 3 == pytest.approx(wide, abs=0.01)
+
+    view = upload.normalized_schema_sql("p", "d")[-1]
+    wide_select, normalized_select = view.split("UNION ALL")
+    listed = re.search(r"SELECT (.*)\n", wide_select).group(1).split(", ")
+    aliases = re.findall(r" AS (\w+),?\n", normalized_select.split("FROM")[0])
+    assert listed == aliases == list(upload.RESULT_COLUMNS)
@@ -5,6 +5,13 @@ Upload Terminal-Bench results to BigQuery.
 Reads Harbor output from jobs/<timestamp>/ and uploads one row per trial
 to the benchmarks.tbench_results table.
 
+With --layout normalized, job-level fields (GitHub context, run stats and the
+job result.json blob) go once per job to tbench_runs and trials go to a slim
+tbench_trials table joined by run_id, instead of being repeated on every
+trial row. The tbench_results_compat view (--create-schema) presents the old
+table and the normalized tables with the tbench_results columns, so existing
+queries only need the table name changed.
+
 Usage:
     # Upload results from CI (uses GOOGLE_APPLICATION_CREDENTIALS)
     python scripts/upload-tbench-results.py
@@ -12,6 +19,47 @@ Usage:
     # Dry run (print rows without uploading)
     python scripts/upload-tbench-results.py --dry-run
 
+    # Also append per-task rollups to a local trend store
+    python scripts/upload-tbench-results.py --trend-store tbench_trends.sqlite
+
+    # One load job from the NDJSON spool instead of chunked streaming inserts
+    python scripts/upload-tbench-results.py --upload-method load
+
+    # Create the normalized tables and view, then upload to them
+    python scripts/upload-tbench-results.py --create-schema --layout normalized
+
+    # Bytes stored/scanned per layout for these results, without uploading
+    python scripts/upload-tbench-results.py --dry-run --bytes-report
+
+    # Offline: write to a local SQLite database with the same schema
+    python scripts/upload-tbench-results.py --sink sqlite
+
+    # While Harbor runs: upload each trial to tbench_trials as soon as its
+    # result.json appears (until SIGINT/SIGTERM), then upload the complete
+    # rows once the run is over
+    python scripts/upload-tbench-results.py --watch &
+    ...
+    kill %1 && wait
+    python scripts/upload-tbench-results.py
+
+Rows are written one at a time to a newline-delimited JSON spool (kept with
+--spool PATH) and uploaded from there, either in bounded insertAll chunks or
+as a single load job, so memory stays flat however many trials there are.
+Transient BigQuery errors are retried with exponential backoff.
+
+Every row has a deterministic insert ID (run_id/trial folder, or run_id for
+tbench_runs rows), and the table and ID of each uploaded row are appended to a
+local ledger (--ledger). Uploads skip rows already in the ledger, so retries
+and the final sweep never upload a row to a table twice.
+
+--watch only uploads trial-level columns, to tbench_trials, since job-level
+fields (outcome counts, accuracy, the job result.json) are not final until
+the job is. The compat view lists those trials right away, with NULL
+job-level fields. The final sweep writes the job-level fields: the tbench_runs
+row (normalized, as in CI) next to the trials the watcher already uploaded,
+or complete tbench_results rows (wide), which then replace the watched trials
+in the view.
+
 Environment variables (from GitHub Actions):
     GITHUB_RUN_ID, GITHUB_WORKFLOW, GITHUB_SHA, GITHUB_REF,
     GITHUB_ACTOR, GITHUB_EVENT_NAME
@@ -19,11 +67,112 @@ Environment variables (from GitHub Actions):
     BQ_DATASET (default: benchmarks)
 """
 
+import contextlib
+import functools
 import json
 import os
+import random
+import signal
 import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable, Container, Iterable, Iterator
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# insertAll requests are capped at 10 MB and BigQuery recommends ~500 rows
+INSERT_CHUNK_ROWS = 500
+INSERT_CHUNK_BYTES = 8 * 1024 * 1024
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+LEDGER_PATH = Path(".tbench-upload-ledger")
+WATCH_INTERVAL = 15.0
+
+RESULTS_TABLE = "tbench_results"
+RUNS_TABLE = "tbench_runs"
+TRIALS_TABLE = "tbench_trials"
+COMPAT_VIEW = "tbench_results_compat"
+
+# tbench_results columns, in table order, with their BigQuery types
+RESULT_COLUMNS: dict[str, str] = {
+    "run_id": "STRING",
+    "task_id": "STRING",
+    "github_run_id": "INT64",
+    "github_workflow": "STRING",
+    "github_sha": "STRING",
+    "github_ref": "STRING",
+    "github_actor": "STRING",
+    "github_event_name": "STRING",
+    "model_name": "STRING",
+    "thinking_level": "STRING",
+    "mode": "STRING",
+    "dataset": "STRING",
+    "experiments": "STRING",
+    "run_started_at": "TIMESTAMP",
+    "run_completed_at": "TIMESTAMP",
+    "n_resolved": "INT64",
+    "n_unresolved": "INT64",
+    "accuracy": "FLOAT64",
+    "passed": "BOOL",
+    "score": "FLOAT64",
+    "n_input_tokens": "INT64",
+    "n_output_tokens": "INT64",
+    "run_result_json": "STRING",
+    "run_metadata_json": "STRING",
+    "task_result_json": "STRING",
+    "ingested_at": "TIMESTAMP",
+    "trial_started_at": "TIMESTAMP",
+    "trial_finished_at": "TIMESTAMP",
+    "trial_duration_sec": "FLOAT64",
+    "environment_setup_sec": "FLOAT64",
+    "agent_setup_sec": "FLOAT64",
+    "agent_execution_sec": "FLOAT64",
+    "verifier_sec": "FLOAT64",
+}
+# Harbor trial phases (result.json keys) with their duration columns
+TRIAL_PHASES = {
+    "environment_setup": "environment_setup_sec",
+    "agent_setup": "agent_setup_sec",
+    "agent_execution": "agent_execution_sec",
+    "verifier": "verifier_sec",
+}
+# Normalized layout: per-trial columns (model/thinking/mode can differ from
+# the job's) and everything else once per job
+TRIAL_COLUMNS = (
+    "run_id",
+    "task_id",
+    "model_name",
+    "thinking_level",
+    "mode",
+    "passed",
+    "score",
+    "n_input_tokens",
+    "n_output_tokens",
+    "task_result_json",
+    "ingested_at",
+    "trial_started_at",
+    "trial_finished_at",
+    "trial_duration_sec",
+    *TRIAL_PHASES.values(),
+)
+RUN_COLUMNS = (
+    ("run_id",)
+    + tuple(c for c in RESULT_COLUMNS if c not in TRIAL_COLUMNS)
+    + ("ingested_at",)
+)
+TABLE_COLUMNS = {
+    RESULTS_TABLE: tuple(RESULT_COLUMNS),
+    RUNS_TABLE: RUN_COLUMNS,
+    TRIALS_TABLE: TRIAL_COLUMNS,
+}
+# BigQuery logical bytes per value; STRING is 2 + UTF-8 length
+_TYPE_BYTES = {"INT64": 8, "FLOAT64": 8, "BOOL": 1, "TIMESTAMP": 8}
 
 
 def find_job_folders() -> list[Path]:
@@ -102,16 +251,154 @@ def extract_token_counts(trial_result: dict) -> tuple[int | None, int | None]:
     return n_input_tokens, n_output_tokens
 
 
-def build_rows(job_folder: Path) -> list[dict]:
-    """Build BigQuery rows for all trials in a job folder."""
-    rows = []
+def parse_timestamp(value: object) -> datetime | None:
+    """Harbor ISO-8601 timestamp (naive ones are UTC), or None."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
 
-    # Load job-level files
+def _seconds(started: datetime | None, finished: datetime | None) -> float | None:
+    if started is None or finished is None:
+        return None
+    return max(0.0, (finished - started).total_seconds())
+
+
+def _mtime(path: Path) -> datetime | None:
+    try:
+        return datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+    except OSError:
+        return None
+
+
+def extract_trial_timing(trial_result: dict, trial_folder: Path) -> dict:
+    """
+    Start/end, wall-clock duration and per-phase durations of a trial.
+
+    Harbor records started_at/finished_at for the trial and for each phase
+    (environment setup, agent setup, agent execution, verifier). When the
+    trial timestamps are missing, the trial's config.json (written when it
+    starts) and result.json (written when it ends) modification times are
+    used instead; phases without timestamps stay NULL.
+    """
+    started = parse_timestamp(trial_result.get("started_at")) or _mtime(
+        trial_folder / "config.json"
+    )
+    finished = parse_timestamp(trial_result.get("finished_at")) or _mtime(
+        trial_folder / "result.json"
+    )
+
+    timing = {
+        "trial_started_at": started.isoformat() if started else None,
+        "trial_finished_at": finished.isoformat() if finished else None,
+        "trial_duration_sec": _seconds(started, finished),
+    }
+    for phase, column in TRIAL_PHASES.items():
+        info = trial_result.get(phase) or {}
+        timing[column] = _seconds(
+            parse_timestamp(info.get("started_at")),
+            parse_timestamp(info.get("finished_at")),
+        )
+    return timing
+
+
+def count_outcomes(job_folder: Path) -> tuple[int, int]:
+    """(resolved, unresolved) trials of a job folder."""
+    n_resolved = n_unresolved = 0
+    for trial_folder in job_folder.iterdir():
+        if not trial_folder.is_dir():
+            continue
+        trial_result = load_json(trial_folder / "result.json")
+        if not trial_result:
+            continue
+        passed = extract_trial_passed(trial_result, extract_trial_score(trial_result))
+        if passed is True:
+            n_resolved += 1
+        elif passed is False:
+            n_unresolved += 1
+    return n_resolved, n_unresolved
+
+
+def job_agent_defaults(job_config: dict) -> tuple[str | None, str | None, str | None]:
+    """Job-level (model_name, thinking_level, mode), used when a trial has none."""
+    job_agents = job_config.get("agents", [{}])
+    if not job_agents:
+        return None, None, None
+    kwargs = job_agents[0].get("kwargs", {})
+    return (
+        job_agents[0].get("model_name"),
+        kwargs.get("thinking_level"),
+        kwargs.get("mode"),
+    )
+
+
+def iter_trials(job_folder: Path, skip: Container[str] = ()) -> Iterator[dict]:
+    """Yield the trial-level columns (TRIAL_COLUMNS) of each finished trial.
+
+    Only the job config.json is read besides the trials, so this is cheap to
+    repeat while Harbor runs. Trials whose insert ID is in ``skip`` are not read.
+    """
     job_config = load_json(job_folder / "config.json") or {}
-    job_result = load_json(job_folder / "result.json") or {}
+    job_model_name, job_thinking_level, job_mode = job_agent_defaults(job_config)
 
     run_id = job_folder.name
 
+    # Iterate trial folders
+    for trial_folder in job_folder.iterdir():
+        if not trial_folder.is_dir() or f"{run_id}/{trial_folder.name}" in skip:
+            continue
+
+        trial_result = load_json(trial_folder / "result.json")
+        if not trial_result:
+            continue
+
+        # Load trial-level config for model_name etc.
+        trial_config = load_json(trial_folder / "config.json") or {}
+        trial_agent = trial_config.get("agent", {})
+        
+        # Prefer trial-level config, fall back to job-level
+        model_name = trial_agent.get("model_name") or job_model_name
+        thinking_level = trial_agent.get("kwargs", {}).get("thinking_level") or job_thinking_level
+        mode = trial_agent.get("kwargs", {}).get("mode") or job_mode
+
+        task_id = trial_folder.name
+
+        # Per-trial fields (Harbor stores score under verifier_result.rewards.reward)
+        score = extract_trial_score(trial_result)
+        passed = extract_trial_passed(trial_result, score)
+
+        # Token usage from context (if available in result)
+        n_input_tokens, n_output_tokens = extract_token_counts(trial_result)
+
+        yield {
+            "run_id": run_id,
+            "task_id": task_id,
+            "model_name": model_name,
+            "thinking_level": thinking_level,
+            "mode": mode,
+            "passed": passed,
+            "score": score,
+            "n_input_tokens": n_input_tokens,
+            "n_output_tokens": n_output_tokens,
+            "task_result_json": json.dumps(trial_result),
+            "ingested_at": datetime.now(timezone.utc).isoformat(),
+            **extract_trial_timing(trial_result, trial_folder),
+        }
+
+
+def iter_rows(job_folder: Path, skip: Container[str] = ()) -> Iterator[dict]:
+    """Yield BigQuery rows for the trials in a job folder, one at a time.
+
+    Trials whose insert ID is in ``skip`` are not read.
+    """
+    # Load job-level files
+    job_config = load_json(job_folder / "config.json") or {}
+    job_result = load_json(job_folder / "result.json") or {}
+
     # Extract top-level stats from Harbor result.json
     stats = job_result.get("stats", {})
     n_total_trials = job_result.get("n_total_trials") or stats.get("n_trials", 0)
@@ -125,9 +412,8 @@ def build_rows(job_folder: Path) -> list[dict]:
             mean_scores.append(metrics[0]["mean"])
     accuracy = sum(mean_scores) / len(mean_scores) if mean_scores else None
 
-    # Count resolved/unresolved from trial results
-    n_resolved = 0
-    n_unresolved = 0
+    # Counted up front so each row is complete when it is yielded
+    n_resolved, n_unresolved = count_outcomes(job_folder)
 
     # GitHub context from environment
     github_run_id = os.environ.get("GITHUB_RUN_ID")
@@ -139,12 +425,6 @@ def build_rows(job_folder: Path) -> list[dict]:
         "github_actor": os.environ.get("GITHUB_ACTOR"),
         "github_event_name": os.environ.get("GITHUB_EVENT_NAME"),
     }
-
-    # Run configuration (job-level fallbacks)
-    job_agents = job_config.get("agents", [{}])
-    job_model_name = job_agents[0].get("model_name") if job_agents else None
-    job_thinking_level = job_agents[0].get("kwargs", {}).get("thinking_level") if job_agents else None
-    job_mode = job_agents[0].get("kwargs", {}).get("mode") if job_agents else None
     
     # Dataset from job config
     datasets = job_config.get("datasets", [{}])
@@ -156,89 +436,488 @@ def build_rows(job_folder: Path) -> list[dict]:
 
     experiments = os.environ.get("UNIX_EXPERIMENTS")
 
+    # Job start/end (Harbor job result.json; absent while the job is running)
+    run_started_at = parse_timestamp(job_result.get("started_at"))
+    run_completed_at = parse_timestamp(job_result.get("finished_at"))
+
     # Raw JSON for future-proofing
     run_result_json = json.dumps(job_result) if job_result else None
     run_metadata_json = None  # Harbor doesn't have separate run_metadata.json
 
-    # Iterate trial folders
-    for trial_folder in job_folder.iterdir():
-        if not trial_folder.is_dir():
+    job_fields = {
+        **github_context,
+        "dataset": dataset,
+        "experiments": experiments,
+        "run_started_at": run_started_at.isoformat() if run_started_at else None,
+        "run_completed_at": (
+            run_completed_at.isoformat() if run_completed_at else None
+        ),
+        "n_resolved": n_resolved,
+        "n_unresolved": n_unresolved,
+        "accuracy": accuracy,
+        "run_result_json": run_result_json,
+        "run_metadata_json": run_metadata_json,
+    }
+    for trial in iter_trials(job_folder, skip):
+        # Columns in table order
+        yield {c: trial[c] if c in trial else job_fields[c] for c in RESULT_COLUMNS}
+
+
+def write_spool(job_folders: list[Path], spool: Path) -> int:
+    """Write the rows of all job folders to an NDJSON file; returns the row count."""
+    total = 0
+    with spool.open("w") as f:
+        for job_folder in job_folders:
+            n = 0
+            for row in iter_rows(job_folder):
+                f.write(json.dumps(row, default=str) + "\n")
+                n += 1
+            total += n
+            print(f"Found {n} trial(s) in {job_folder.name}")
+    return total
+
+
+def iter_spool(spool: Path) -> Iterator[dict]:
+    with spool.open() as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def iter_chunks(
+    rows: Iterable[dict],
+    max_rows: int = INSERT_CHUNK_ROWS,
+    max_bytes: int = INSERT_CHUNK_BYTES,
+) -> Iterator[list[dict]]:
+    """Group rows into insertAll requests of at most max_rows rows / ~max_bytes."""
+    chunk: list[dict] = []
+    size = 0
+    for row in rows:
+        row_size = len(json.dumps(row, default=str))
+        if chunk and (len(chunk) >= max_rows or size + row_size > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(row)
+        size += row_size
+    if chunk:
+        yield chunk
+
+
+def insert_id(row: dict) -> str:
+    """Deterministic insertAll ID, so a retried chunk is not inserted twice.
+
+    Trial rows are identified by run and trial folder, tbench_runs rows by run.
+    """
+    if "task_id" not in row:
+        return str(row["run_id"])
+    return f"{row['run_id']}/{row['task_id']}"
+
+
+class UploadLedger:
+    """
+    Insert IDs of rows already in BigQuery, per table, appended to a file
+    ("<table> <insert ID>" per line) as each upload is confirmed.
+
+    insertAll deduplicates insert IDs only best-effort, for a few minutes;
+    the ledger is what lets the final sweep skip rows uploaded hours earlier
+    by --watch or by an interrupted run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._ids: dict[str, set[str]] = {}
+        try:
+            lines = path.read_text().splitlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            table, _, row_id = line.partition(" ")
+            if row_id:
+                self._ids.setdefault(table, set()).add(row_id)
+
+    def uploaded(self, table: str) -> Container[str]:
+        """Insert IDs of the rows already uploaded to ``table``."""
+        return self._ids.setdefault(table, set())
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._ids.values())
+
+    def add(self, table: str, row_ids: Iterable[str]) -> None:
+        ids = self._ids.setdefault(table, set())
+        new = [i for i in dict.fromkeys(row_ids) if i not in ids]
+        if not new:
+            return
+        with self.path.open("a") as f:
+            f.write("".join(f"{table} {i}\n" for i in new))
+            f.flush()
+            os.fsync(f.fileno())
+        ids.update(new)
+
+
+def write_upload_spools(
+    spool: Path, out_dir: Path, layout: str, ledger: UploadLedger | None = None
+) -> dict[str, tuple[Path, int]]:
+    """
+    NDJSON files to upload per table, without the rows the ledger has for
+    that table (already uploaded).
+
+    The wide layout uploads the spooled rows as they are; the normalized one
+    splits them into tbench_runs and tbench_trials rows. Returns
+    {table: (path, row count)}. Only the IDs of runs already written are kept
+    in memory.
+    """
+    if layout == "wide":
+        tables = {RESULTS_TABLE: None}
+    else:
+        tables = {RUNS_TABLE: RUN_COLUMNS, TRIALS_TABLE: TRIAL_COLUMNS}
+    paths = {table: out_dir / f"{table}.ndjson" for table in tables}
+    counts = dict.fromkeys(tables, 0)
+    seen_runs: set[str] = set()
+    with contextlib.ExitStack() as stack:
+        files = {table: stack.enter_context(p.open("w")) for table, p in paths.items()}
+        for row in iter_spool(spool):
+            for table, columns in tables.items():
+                if table == RUNS_TABLE:
+                    if row["run_id"] in seen_runs:
+                        continue
+                    seen_runs.add(row["run_id"])
+                out = row if columns is None else {c: row.get(c) for c in columns}
+                if ledger is not None and insert_id(out) in ledger.uploaded(table):
+                    continue
+                files[table].write(json.dumps(out, default=str) + "\n")
+                counts[table] += 1
+    return {table: (paths[table], counts[table]) for table in tables}
+
+
+def logical_bytes(row: dict, columns: Iterable[str]) -> int:
+    """BigQuery logical (billed) bytes of a row's columns; NULLs are free."""
+    total = 0
+    for column in columns:
+        value = row.get(column)
+        if value is None:
             continue
+        kind = RESULT_COLUMNS[column]
+        total += 2 + len(str(value).encode()) if kind == "STRING" else _TYPE_BYTES[kind]
+    return total
+
+
+def print_bytes_report(spool: Path) -> None:
+    """
+    Bytes stored (= scanned by ``SELECT *``) by the wide and normalized
+    layouts, and scanned by a pass-rate query on the outcome columns.
+    """
+    outcome_columns = ("run_id", "task_id", "model_name", "thinking_level", "passed")
+    # [wide, normalized] per line of the report
+    stored = [0, 0]
+    blobs = [0, 0]
+    outcomes = [0, 0]
+    seen_runs: set[str] = set()
+    for row in iter_spool(spool):
+        stored[0] += logical_bytes(row, RESULT_COLUMNS)
+        blobs[0] += logical_bytes(row, ("run_result_json",))
+        outcomes[0] += logical_bytes(row, (*outcome_columns, "dataset"))
+        stored[1] += logical_bytes(row, TRIAL_COLUMNS)
+        outcomes[1] += logical_bytes(row, outcome_columns)
+        if row["run_id"] not in seen_runs:
+            seen_runs.add(row["run_id"])
+            stored[1] += logical_bytes(row, RUN_COLUMNS)
+            blobs[1] += logical_bytes(row, ("run_result_json",))
+            # dataset filter: read once per run through the join
+            outcomes[1] += logical_bytes(row, ("run_id", "dataset"))
+
+    print("\n=== Bytes stored / scanned (BigQuery logical bytes) ===")
+    print(f"  {'':<26} {'wide':>12} {'normalized':>12}")
+    for label, (wide, normalized) in (
+        ("stored / SELECT * scan", stored),
+        ("  of which job blobs", blobs),
+        ("pass-rate query scan", outcomes),
+    ):
+        print(f"  {label:<26} {wide / 1e6:>9.2f} MB {normalized / 1e6:>9.2f} MB")
+
+
+def create_table_sql(project_id: str, dataset: str, name: str) -> str:
+    """DDL for tbench_runs or tbench_trials (a no-op if the table exists)."""
+    body = ",\n    ".join(f"{c} {RESULT_COLUMNS[c]}" for c in TABLE_COLUMNS[name])
+    return (
+        f"CREATE TABLE IF NOT EXISTS `{project_id}.{dataset}.{name}` (\n    {body}\n)\n"
+        "PARTITION BY DATE(ingested_at)\nCLUSTER BY run_id"
+    )
 
-        trial_result = load_json(trial_folder / "result.json")
-        if not trial_result:
-            continue
 
-        # Load trial-level config for model_name etc.
-        trial_config = load_json(trial_folder / "config.json") or {}
-        trial_agent = trial_config.get("agent", {})
-        
-        # Prefer trial-level config, fall back to job-level
-        model_name = trial_agent.get("model_name") or job_model_name
-        thinking_level = trial_agent.get("kwargs", {}).get("thinking_level") or job_thinking_level
-        mode = trial_agent.get("kwargs", {}).get("mode") or job_mode
+def normalized_schema_sql(project_id: str, dataset: str) -> list[str]:
+    """DDL for tbench_runs, tbench_trials and the tbench_results_compat view."""
+    prefix = f"`{project_id}.{dataset}"
+
+    # Trial columns come from the trials table, the rest from the run; the
+    # old table stays in the view so history before the switch is included.
+    # Trials are shown as soon as they are uploaded (--watch), with NULL
+    # job-level fields until the run row lands; ingested_at then moves to the
+    # run's so incremental readers (results_mirror.py) fetch the row again.
+    # Trials also present in the old table (watched, then swept in the wide
+    # layout) come from there only.
+    def column(c: str) -> str:
+        if c == "ingested_at":
+            return "IFNULL(GREATEST(t.ingested_at, r.ingested_at), t.ingested_at)"
+        return f"t.{c}" if c in TRIAL_COLUMNS else f"r.{c}"
+
+    joined = ",\n    ".join(f"{column(c)} AS {c}" for c in RESULT_COLUMNS)
+    view = (
+        f"CREATE OR REPLACE VIEW {prefix}.{COMPAT_VIEW}` AS\n"
+        f"SELECT {', '.join(RESULT_COLUMNS)}\nFROM {prefix}.{RESULTS_TABLE}`\n"
+        f"UNION ALL\nSELECT\n    {joined}\n"
+        f"FROM {prefix}.{TRIALS_TABLE}` AS t\n"
+        f"LEFT JOIN {prefix}.{RUNS_TABLE}` AS r USING (run_id)\n"
+        f"WHERE NOT EXISTS (\n    SELECT 1 FROM {prefix}.{RESULTS_TABLE}` AS w\n"
+        "    WHERE w.run_id = t.run_id AND w.task_id = t.task_id\n)"
+    )
+    return [
+        create_table_sql(project_id, dataset, RUNS_TABLE),
+        create_table_sql(project_id, dataset, TRIALS_TABLE),
+        view,
+    ]
 
-        task_id = trial_folder.name
 
-        # Per-trial fields (Harbor stores score under verifier_result.rewards.reward)
-        score = extract_trial_score(trial_result)
-        passed = extract_trial_passed(trial_result, score)
+_checked_tables: set[str] = set()
 
-        # Track resolved/unresolved
-        if passed is True:
-            n_resolved += 1
-        elif passed is False:
-            n_unresolved += 1
 
-        # Token usage from context (if available in result)
-        n_input_tokens, n_output_tokens = extract_token_counts(trial_result)
+def ensure_columns(client, table_id: str, table: str) -> None:
+    """
+    Add columns the rows have but the table lacks (e.g. timing columns added
+    after the table was created), so inserts and loads don't reject them.
+    """
+    if table_id in _checked_tables:
+        return
+    from google.api_core import exceptions as api_exceptions
+    from google.cloud import bigquery
 
-        row = {
-            "run_id": run_id,
-            "task_id": task_id,
-            **github_context,
-            "model_name": model_name,
-            "thinking_level": thinking_level,
-            "mode": mode,
-            "dataset": dataset,
-            "experiments": experiments,
-            "run_started_at": None,  # Not available in Harbor format
-            "run_completed_at": None,
-            "n_resolved": None,  # Will be set after counting all trials
-            "n_unresolved": None,
-            "accuracy": accuracy,
-            "passed": passed,
-            "score": score,
-            "n_input_tokens": n_input_tokens,
-            "n_output_tokens": n_output_tokens,
-            "run_result_json": run_result_json,
-            "run_metadata_json": run_metadata_json,
-            "task_result_json": json.dumps(trial_result),
-            "ingested_at": datetime.now(timezone.utc).isoformat(),
-        }
-        rows.append(row)
+    try:
+        bq_table = client.get_table(table_id)
+    except api_exceptions.NotFound:
+        return
+    existing = {field.name for field in bq_table.schema}
+    missing = [c for c in TABLE_COLUMNS[table] if c not in existing]
+    if missing:
+        bq_table.schema = [
+            *bq_table.schema,
+            *(bigquery.SchemaField(c, RESULT_COLUMNS[c]) for c in missing),
+        ]
+        client.update_table(bq_table, ["schema"])
+        print(f"Added column(s) to {table_id}: {', '.join(missing)}")
+    _checked_tables.add(table_id)
+
+
+def create_schema(project_id: str, dataset: str) -> None:
+    from google.cloud import bigquery
 
-    # Update n_resolved/n_unresolved on all rows
-    for row in rows:
-        row["n_resolved"] = n_resolved
-        row["n_unresolved"] = n_unresolved
+    client = bigquery.Client(project=project_id)
+    # The view selects every tbench_results column, including newer ones
+    ensure_columns(client, f"{project_id}.{dataset}.{RESULTS_TABLE}", RESULTS_TABLE)
+    for statement in normalized_schema_sql(project_id, dataset):
+        client.query(statement).result()
+    print(
+        f"Created {RUNS_TABLE}, {TRIALS_TABLE} and view {COMPAT_VIEW} "
+        f"in {project_id}.{dataset}"
+    )
 
-    return rows
 
+def with_retries(call: Callable[[], T], what: str, retries: int = MAX_RETRIES) -> T:
+    """Run a BigQuery call, retrying transient errors with exponential backoff."""
+    import requests
+    from google.api_core import exceptions as api_exceptions
 
-def upload_to_bigquery(rows: list[dict], project_id: str, dataset: str) -> None:
-    """Upload rows to BigQuery using the Python client."""
+    transient = (
+        api_exceptions.ServerError,
+        api_exceptions.TooManyRequests,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    )
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except transient as e:
+            if attempt == retries:
+                raise
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+            delay += random.uniform(0, RETRY_BASE_DELAY)
+            print(
+                f"  {what} failed ({e}); retry {attempt + 1}/{retries} in {delay:.1f}s",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def upload_to_bigquery(
+    rows: Iterable[dict],
+    n_rows: int,
+    project_id: str,
+    dataset: str,
+    chunk_rows: int = INSERT_CHUNK_ROWS,
+    chunk_bytes: int = INSERT_CHUNK_BYTES,
+    table: str = RESULTS_TABLE,
+    ledger: UploadLedger | None = None,
+) -> None:
+    """Stream rows to BigQuery in bounded insertAll chunks.
+
+    Each confirmed chunk is recorded in the ledger, so an interrupted upload
+    resumes after the last chunk that made it.
+    """
     from google.cloud import bigquery
 
     client = bigquery.Client(project=project_id)
-    table_id = f"{project_id}.{dataset}.tbench_results"
+    table_id = f"{project_id}.{dataset}.{table}"
+    ensure_columns(client, table_id, table)
+
+    uploaded = 0
+    started = time.monotonic()
+    for i, chunk in enumerate(iter_chunks(rows, chunk_rows, chunk_bytes), 1):
+        row_ids = [insert_id(row) for row in chunk]
+        insert = functools.partial(
+            client.insert_rows_json, table_id, chunk, row_ids=row_ids
+        )
+        errors = with_retries(insert, f"chunk {i}")
+        if errors:
+            print(f"BigQuery insert errors: {errors}", file=sys.stderr)
+            sys.exit(1)
+        if ledger is not None:
+            ledger.add(table, row_ids)
+        uploaded += len(chunk)
+        elapsed = time.monotonic() - started
+        print(
+            f"  chunk {i}: {uploaded}/{n_rows} row(s) "
+            f"({uploaded / n_rows:.0%}, {uploaded / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+
+    print(f"Uploaded {uploaded} row(s) to {table_id}")
+
+
+def load_to_bigquery(
+    spool: Path,
+    n_rows: int,
+    project_id: str,
+    dataset: str,
+    table: str = RESULTS_TABLE,
+    ledger: UploadLedger | None = None,
+) -> None:
+    """Append the spooled rows to BigQuery with a single load job."""
+    from google.api_core import exceptions as api_exceptions
+    from google.cloud import bigquery
 
-    errors = client.insert_rows_json(table_id, rows)
-    if errors:
-        print(f"BigQuery insert errors: {errors}", file=sys.stderr)
-        sys.exit(1)
+    client = bigquery.Client(project=project_id)
+    table_id = f"{project_id}.{dataset}.{table}"
+    ensure_columns(client, table_id, table)
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+    )
+    # One job ID for all attempts: if a retried request had in fact created
+    # the job, wait for that job instead of loading the rows twice
+    job_id = f"tbench_results_{uuid.uuid4().hex}"
+
+    def run_load() -> None:
+        try:
+            with spool.open("rb") as f:
+                job = client.load_table_from_file(
+                    f, table_id, job_id=job_id, job_config=job_config
+                )
+        except api_exceptions.Conflict:
+            job = client.get_job(job_id)
+        job.result()
+
+    size_mb = spool.stat().st_size / 1e6
+    print(f"Loading {n_rows} row(s) ({size_mb:.1f} MB) into {table_id} ({job_id})")
+    with_retries(run_load, "load job")
+    if ledger is not None:
+        ledger.add(table, (insert_id(row) for row in iter_spool(spool)))
+    print(f"Uploaded {n_rows} row(s) to {table_id}")
+
+
+def upload_finished_trials(
+    project_id: str, dataset: str, ledger: UploadLedger
+) -> int:
+    """
+    One --watch poll: upload the trial-level rows of trials that finished
+    since the last poll to tbench_trials. Returns the number of rows uploaded.
+
+    Trials already in the ledger are skipped without reading their files.
+    """
+    skip = ledger.uploaded(TRIALS_TABLE)
+    rows = [
+        row
+        for job_folder in find_job_folders()
+        for row in iter_trials(job_folder, skip)
+    ]
+    if rows:
+        upload_to_bigquery(
+            rows, len(rows), project_id, dataset, table=TRIALS_TABLE, ledger=ledger
+        )
+    return len(rows)
+
+
+def watch(
+    project_id: str,
+    dataset: str,
+    ledger: UploadLedger,
+    interval: float = WATCH_INTERVAL,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Upload each trial to tbench_trials as soon as its result.json can be
+    read, until SIGINT/SIGTERM (after one last poll) or ``stop`` is set.
+
+    Only trial-level columns are uploaded: job-level fields are not final
+    until the job is, so they are left to the final sweep (see main()).
+    Failed uploads are retried on the next poll.
+    """
+    import requests
+    from google.api_core import exceptions as api_exceptions
+    from google.cloud import bigquery
+
+    if stop is None:
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+    client = bigquery.Client(project=project_id)
+    create = create_table_sql(project_id, dataset, TRIALS_TABLE)
+    with_retries(lambda: client.query(create).result(), f"create {TRIALS_TABLE}")
+    print(f"Watching jobs/ every {interval:g}s ({len(ledger)} row(s) in ledger)")
+    while True:
+        last = stop.is_set()
+        try:
+            upload_finished_trials(project_id, dataset, ledger)
+        except (
+            api_exceptions.GoogleAPIError,
+            requests.exceptions.RequestException,
+        ) as e:
+            print(f"Upload failed, retrying next poll: {e}", file=sys.stderr)
+        if last:
+            return
+        stop.wait(interval)
+
+
+def _add_tbench_path() -> None:
+    # Imported by path: the benchmarks.terminal_bench package pulls in harbor
+    tbench_dir = Path(__file__).resolve().parent.parent / "benchmarks" / "terminal_bench"
+    if str(tbench_dir) not in sys.path:
+        sys.path.insert(0, str(tbench_dir))
+
+
+def write_to_sqlite(rows: Iterable[dict], path: Path | None) -> None:
+    """Write rows to a local tbench_results database (see results_mirror.py)."""
+    _add_tbench_path()
+    import results_mirror  # type: ignore[import-not-found]
 
-    print(f"Uploaded {len(rows)} row(s) to {table_id}")
+    path = path or results_mirror.LOCAL_DB_PATH
+    written = results_mirror.append_rows(path, rows)
+    print(f"Wrote {written} row(s) to {path}")
+
+
+def append_trend_rollups(rows: Iterable[dict], path: Path) -> None:
+    """Append per-task rollups of the uploaded rows to a trend store."""
+    _add_tbench_path()
+    import trend_store  # type: ignore[import-not-found]
+
+    written = trend_store.append_rows(path, rows)
+    print(f"Wrote {written} rollup(s) to {path}")
 
 
 def main() -> None:
@@ -258,32 +937,153 @@ def main() -> None:
         default=os.environ.get("BQ_DATASET", "benchmarks"),
         help="BigQuery dataset",
     )
+    parser.add_argument(
+        "--trend-store",
+        type=Path,
+        help="Append per-task rollups to this trend store (SQLite)",
+    )
+    parser.add_argument(
+        "--upload-method",
+        choices=("insert", "load"),
+        default="insert",
+        help="Chunked streaming inserts (rows queryable immediately) or one "
+        "load job from the spool (default: insert)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=INSERT_CHUNK_ROWS,
+        help=f"Max rows per insert request (default: {INSERT_CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=INSERT_CHUNK_BYTES // (1024 * 1024),
+        help="Max JSON size per insert request in MiB "
+        f"(default: {INSERT_CHUNK_BYTES // (1024 * 1024)})",
+    )
+    parser.add_argument(
+        "--spool",
+        type=Path,
+        help="Keep the NDJSON rows at this path (default: temporary file)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("wide", "normalized"),
+        default="wide",
+        help=f"One {RESULTS_TABLE} row per trial (wide), or {RUNS_TABLE} once "
+        f"per job plus slim {TRIALS_TABLE} rows (normalized) (default: wide)",
+    )
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help=f"Create {RUNS_TABLE}, {TRIALS_TABLE} and the {COMPAT_VIEW} view "
+        "if missing",
+    )
+    parser.add_argument(
+        "--bytes-report",
+        action="store_true",
+        help="Print bytes stored and scanned by the wide and normalized layouts",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=f"Upload trials to {TRIALS_TABLE} as their result.json appears, "
+        "until SIGINT/SIGTERM; run without --watch afterwards for job-level fields",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between polls of jobs/ (default: {WATCH_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=Path,
+        default=LEDGER_PATH,
+        help=f"Insert IDs of uploaded rows, skipped on later uploads "
+        f"(default: {LEDGER_PATH})",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=("bigquery", "sqlite"),
+        default="bigquery",
+        help="Where rows go: BigQuery, or a local SQLite database with the "
+        "tbench_results schema (offline; default: bigquery)",
+    )
+    parser.add_argument(
+        "--sqlite-path",
+        type=Path,
+        help="Database for --sink sqlite (default: "
+        "benchmarks/terminal_bench/.leaderboard_cache/tbench_results_local.sqlite)",
+    )
     args = parser.parse_args()
+    if args.watch and args.dry_run:
+        parser.error("--watch uploads; it cannot be combined with --dry-run")
+    if args.sink == "sqlite" and (args.watch or args.layout != "wide"):
+        parser.error("--sink sqlite writes the wide layout and does not --watch")
+
+    ledger = UploadLedger(args.ledger)
+    if args.watch:
+        if args.create_schema:
+            create_schema(args.project_id, args.dataset)
+        watch(args.project_id, args.dataset, ledger, args.watch_interval)
+        return
 
     job_folders = find_job_folders()
     if not job_folders:
         print("No job folders found in jobs/", file=sys.stderr)
         sys.exit(1)
 
-    all_rows = []
-    for job_folder in job_folders:
-        rows = build_rows(job_folder)
-        all_rows.extend(rows)
-        print(f"Found {len(rows)} trial(s) in {job_folder.name}")
-
-    if not all_rows:
-        print("No trial results found", file=sys.stderr)
-        sys.exit(1)
-
-    if args.dry_run:
-        print(f"\n=== Dry run: {len(all_rows)} row(s) ===")
-        for row in all_rows[:3]:  # Print first 3 rows
-            print(json.dumps(row, indent=2, default=str))
-        if len(all_rows) > 3:
-            print(f"... and {len(all_rows) - 3} more row(s)")
-        return
-
-    upload_to_bigquery(all_rows, args.project_id, args.dataset)
+    with tempfile.TemporaryDirectory(prefix="tbench-rows-") as tmp:
+        spool = args.spool or Path(tmp) / "rows.ndjson"
+        n_rows = write_spool(job_folders, spool)
+
+        if not n_rows:
+            print("No trial results found", file=sys.stderr)
+            sys.exit(1)
+
+        if args.trend_store:
+            append_trend_rollups(iter_spool(spool), args.trend_store)
+
+        if args.bytes_report:
+            print_bytes_report(spool)
+
+        if args.dry_run:
+            print(f"\n=== Dry run: {n_rows} row(s) ===")
+            for _, row in zip(range(3), iter_spool(spool)):  # Print first 3 rows
+                print(json.dumps(row, indent=2, default=str))
+            if n_rows > 3:
+                print(f"... and {n_rows - 3} more row(s)")
+            return
+
+        if args.sink == "sqlite":
+            # Rows are keyed by insert ID, so re-running replaces them
+            write_to_sqlite(iter_spool(spool), args.sqlite_path)
+            return
+
+        if args.create_schema:
+            create_schema(args.project_id, args.dataset)
+
+        uploads = write_upload_spools(spool, Path(tmp), args.layout, ledger)
+        for table, (path, n) in uploads.items():
+            if not n:
+                print(f"All {table} row(s) already uploaded (see {args.ledger})")
+            elif args.upload_method == "load":
+                load_to_bigquery(
+                    path, n, args.project_id, args.dataset, table, ledger=ledger
+                )
+            else:
+                upload_to_bigquery(
+                    iter_spool(path),
+                    n,
+                    args.project_id,
+                    args.dataset,
+                    chunk_rows=args.chunk_rows,
+                    chunk_bytes=args.chunk_mb * 1024 * 1024,
+                    table=table,
+                    ledger=ledger,
+                )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import { describe, expect, test } from "bun:test";
+import type { WorkspaceChatMessage } from "@/common/orpc/types";
+import type { StreamEndEvent } from "@/common/types/stream";
+import type { LanguageModelV2Usage } from "@ai-sdk/provider";
+import { LiveEventLog } from "./liveEventLog";
+
+const MODEL = "anthropic:claude-sonnet-4-5";
+
+function delta(messageId: string, text: string): WorkspaceChatMessage {
+  return {
+    type: "stream-delta",
+    workspaceId: "ws",
+    messageId,
+    delta: text,
+    tokens: 1,
+    timestamp: Date.now(),
+  };
+}
+
+function toolStart(messageId: string, toolCallId: string, args: unknown): WorkspaceChatMessage {
+  return {
+    type: "tool-call-start",
+    workspaceId: "ws",
+    messageId,
+    toolCallId,
+    toolName: "bash",
+    args,
+    tokens: 1,
+    timestamp: Date.now(),
+  };
+}
+
+function usageDelta(
+  messageId: string,
+  cumulativeUsage: LanguageModelV2Usage
+): WorkspaceChatMessage {
+  return {
+    type: "usage-delta",
+    workspaceId: "ws",
+    messageId,
+    usage: cumulativeUsage,
+    cumulativeUsage,
+  };
+}
+
+function streamEnd(
+  messageId: string,
+  texts: string[],
+  usage?: LanguageModelV2Usage
+): StreamEndEvent {
+  return {
+    type: "stream-end",
+    workspaceId: "ws",
+    messageId,
+    metadata: { model: MODEL, usage },
+    parts: texts.map((text) => ({ type: "text" as const, text })),
+  };
+}
+
+function tokens(inputTokens: number, outputTokens: number): LanguageModelV2Usage {
+  return { inputTokens, outputTokens, totalTokens: inputTokens + outputTokens };
+}
+
+describe("LiveEventLog", () => {
+  test("keeps the most recent stream-end for the final output", () => {
+    const log = new LiveEventLog(MODEL);
+    expect(log.finalTexts()).toEqual([]);
+
+    log.record(delta("m1", "Hel"));
+    log.record(streamEnd("m1", ["Plan ready"]));
+    log.record(delta("m2", "Do"));
+    log.record(streamEnd("m2", ["Done.", "", "All tests pass."]));
+    log.record(delta("m3", "late"));
+
+    expect(log.finalStreamEnd?.messageId).toBe("m2");
+    expect(log.finalTexts()).toEqual(["Done.", "All tests pass."]);
+  });
+
+  test("sums stream-end usage, falling back to the last usage-delta", () => {
+    const log = new LiveEventLog(MODEL);
+    log.record(usageDelta("m1", tokens(10, 1)));
+    log.record(usageDelta("m1", tokens(100, 10)));
+    const end1 = streamEnd("m1", []);
+    log.record(end1);
+    expect(log.recordStreamEndUsage(end1)?.input.tokens).toBe(100);
+
+    const end2 = streamEnd("m2", [], tokens(50, 5));
+    log.record(end2);
+    log.recordStreamEndUsage(end2);
+
+    expect(log.totalUsage?.input.tokens).toBe(150);
+    expect(log.totalUsage?.output.tokens).toBe(15);
+    expect(log.totalUsage?.hasUnknownCosts).toBeUndefined();
+    // A stream-end without usage of either kind adds nothing
+    expect(log.recordStreamEndUsage(streamEnd("m3", []))).toBeUndefined();
+    expect(log.totalUsage?.input.tokens).toBe(150);
+  });
+
+  test("releases tool args and usage-deltas once their stream ends", () => {
+    // Replays the event mix run.ts feeds through chatListener; any per-event state
+    // the runner keeps lives here, so a leak shows up as surviving objects
+    const turns = 200;
+    const log = new LiveEventLog(MODEL);
+    const released: Array<WeakRef<object>> = [];
+
+    const runTurn = (turn: number) => {
+      const messageId = `msg-${turn}`;
+      for (let call = 0; call < 3; call++) {
+        const toolCallId = `${messageId}-call-${call}`;
+        const args = { script: `echo ${turn}-${call}` };
+        released.push(new WeakRef(args));
+        log.record(toolStart(messageId, toolCallId, args));
+        log.record(delta(messageId, `step ${call}`));
+        // The last call never ends, as when a stream is interrupted mid-tool
+        if (call < 2) {
+          expect(log.takeToolArgs(toolCallId)).toBe(args);
+        }
+      }
+      const usage = tokens(100, 10);
+      released.push(new WeakRef(usage));
+      log.record(usageDelta(messageId, usage));
+      // Every other turn, stream-end carries no usage and the usage-delta is used
+      const end = streamEnd(messageId, [`turn ${turn}`], turn % 2 ? tokens(100, 10) : undefined);
+      log.record(end);
+      log.recordStreamEndUsage(end);
+      log.clearToolCalls();
+    };
+
+    for (let turn = 0; turn < turns; turn++) {
+      runTurn(turn);
+    }
+    Bun.gc(true);
+
+    expect(log.finalTexts()).toEqual([`turn ${turns - 1}`]);
+    expect(log.totalUsage?.input.tokens).toBe(turns * 100);
+    // Allow a few survivors for conservative stack scanning
+    const survivors = released.filter((ref) => ref.deref() !== undefined).length;
+    expect(survivors).toBeLessThan(8);
+  });
+});
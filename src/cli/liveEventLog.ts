@@ -0,0 +1,106 @@
+/**
+ * Bounded record of the live chat events seen by `unix run`.
+ *
+ * A headless session can stream for hours, so the runner must not keep every event
+ * (each stream-delta is its own object). Only what the run still needs is retained:
+ * - the most recent stream-end, whose text parts are the final answer in --quiet mode
+ * - args of tool calls that have started but not ended, for end formatting
+ * - the latest usage-delta per open message, as fallback when stream-end lacks usage
+ * - a running usage total for the budget check and the cost summary
+ */
+import {
+  isStreamEnd,
+  isToolCallStart,
+  isUsageDelta,
+  type WorkspaceChatMessage,
+} from "@/common/orpc/types";
+import type { StreamEndEvent } from "@/common/types/stream";
+import type { LanguageModelV2Usage } from "@ai-sdk/provider";
+import { createDisplayUsage } from "@/common/utils/tokens/displayUsage";
+import { sumUsageHistory, type ChatUsageDisplay } from "@/common/utils/tokens/usageAggregator";
+
+export class LiveEventLog {
+  private lastStreamEnd: StreamEndEvent | undefined;
+  private readonly toolCallArgs = new Map<string, unknown>();
+  private readonly latestUsageDelta = new Map<
+    string,
+    { usage: LanguageModelV2Usage; providerMetadata?: Record<string, unknown> }
+  >();
+  private total: ChatUsageDisplay | undefined;
+
+  /** @param model CLI model, used to price usage-delta fallbacks */
+  constructor(private readonly model: string) {}
+
+  record(payload: WorkspaceChatMessage): void {
+    if (isToolCallStart(payload)) {
+      this.toolCallArgs.set(payload.toolCallId, payload.args);
+    } else if (isUsageDelta(payload)) {
+      this.latestUsageDelta.set(payload.messageId, {
+        usage: payload.cumulativeUsage,
+        providerMetadata: payload.cumulativeProviderMetadata,
+      });
+    } else if (isStreamEnd(payload)) {
+      this.lastStreamEnd = payload;
+    }
+  }
+
+  /** Args of a started tool call, forgotten once read. */
+  takeToolArgs(toolCallId: string): unknown {
+    const args = this.toolCallArgs.get(toolCallId);
+    this.toolCallArgs.delete(toolCallId);
+    return args;
+  }
+
+  /** Drop args of tool calls that will never end (stream finished or failed). */
+  clearToolCalls(): void {
+    this.toolCallArgs.clear();
+  }
+
+  /**
+   * Add a stream-end's usage to the running total and return it.
+   *
+   * Prefers the stream-end metadata and falls back to the message's last usage-delta;
+   * either way the message's usage-delta is dropped.
+   */
+  recordStreamEndUsage(payload: StreamEndEvent): ChatUsageDisplay | undefined {
+    const fallback = this.latestUsageDelta.get(payload.messageId);
+    this.latestUsageDelta.delete(payload.messageId);
+    const usage = payload.metadata.usage
+      ? createDisplayUsage(
+          payload.metadata.usage,
+          payload.metadata.model,
+          payload.metadata.providerMetadata
+        )
+      : fallback && createDisplayUsage(fallback.usage, this.model, fallback.providerMetadata);
+    if (!usage) return undefined;
+
+    const total = sumUsageHistory(this.total ? [this.total, usage] : [usage]);
+    // The folded total has numeric costs, so carry the flag over explicitly
+    if (total && this.total?.hasUnknownCosts) {
+      total.hasUnknownCosts = true;
+    }
+    this.total = total;
+    return usage;
+  }
+
+  /** Usage summed over every stream-end so far. */
+  get totalUsage(): ChatUsageDisplay | undefined {
+    return this.total;
+  }
+
+  /** The most recent stream-end event, if any. */
+  get finalStreamEnd(): StreamEndEvent | undefined {
+    return this.lastStreamEnd;
+  }
+
+  /** Non-empty text parts of the most recent stream-end, in order. */
+  finalTexts(): string[] {
+    const texts: string[] = [];
+    for (const part of this.lastStreamEnd?.parts ?? []) {
+      if (part.type === "text" && part.text) {
+        texts.push(part.text);
+      }
+    }
+    return texts;
+  }
+}
@@ -42,12 +42,7 @@ import {
   type WorkspaceChatMessage,
 } from "@/common/orpc/types";
 import { createDisplayUsage } from "@/common/utils/tokens/displayUsage";
-import {
-  getTotalCost,
-  formatCostWithDollar,
-  sumUsageHistory,
-  type ChatUsageDisplay,
-} from "@/common/utils/tokens/usageAggregator";
+import { getTotalCost, formatCostWithDollar } from "@/common/utils/tokens/usageAggregator";
 import {
   formatToolStart,
   formatToolEnd,
@@ -55,6 +50,7 @@ import {
   formatGenericToolEnd,
   isMultilineResultTool,
 } from "./toolFormatters";
+import { LiveEventLog } from "./liveEventLog";
 import { defaultModel, resolveModelAlias } from "@/common/utils/ai/models";
 import { buildProvidersFromEnv, hasAnyConfiguredProvider } from "@/node/utils/providerRequirements";
 
@@ -67,7 +63,6 @@ import {
 import type { RuntimeConfig } from "@/common/types/runtime";
 import { parseRuntimeModeAndHost, RUNTIME_MODE } from "@/common/types/runtime";
 import assert from "@/common/utils/assert";
-import type { LanguageModelV2Usage } from "@ai-sdk/provider";
 import { log, type LogLevel } from "@/node/services/log";
 import chalk from "chalk";
 import type { InitLogger, WorkspaceInitResult } from "@/node/runtime/Runtime";
@@ -549,7 +544,8 @@ async function main(): Promise<number> {
     // Plan agent instructions are handled by the backend (has access to plan file path)
   });
 
-  const liveEvents: WorkspaceChatMessage[] = [];
+  // Keeps only what the run still needs; retaining every event grows without bound
+  const liveEvents = new LiveEventLog(model);
   let readyForLive = false;
 
   /**
@@ -564,14 +560,6 @@ async function main(): Promise<number> {
   let planProposed = false;
   let streamEnded = false;
 
-  // Track usage for cost summary at end of run
-  const usageHistory: ChatUsageDisplay[] = [];
-  // Track latest usage-delta per message as fallback when stream-end lacks usage metadata
-  const latestUsageDelta = new Map<
-    string,
-    { usage: LanguageModelV2Usage; providerMetadata?: Record<string, unknown>; model: string }
-  >();
-
   const writeHumanChunk = (text: string) => {
     if (text.length === 0) return;
     writeHuman(text);
@@ -588,9 +576,6 @@ async function main(): Promise<number> {
     writeHumanLineClosed("");
   };
 
-  // Track tool call args by toolCallId for use in end formatting
-  const toolCallArgs = new Map<string, unknown>();
-
   // Budget tracking state
   let budgetExceeded = false;
 
@@ -662,7 +647,7 @@ async function main(): Promise<number> {
     resetCompletionHandlers();
 
     activeMessageId = null;
-    toolCallArgs.clear();
+    liveEvents.clearToolCalls();
   };
 
   const sendAndAwait = async (msg: string, options: SendMessageOptions): Promise<void> => {
@@ -689,8 +674,6 @@ async function main(): Promise<number> {
   const handleToolStart = (payload: WorkspaceChatMessage): boolean => {
     if (!isToolCallStart(payload)) return false;
 
-    // Cache args for use in end formatting
-    toolCallArgs.set(payload.toolCallId, payload.args);
     ensureSpacing("tool");
 
     // Try formatted output, fall back to generic
@@ -722,9 +705,8 @@ async function main(): Promise<number> {
   const handleToolEnd = (payload: WorkspaceChatMessage): boolean => {
     if (!isToolCallEnd(payload)) return false;
 
-    // Retrieve cached args and clean up
-    const args = toolCallArgs.get(payload.toolCallId);
-    toolCallArgs.delete(payload.toolCallId);
+    // Retrieve cached args (recorded at tool-call-start) and clean up
+    const args = liveEvents.takeToolArgs(payload.toolCallId);
 
     // Try formatted output, fall back to generic
     const formatted = formatToolEnd(payload, args);
@@ -757,7 +739,7 @@ async function main(): Promise<number> {
     }
 
     emitJsonLine({ type: "event", workspaceId, payload });
-    liveEvents.push(payload);
+    liveEvents.record(payload);
 
     if (handleToolStart(payload) || handleToolDelta(payload) || handleToolEnd(payload)) {
       return;
@@ -821,31 +803,11 @@ async function main(): Promise<number> {
       }
 
       // Track usage for cost summary - prefer stream-end metadata, fall back to usage-delta
-      let displayUsage: ChatUsageDisplay | undefined;
-      if (payload.metadata.usage) {
-        displayUsage = createDisplayUsage(
-          payload.metadata.usage,
-          payload.metadata.model,
-          payload.metadata.providerMetadata
-        );
-      } else {
-        // Fallback: use cumulative usage from the last usage-delta event
-        const fallback = latestUsageDelta.get(payload.messageId);
-        if (fallback) {
-          displayUsage = createDisplayUsage(
-            fallback.usage,
-            fallback.model,
-            fallback.providerMetadata
-          );
-        }
-      }
-      if (displayUsage) {
-        usageHistory.push(displayUsage);
-
+      if (liveEvents.recordStreamEndUsage(payload)) {
         // Budget enforcement at stream-end for providers that don't emit usage-delta events
         // Use cumulative cost across all messages in this run (not just the current message)
         if (budget !== undefined && !budgetExceeded) {
-          const totalUsage = sumUsageHistory(usageHistory);
+          const totalUsage = liveEvents.totalUsage;
           const cost = getTotalCost(totalUsage);
           const hasTokens = totalUsage
             ? totalUsage.input.tokens +
@@ -876,21 +838,14 @@ async function main(): Promise<number> {
           }
         }
       }
-      latestUsageDelta.delete(payload.messageId);
 
       resolveStream();
       return;
     }
 
-    // Capture usage-delta events as fallback when stream-end lacks usage metadata
-    // Also check budget limits if --budget is specified
+    // usage-delta events are kept by liveEvents as fallback when stream-end lacks usage
+    // metadata; here only check budget limits if --budget is specified
     if (isUsageDelta(payload)) {
-      latestUsageDelta.set(payload.messageId, {
-        usage: payload.cumulativeUsage,
-        providerMetadata: payload.cumulativeProviderMetadata,
-        model, // Use the model from CLI options
-      });
-
       // Budget enforcement
       if (budget !== undefined) {
         const displayUsage = createDisplayUsage(
@@ -955,27 +910,14 @@ async function main(): Promise<number> {
 
     // Output final result for --quiet mode
     if (quiet) {
-      let finalEvent: WorkspaceChatMessage | undefined;
-      for (let i = liveEvents.length - 1; i >= 0; i--) {
-        if (isStreamEnd(liveEvents[i])) {
-          finalEvent = liveEvents[i];
-          break;
-        }
-      }
-      if (finalEvent && isStreamEnd(finalEvent)) {
-        const parts = (finalEvent as unknown as { parts?: unknown[] }).parts ?? [];
-        for (const part of parts) {
-          if (part && typeof part === "object" && "type" in part && part.type === "text") {
-            const text = (part as { text?: string }).text;
-            if (text) console.log(text);
-          }
-        }
+      for (const text of liveEvents.finalTexts()) {
+        console.log(text);
       }
     }
 
     // Print cost summary at end of run (unless --hide-costs or --json)
     if (!hideCosts && !emitJson) {
-      const totalUsage = sumUsageHistory(usageHistory);
+      const totalUsage = liveEvents.totalUsage;
       const totalCost = getTotalCost(totalUsage);
       // Skip if no cost data or if model pricing is unknown (would show misleading $0.00)
       if (totalCost !== undefined && !totalUsage?.hasUnknownCosts) {